@@ -0,0 +1,53 @@
+""" Benchmark JIRA searches with and without the local bug cache, against a local fake JIRA server.
+
+    python -m benchmarks.bug_cache [--issues 3000] [--changed 30]
+
+Runs the same search as a sweep would, three times:
+without the cache, to fill the cache, and after some issues were updated.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.fake_jira import FakeJIRA, load_recorded_issues
+from elliottlib.bug_cache import BugCache
+from elliottlib.bzutil import JIRABugTracker
+
+QUERY = 'project=OCPBUGS and status in ("New","ASSIGNED","POST","MODIFIED","ON_QA","Verified")'
+
+
+def _run(name, fake, tracker):
+    fake.reset_stats()
+    start = time.perf_counter()
+    bugs = tracker._search(QUERY)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {elapsed:8.3f}s {len(bugs):7} bugs {fake.requests:5} requests "
+          f"{fake.issues_sent:7} issues {fake.bytes_sent / 1024:10.0f} KiB sent")
+    return bugs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--issues", type=int, default=3000, help="number of issues on the fake server")
+    parser.add_argument("--changed", type=int, default=30, help="number of issues updated between syncs")
+    args = parser.parse_args()
+
+    with FakeJIRA(load_recorded_issues(args.issues)) as fake, tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ["JIRA_TOKEN"] = "fake"
+        config = {"project": "OCPBUGS", "server": fake.url}
+
+        def tracker(bug_cache=None):
+            return JIRABugTracker(config, bug_cache=bug_cache)
+
+        _run("no cache", fake, tracker())
+        cache = BugCache(os.path.join(tmp_dir, "bugs.db"))
+        _run("cache, first sync", fake, tracker(cache))
+        fake.touch(list(fake.issues)[:args.changed])
+        _run(f"cache, {args.changed} changed", fake, tracker(cache))
+        _run("cache, none changed", fake, tracker(cache))
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
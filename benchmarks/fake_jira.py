@@ -0,0 +1,184 @@
+""" A local fake JIRA server answering issue searches from recorded issues, for benchmarks.
+
+Only the bits of JQL elliott's searches rely on for narrowing results are understood:
+`issue in (...)`, `updated >= -Nm` and `status was in (...) before("...")`. Any other clause matches every issue.
+Each issue gets a made-up changelog taking it from New to its current status, returned with `expand=changelog`.
+"""
+import copy
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List
+from urllib.parse import parse_qs, urlparse
+
+RECORDED_ISSUES = os.path.join(os.path.dirname(__file__), "resources", "jira_issues.json")
+STATUS_FLOW = ["New", "ASSIGNED", "POST", "MODIFIED", "ON_QA", "Verified"]
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+
+def load_recorded_issues(count: int, project: str = "OCPBUGS") -> List[Dict]:
+    """ Make `count` issues by cycling through the recorded ones, with keys {project}-1..{project}-count """
+    with open(RECORDED_ISSUES) as f:
+        recorded = json.load(f)
+    issues = []
+    for i in range(count):
+        issue = copy.deepcopy(recorded[i % len(recorded)])
+        issue["id"] = str(15000000 + i + 1)
+        issue["key"] = f"{project}-{i + 1}"
+        issue["self"] = issue["self"].rsplit("/", 1)[0] + "/" + issue["id"]
+        issues.append(issue)
+    return issues
+
+
+def make_changelog(issue: Dict, index: int) -> Dict:
+    """ A changelog moving the issue through STATUS_FLOW up to its current status, a few days apart,
+    with a label change alongside each status change
+    """
+    created = datetime.strptime(issue["fields"]["created"], DATE_FORMAT)
+    status = issue["fields"]["status"]["name"]
+    flow = STATUS_FLOW[:STATUS_FLOW.index(status) + 1] if status in STATUS_FLOW else [status]
+    histories = []
+    for step, (old, new) in enumerate(zip(flow, flow[1:])):
+        when = created + timedelta(days=(step + 1) * (1 + index % 5), hours=index % 24)
+        histories.append({
+            "id": str(index * 10 + step),
+            "created": when.strftime("%Y-%m-%dT%H:%M:%S.000%z"),
+            "items": [
+                {"field": "status", "fieldtype": "jira", "from": str(step), "fromString": old,
+                 "to": str(step + 1), "toString": new},
+                {"field": "labels", "fieldtype": "jira", "from": None, "fromString": "",
+                 "to": None, "toString": f"step-{step + 1}"},
+            ],
+        })
+    return {"startAt": 0, "maxResults": len(histories), "total": len(histories), "histories": histories}
+
+
+class FakeJIRA:
+    def __init__(self, issues: Iterable[Dict], max_results: int = 100, history_cost: float = 0.0,
+                 changelog_page_size: int = 100):
+        """
+        :param history_cost: seconds the server takes to evaluate `status was in` for each issue
+        :param changelog_page_size: histories of a changelog returned by a search or a changelog request
+        """
+        self.issues = {issue["key"]: issue for issue in issues}
+        self.changelogs = {key: make_changelog(issue, i) for i, (key, issue) in enumerate(self.issues.items())}
+        self.history_cost = history_cost
+        # key -> time the issue was last updated
+        self.updated = {key: 0.0 for key in self.issues}
+        self.max_results = max_results
+        self.changelog_page_size = changelog_page_size
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.issues_sent = 0
+        self.bytes_sent = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def touch(self, keys: Iterable[str]):
+        """ Mark issues as updated now """
+        now = time.time()
+        for key in keys:
+            self.updated[key] = now
+
+    def reset_stats(self):
+        self.requests = self.issues_sent = self.bytes_sent = 0
+
+    def _status_was_in(self, key: str, statuses: List[str], before: datetime) -> bool:
+        created = datetime.strptime(self.issues[key]["fields"]["created"], DATE_FORMAT)
+        if created >= before:
+            return False
+        changes = [item for history in self.changelogs[key]["histories"]
+                   if datetime.strptime(history["created"], DATE_FORMAT) < before
+                   for item in history["items"] if item["field"] == "status"]
+        held = {STATUS_FLOW[0]} | {item["toString"] for item in changes}
+        return bool({s.lower() for s in held} & {s.lower() for s in statuses})
+
+    def search(self, jql: str, start_at: int, max_results: int, fields: List[str], expand: str = "") -> Dict:
+        keys = list(self.issues)
+        match = re.search(r"issue in \(([^)]*)\)", jql)
+        if match:
+            wanted = set(match.group(1).split(","))
+            keys = [k for k in keys if k in wanted]
+        match = re.search(r"updated >= -(\d+)m", jql)
+        if match:
+            since = time.time() - int(match.group(1)) * 60
+            keys = [k for k in keys if self.updated[k] >= since]
+        match = re.search(r'status was in \(([^)]*)\) before\("([^"]*)"\)', jql)
+        if match:
+            statuses = [s.strip('"') for s in match.group(1).split(",")]
+            before = datetime.strptime(match.group(2), "%Y/%m/%d %H:%M").replace(tzinfo=timezone.utc)
+            time.sleep(self.history_cost * len(keys))
+            keys = [k for k in keys if self._status_was_in(k, statuses, before)]
+        max_results = min(max_results, self.max_results)
+        page = []
+        for key in keys[start_at:start_at + max_results]:
+            issue = self.issues[key]
+            page.append({**issue, "fields": {f: v for f, v in issue["fields"].items() if f in fields}})
+            if "changelog" in expand.split(","):
+                changelog = self.changelogs[key]
+                histories = changelog["histories"][:self.changelog_page_size]
+                page[-1]["changelog"] = {**changelog, "maxResults": len(histories), "histories": histories}
+        return {"startAt": start_at, "maxResults": max_results, "total": len(keys), "issues": page}
+
+    def changelog(self, key: str, start_at: int, max_results: int) -> Dict:
+        histories = self.changelogs[key]["histories"]
+        max_results = min(max_results, self.changelog_page_size)
+        return {"startAt": start_at, "maxResults": max_results, "total": len(histories),
+                "values": histories[start_at:start_at + max_results]}
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                if url.path.endswith("/serverInfo"):
+                    body = {"baseUrl": fake.url, "version": "9.12.0", "versionNumbers": [9, 12, 0],
+                            "deploymentType": "Server"}
+                elif url.path.endswith("/field"):
+                    body = [{"id": "summary", "name": "Summary", "custom": False, "clauseNames": ["summary"]}]
+                elif url.path.endswith("/search"):
+                    fields = ",".join(params.get("fields", [])).split(",")
+                    body = fake.search(params["jql"][0], int(params.get("startAt", ["0"])[0]),
+                                       int(params.get("maxResults", ["50"])[0]), fields,
+                                       ",".join(params.get("expand", [])))
+                elif url.path.endswith("/changelog"):
+                    key = url.path.rsplit("/", 2)[-2]
+                    body = fake.changelog(key, int(params.get("startAt", ["0"])[0]),
+                                          int(params.get("maxResults", ["100"])[0]))
+                else:
+                    self.send_error(404)
+                    return
+                data = json.dumps(body).encode()
+                with fake.lock:
+                    fake.requests += 1
+                    fake.bytes_sent += len(data)
+                    fake.issues_sent += len(body.get("issues", [])) if isinstance(body, dict) else 0
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
@@ -0,0 +1,83 @@
+""" Benchmark JIRABug parsing, property reads and memory over recorded issue JSON.
+
+    python -m benchmarks.jira_bug [--issues 5000] [--reads 10]
+
+"issue" rows read the same values straight from jira.Issue objects, the way JIRABug used to on every access;
+"JIRABug" rows read them from JIRABugs parsed once, which don't keep the issues.
+"""
+import argparse
+import gc
+import json
+import re
+import time
+import tracemalloc
+
+from jira import Issue
+
+from benchmarks.fake_jira import load_recorded_issues
+from elliottlib import constants
+from elliottlib.bzutil import JIRABug, JIRABugTracker
+
+OPTIONS = {"server": "https://issues.redhat.com", "rest_path": "api", "rest_api_version": "2",
+           "agile_rest_path": "agile", "headers": {}}
+
+
+def _read_issue(issue):
+    fields = issue.fields
+    labels = fields.labels
+    matches = (re.search(r'component:\s*(\S+)', label) for label in labels)
+    whiteboard_component = next((m.groups()[0] for m in matches if m), None)
+    flaw_bug_ids = [int(m[1]) for m in (re.match(r'flaw:bz#(\d+)', label) for label in labels) if m]
+    is_tracker = set(constants.TRACKER_BUG_KEYWORDS).issubset(set(labels)) and bool(whiteboard_component) \
+        and bool(flaw_bug_ids)
+    target_release = [x.name for x in getattr(fields, JIRABugTracker.FIELD_TARGET_VERSION)]
+    split = fields.components[0].name.split('/')
+    sub_component = split[1].strip() if len(split) > 1 else None
+    depends = [link.inwardIssue.key for link in fields.issuelinks
+               if link.type.name == "Blocks" and hasattr(link, "inwardIssue")]
+    return issue.key, fields.status.name, target_release, sub_component, is_tracker, depends
+
+
+def _read_bug(bug):
+    return bug.id, bug.status, bug.target_release, bug.sub_component, bug.is_tracker_bug(), bug.depends_on
+
+
+def _timed(name, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{name:<32} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def _retained(name, build):
+    gc.collect()
+    tracemalloc.start()
+    objs = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<32} {size / len(objs) / 1024:8.1f} KiB per issue")
+    return objs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--issues", type=int, default=5000, help="number of issues")
+    parser.add_argument("--reads", type=int, default=10, help="times each bug's properties are read")
+    args = parser.parse_args()
+
+    raws = load_recorded_issues(args.issues)
+    issues = _timed("parse jira.Issue", lambda: [Issue(OPTIONS, None, raw=raw) for raw in raws])
+    bugs = _timed("parse JIRABug", lambda: [JIRABug(issue, load_issue=str) for issue in issues])
+    _timed(f"read issue x{args.reads}", lambda: [_read_issue(i) for _ in range(args.reads) for i in issues])
+    _timed(f"read JIRABug x{args.reads}", lambda: [_read_bug(b) for _ in range(args.reads) for b in bugs])
+
+    # as if decoded from a search response; an Issue keeps its raw JSON, a JIRABug doesn't
+    texts = [json.dumps(raw) for raw in raws]
+    _retained("retained: jira.Issue", lambda: [Issue(OPTIONS, None, raw=json.loads(t)) for t in texts])
+    _retained("retained: JIRABug",
+              lambda: [JIRABug(Issue(OPTIONS, None, raw=json.loads(t)), load_issue=str) for t in texts])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+""" Benchmark JIRA cutoff filtering with JQL history predicates against local changelog evaluation,
+against a local fake JIRA server.
+
+    python -m benchmarks.jira_cutoff [--issues 3000] [--history-cost 0.002] [--changelog-page-size 100]
+
+Filters the bugs a sweep would find the way find-bugs:sweep does, once per --jira-cutoff-mode,
+then in changelog mode again with a bug cache, filled and then reused.
+--history-cost is how long the fake server takes to evaluate `status was in` for each issue.
+With a small --changelog-page-size, long changelogs take extra requests in changelog mode.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from benchmarks.fake_jira import FakeJIRA, load_recorded_issues
+from elliottlib.bug_cache import BugCache
+from elliottlib.bzutil import JIRABugTracker
+from elliottlib.cli.find_bugs_sweep_cli import filter_bugs_by_cutoff_event
+
+QUERY = 'project=OCPBUGS and status in ("New","ASSIGNED","POST","MODIFIED","ON_QA","Verified")'
+STATUSES = {"MODIFIED", "ON_QA", "VERIFIED"}
+CUTOFF = datetime(2023, 4, 12, tzinfo=timezone.utc).timestamp()
+
+
+def _run(name, fake, tracker, bugs):
+    fake.reset_stats()
+    start = time.perf_counter()
+    qualified = asyncio.run(filter_bugs_by_cutoff_event(SimpleNamespace(debug=False), tracker, bugs, STATUSES, CUTOFF))
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {elapsed:8.3f}s {len(qualified):7} bugs {fake.requests:5} requests "
+          f"{fake.bytes_sent / 1024:10.0f} KiB sent")
+    return [b.id for b in qualified]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--issues", type=int, default=3000, help="number of issues on the fake server")
+    parser.add_argument("--history-cost", type=float, default=0.002,
+                        help="seconds the fake server takes per issue to evaluate `status was in`")
+    parser.add_argument("--changelog-page-size", type=int, default=100,
+                        help="changelog histories the fake server returns per issue in a search or changelog request")
+    args = parser.parse_args()
+
+    with FakeJIRA(load_recorded_issues(args.issues), history_cost=args.history_cost,
+                  changelog_page_size=args.changelog_page_size) as fake, \
+            tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ["JIRA_TOKEN"] = "fake"
+        config = {"project": "OCPBUGS", "server": fake.url}
+
+        def tracker(mode, bug_cache=None):
+            t = JIRABugTracker(config, bug_cache=bug_cache)
+            t.cutoff_mode = mode
+            return t
+
+        bugs = tracker("jql")._search(QUERY)
+        expected = _run("jql", fake, tracker("jql"), bugs)
+        results = [_run("changelog", fake, tracker("changelog"), bugs)]
+        cache = BugCache(os.path.join(tmp_dir, "bugs.db"))
+        results.append(_run("changelog, first sync", fake, tracker("changelog", cache), bugs))
+        results.append(_run("changelog, cached", fake, tracker("changelog", cache), bugs))
+        cache.close()
+        if any(r != expected for r in results):
+            print("MISMATCH: changelog mode qualified different bugs than jql mode")
+
+
+if __name__ == "__main__":
+    main()
@@ -113,6 +113,34 @@ def untag_builds(tag: str, builds: List[str], session: koji.ClientSession):
     return tasks
 
 
+# package name -> package ID, or None if the package doesn't exist in Brew
+_package_id_cache: Dict[str, Optional[int]] = {}
+_package_id_cache_lock = threading.Lock()
+
+
+def get_package_ids(package_names: Iterable[str], session: koji.ClientSession) -> Dict[str, Optional[int]]:
+    """ Get Brew package IDs for multiple package names
+
+    Names not looked up before are resolved in a single multicall. Results, including packages that were
+    not found, are cached for the life of the process.
+
+    :param package_names: package names
+    :param session: instance of Brew session
+    :return: a dict of package name -> package ID, or None if the package doesn't exist
+    """
+    package_names = set(package_names)
+    with _package_id_cache_lock:
+        missing = sorted(package_names - _package_id_cache.keys())
+    if missing:
+        with session.multicall(strict=True) as m:
+            tasks = [m.getPackageID(name) for name in missing]
+        with _package_id_cache_lock:
+            for name, task in zip(missing, tasks):
+                _package_id_cache[name] = task.result
+    with _package_id_cache_lock:
+        return {name: _package_id_cache[name] for name in package_names}
+
+
 def get_build_objects(ids_or_nvrs, session=None):
     """Get information of multiple Koji/Brew builds
 
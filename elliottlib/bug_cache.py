@@ -0,0 +1,92 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from elliottlib import logutil
+
+logger = logutil.getLogger(__name__)
+
+
+class BugCache:
+    """ Local SQLite store of bugs fetched from a bug tracker.
+
+    Bugs are stored as the raw data returned by the tracker, along with the time they were synced.
+    For each search query, the ids of the matching bugs and the time of the last sync are also stored,
+    so that the next search only needs to ask the tracker for bugs changed since then.
+    """
+
+    # Bugs changed this many seconds before a sync are requested again, to allow for clock skew
+    # between us and the tracker, and for the tracker's search granularity (minutes for JIRA)
+    SYNC_MARGIN = 300
+
+    # Queries not synced for this long are dropped on open, so that one-off queries don't pile up
+    QUERY_TTL = 7 * 24 * 3600
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # trackers search from several threads at once; access is serialized with a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS bugs (
+                namespace TEXT NOT NULL, bug_id TEXT NOT NULL, synced_at REAL NOT NULL, raw TEXT NOT NULL,
+                PRIMARY KEY (namespace, bug_id))""")
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS queries (
+                namespace TEXT NOT NULL, query TEXT NOT NULL, synced_at REAL NOT NULL, bug_ids TEXT NOT NULL,
+                PRIMARY KEY (namespace, query))""")
+            self._conn.execute("DELETE FROM queries WHERE synced_at < ?", (time.time() - self.QUERY_TTL,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get_bugs(self, namespace: str, bug_ids: Iterable) -> Dict[str, Tuple[float, dict]]:
+        """ Get stored bugs by id.
+        :return: a dict of bug id -> (synced_at, raw) for the bugs found
+        """
+        bug_ids = [str(b) for b in bug_ids]
+        rows = []
+        with self._lock:
+            # stay below SQLite's limit on the number of host parameters
+            for i in range(0, len(bug_ids), 500):
+                batch = bug_ids[i:i + 500]
+                rows.extend(self._conn.execute(
+                    f"SELECT bug_id, synced_at, raw FROM bugs WHERE namespace = ? "
+                    f"AND bug_id IN ({','.join('?' * len(batch))})", [namespace, *batch]).fetchall())
+        return {bug_id: (synced_at, json.loads(raw)) for bug_id, synced_at, raw in rows}
+
+    def put_bugs(self, namespace: str, bugs: Dict[str, dict], synced_at: float):
+        """ Store raw bugs by id """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO bugs (namespace, bug_id, synced_at, raw) VALUES (?, ?, ?, ?)",
+                [(namespace, str(bug_id), synced_at, json.dumps(raw)) for bug_id, raw in bugs.items()])
+
+    def touch_bugs(self, namespace: str, bug_ids: List[str], synced_at: float):
+        """ Record that stored bugs were found unchanged as of synced_at """
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE bugs SET synced_at = ? WHERE namespace = ? AND bug_id = ?",
+                                   [(synced_at, namespace, str(bug_id)) for bug_id in bug_ids])
+
+    def get_query(self, namespace: str, query: str) -> Optional[Tuple[float, List[str]]]:
+        """ Get the last sync of a search query.
+        :return: (synced_at, ids of matching bugs), or None if the query was never synced
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT synced_at, bug_ids FROM queries WHERE namespace = ? AND query = ?",
+                                     (namespace, query)).fetchone()
+        if not row:
+            return None
+        return row[0], json.loads(row[1])
+
+    def put_query(self, namespace: str, query: str, bug_ids: List, synced_at: float):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO queries (namespace, query, synced_at, bug_ids) VALUES (?, ?, ?, ?)",
+                (namespace, query, synced_at, json.dumps([str(b) for b in bug_ids])))
@@ -3,29 +3,35 @@ Utility functions and object abstractions for general interactions
 with BugTrackers
 """
 import asyncio
-import itertools
+import bisect
+import math
 import re
+import threading
+import time
 import urllib.parse
 import xmlrpc.client
+from dataclasses import dataclass
+from multiprocessing.dummy import Pool as ThreadPool
 import bugzilla
 import click
 import os
-import requests
-from requests_gssapi import HTTPSPNEGOAuth
 from datetime import datetime, timezone
 from time import sleep
-from typing import Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 from jira import JIRA, Issue
 from errata_tool import Erratum
 from errata_tool.jira_issue import JiraIssue as ErrataJira
 from errata_tool.bug import Bug as ErrataBug
 from bugzilla.bug import Bug
+from bugzilla.bug import Bug as BugzillaBugObject
 from koji import ClientSession
 
-from elliottlib import constants, exceptions, exectools, logutil, errata, util
+from elliottlib import brew, constants, exceptions, exectools, logutil, errata, util
+from elliottlib.bug_cache import BugCache
 from elliottlib.cli import cli_opts
-from elliottlib.errata_async import AsyncErrataAPI
+from elliottlib.errata_async import AdvisoryBugIndex, AsyncErrataAPI
 from elliottlib.metadata import Metadata
+from elliottlib.security_data import AsyncSecurityDataAPI
 from elliottlib.util import isolate_timestamp_in_release, chunk
 
 logger = logutil.getLogger(__name__)
@@ -44,6 +50,8 @@ def get_jira_bz_bug_ids(bug_ids):
 
 
 class Bug:
+    __slots__ = ('bug',)
+
     def __init__(self, bug_obj):
         self.bug = bug_obj
 
@@ -66,7 +74,16 @@ class Bug:
     def whiteboard_component(self):
         raise NotImplementedError
 
-    def all_advisory_ids(self):
+    def all_advisory_ids(self, advisory_bug_index: Optional[AdvisoryBugIndex] = None):
+        """ IDs of the advisories the bug is attached to.
+        :param advisory_bug_index: if given, and the bug is in it or the index is complete, the advisories are taken
+        from the index without asking Errata. A complete index only holds open advisories.
+        """
+        if advisory_bug_index is not None and (advisory_bug_index.complete or self.id in advisory_bug_index):
+            return sorted(advisory_bug_index.advisories_for(self.id))
+        return self._all_advisory_ids()
+
+    def _all_advisory_ids(self):
         raise NotImplementedError
 
     def is_tracker_bug(self):
@@ -196,7 +213,7 @@ class BugzillaBug(Bug):
         has_keywords = set(constants.TRACKER_BUG_KEYWORDS).issubset(set(self.keywords))
         return has_keywords or has_cve_in_summary
 
-    def all_advisory_ids(self):
+    def _all_advisory_ids(self):
         return ErrataBug(self.id).all_advisory_ids
 
     def is_ocp_bug(self):
@@ -206,33 +223,155 @@ class BugzillaBug(Bug):
         return datetime.strptime(str(self.bug.creation_time), '%Y%m%dT%H:%M:%S').replace(tzinfo=timezone.utc)
 
 
+@dataclass(frozen=True, eq=False, init=False)
 class JIRABug(Bug):
-    def __init__(self, bug_obj: Issue):
-        super().__init__(bug_obj)
+    """ A JIRA issue, parsed once into the fields elliott uses.
+    The jira.Issue isn't kept when a way to load it again is given; `bug` then loads it on demand.
+    Multi-valued fields are kept in tuples, and handed out as new lists.
+    """
+    __slots__ = ('_key', '_weburl', '_summary', '_status', '_labels', '_versions', '_project', '_issue_type',
+                 '_resolution', '_security_level', '_component', '_sub_component', '_target_versions', '_blocked_by_bz',
+                 '_release_blocker', '_blocked_reason', '_severity', '_created', '_blocks', '_depends',
+                 '_whiteboard_component', '_flaw_bug_ids', '_issue', '_load_issue')
+    _key: str
+    _weburl: Optional[str]
+    _summary: Optional[str]
+    _status: Optional[str]
+    _labels: Tuple[str, ...]
+    _versions: Tuple[str, ...]
+    _project: Optional[str]
+    _issue_type: Optional[str]
+    _resolution: str
+    _security_level: Optional[str]
+    _component: Optional[str]
+    _sub_component: Optional[str]
+    _target_versions: Optional[Tuple[str, ...]]
+    _blocked_by_bz: Optional[int]
+    _release_blocker: bool
+    _blocked_reason: Optional[str]
+    _severity: Optional[str]
+    _created: str
+    _blocks: Tuple[str, ...]
+    _depends: Tuple[str, ...]
+    _whiteboard_component: Optional[str]
+    _flaw_bug_ids: Tuple[int, ...]
+    _issue: Optional[Issue]
+    _load_issue: Optional[Callable[[str], Issue]]
+
+    def __init__(self, bug_obj: Issue, load_issue: Optional[Callable[[str], Issue]] = None):
+        """
+        :param bug_obj: the issue to parse
+        :param load_issue: function loading an issue by key. If given, bug_obj is not kept.
+        """
+        fields = getattr(bug_obj, 'fields', None)
+
+        def field(name):
+            return getattr(fields, name, None)
+
+        def custom_field_value(name):
+            value = field(name)
+            return value.value if value else None
+
+        parsed = {
+            '_key': bug_obj.key,
+            '_weburl': bug_obj.permalink() if hasattr(bug_obj, 'permalink') else None,
+            '_summary': field('summary'),
+            '_status': field('status').name if field('status') else None,
+            '_labels': tuple(field('labels') or ()),
+            '_versions': tuple(x.name for x in field('versions') or ()),
+            '_project': field('project').key if field('project') else None,
+            '_issue_type': field('issuetype').name if field('issuetype') else None,
+            '_resolution': str(field('resolution')),
+            '_security_level': field('security').name if field('security') else None,
+            '_component': None,
+            '_sub_component': None,
+            '_target_versions': None,
+            '_blocked_by_bz': None,
+            '_release_blocker': custom_field_value(JIRABugTracker.FIELD_RELEASE_BLOCKER) == 'Approved',
+            '_blocked_reason': custom_field_value(JIRABugTracker.FIELD_BLOCKED_REASON),
+            '_severity': None,
+            '_created': str(field('created')),
+            '_blocks': (),
+            '_depends': (),
+            '_whiteboard_component': None,
+            '_flaw_bug_ids': (),
+            '_issue': None if load_issue else bug_obj,
+            '_load_issue': load_issue,
+        }
+
+        components = field('components')
+        if components:
+            split = components[0].name.split('/')
+            parsed['_component'] = split[0].strip()
+            if len(split) >= 2:
+                parsed['_sub_component'] = split[1].strip()
+
+        target_versions = field(JIRABugTracker.FIELD_TARGET_VERSION)
+        if target_versions:
+            parsed['_target_versions'] = tuple(x.name for x in target_versions)
+
+        url = field(JIRABugTracker.FIELD_BLOCKED_BY_BZ)
+        if url:
+            bug_id = re.search(r"id=(\d+)", url)
+            if bug_id:
+                parsed['_blocked_by_bz'] = int(bug_id.groups()[0])
+
+        severity = custom_field_value(JIRABugTracker.FIELD_SEVERITY)
+        if severity:
+            parsed['_severity'] = next((s for s in ("Urgent", "High", "Medium", "Low") if s in severity), None)
+
+        blocks, depends = [], []
+        for link in field('issuelinks') or []:
+            if link.type.name == "Blocks":
+                if hasattr(link, "outwardIssue"):  # link "blocks"
+                    blocks.append(link.outwardIssue.key)
+                if hasattr(link, "inwardIssue"):  # link "is blocked by"
+                    depends.append(link.inwardIssue.key)
+        parsed['_blocks'], parsed['_depends'] = tuple(blocks), tuple(depends)
+
+        # An OCP cve tracker has a whiteboard value "component:<component_name>"
+        # to indicate which component the bug belongs to.
+        for label in parsed['_labels']:
+            match = re.search(r'component:\s*(\S+)', label)
+            if match:
+                parsed['_whiteboard_component'] = match.groups()[0]
+                break
+        flaw_bug_ids = []
+        for label in parsed['_labels']:
+            match = re.match(r'flaw:bz#(\d+)', label)
+            if match:
+                flaw_bug_ids.append(int(match[1]))
+        parsed['_flaw_bug_ids'] = tuple(flaw_bug_ids)
+
+        for name, value in parsed.items():
+            object.__setattr__(self, name, value)
+
+    @property
+    def bug(self) -> Issue:
+        """ The jira.Issue, loaded again from JIRA if it wasn't kept """
+        if self._issue is None:
+            object.__setattr__(self, '_issue', self._load_issue(self._key))
+        return self._issue
 
     @property
     def id(self):
-        return self.bug.key
+        return self._key
 
     @property
     def weburl(self):
-        return self.bug.permalink()
+        return self._weburl
 
     @property
     def component(self):
-        component0 = self.bug.fields.components[0].name
-        return component0.split('/')[0].strip()
+        return self._component
 
     @property
     def status(self):
-        return self.bug.fields.status.name
+        return self._status
 
     @property
     def security_level(self):
-        try:
-            return self.bug.fields.security
-        except AttributeError:
-            return None
+        return self._security_level
 
     def is_tracker_bug(self):
         has_keywords = set(constants.TRACKER_BUG_KEYWORDS).issubset(set(self.keywords))
@@ -259,7 +398,7 @@ class JIRABug(Bug):
 
     @property
     def summary(self):
-        return self.bug.fields.summary
+        return self._summary
 
     @property
     def blocks(self):
@@ -267,50 +406,33 @@ class JIRABug(Bug):
 
     @property
     def keywords(self):
-        return self.bug.fields.labels
+        return list(self._labels)
 
     @property
     def corresponding_flaw_bug_ids(self):
-        flaw_bug_ids = []
-        for label in self.bug.fields.labels:
-            if str(label).startswith("flaw"):
-                match = re.match(r'flaw:bz#(\d+)', label)
-                if match:
-                    flaw_bug_ids.append(match[1])
-        return [int(f) for f in flaw_bug_ids]
+        return list(self._flaw_bug_ids)
 
     @property
     def version(self):
-        return [x.name for x in self.bug.fields.versions]
+        return list(self._versions)
 
     @property
     def blocked_by_bz(self):
-        url = getattr(self.bug.fields, JIRABugTracker.FIELD_BLOCKED_BY_BZ)
-        if not url:
-            return None
-        bug_id = re.search(r"id=(\d+)", url)
-        if not bug_id:
-            return None
-        return int(bug_id.groups()[0])
+        return self._blocked_by_bz
 
     @property
     def target_release(self):
-        tr_field = getattr(self.bug.fields, JIRABugTracker.FIELD_TARGET_VERSION)
-        if not tr_field:
+        if not self._target_versions:
             raise ValueError(f'bug {self.id} does not have `Target Version` field set')
-        return [x.name for x in tr_field]
+        return list(self._target_versions)
 
     @property
     def sub_component(self):
-        component0 = self.bug.fields.components[0].name
-        split = component0.split('/')
-        if len(split) < 2:
-            return None
-        return split[1].strip()
+        return self._sub_component
 
     @property
     def resolution(self):
-        return str(self.bug.fields.resolution)
+        return self._resolution
 
     @property
     def depends_on(self):
@@ -330,12 +452,16 @@ class JIRABug(Bug):
 
     @property
     def product(self):
-        return self.bug.fields.project.key
+        return self._project
+
+    @property
+    def issue_type(self):
+        return self._issue_type
 
     @property
     def alias(self):
         # TODO: See usage. this can be correct or incorrect based in usage.
-        return self.bug.fields.labels
+        return list(self._labels)
 
     @property
     def whiteboard_component(self):
@@ -346,67 +472,35 @@ class JIRABug(Bug):
 
         :returns: a string if a value is found, otherwise None
         """
-        marker = r'component:\s*(\S+)'
-        for label in self.bug.fields.labels:
-            tmp = re.search(marker, label)
-            if tmp and len(tmp.groups()) == 1:
-                component_name = tmp.groups()[0]
-                return component_name
-        return None
+        return self._whiteboard_component
 
     def _get_release_blocker(self):
         # release blocker can be ['None','Approved'=='+','Proposed'=='?','Rejected'=='-']
-        field = getattr(self.bug.fields, JIRABugTracker.FIELD_RELEASE_BLOCKER)
-        if field:
-            return field.value == 'Approved'
-        return False
+        return self._release_blocker
 
     def _get_blocked_reason(self):
-        field = getattr(self.bug.fields, JIRABugTracker.FIELD_BLOCKED_REASON)
-        if field:
-            return field.value
-        return None
+        return self._blocked_reason
 
     def _get_severity(self):
-        field = getattr(self.bug.fields, JIRABugTracker.FIELD_SEVERITY)
-        if field:
-            if "Urgent" in field.value:
-                return "Urgent"
-            if "High" in field.value:
-                return "High"
-            if "Medium" in field.value:
-                return "Medium"
-            if "Low" in field.value:
-                return "Low"
-        return None
+        return self._severity
 
-    def all_advisory_ids(self):
+    def _all_advisory_ids(self):
         return ErrataJira(self.id).all_advisory_ids
 
     def creation_time_parsed(self):
-        return datetime.strptime(str(self.bug.fields.created), '%Y-%m-%dT%H:%M:%S.%f%z')
+        return datetime.strptime(self._created, '%Y-%m-%dT%H:%M:%S.%f%z')
 
     def is_ocp_bug(self):
-        return self.bug.fields.project.key == "OCPBUGS" and not self.is_placeholder_bug()
+        return self._project == "OCPBUGS" and not self.is_placeholder_bug()
 
     def is_placeholder_bug(self):
         return ('Placeholder' in self.summary) and (self.component == 'Release') and ('Automation' in self.keywords)
 
     def _get_blocks(self):
-        # link "blocks"
-        blocks = []
-        for link in self.bug.fields.issuelinks:
-            if link.type.name == "Blocks" and hasattr(link, "outwardIssue"):
-                blocks.append(link.outwardIssue.key)
-        return blocks
+        return list(self._blocks)
 
     def _get_depends(self):
-        # link "is blocked by"
-        depends = []
-        for link in self.bug.fields.issuelinks:
-            if link.type.name == "Blocks" and hasattr(link, "inwardIssue"):
-                depends.append(link.inwardIssue.key)
-        return depends
+        return list(self._depends)
 
     @staticmethod
     def looks_like_a_jira_bug(bug_id):
@@ -414,11 +508,52 @@ class JIRABug(Bug):
         return pattern.match(str(bug_id))
 
 
+class BugMemo:
+    """ Bugs looked up by id, each fetched only once however many callers ask for it.
+    Ids that weren't found are remembered too, and logged. It can be shared between threads.
+    """
+
+    def __init__(self, fetch: Callable[[List[Union[int, str]]], Iterable[Bug]]):
+        """
+        :param fetch: fetches the bugs of a list of ids not looked up before
+        """
+        self._fetch = fetch
+        # bug id -> bug, or None if it wasn't found
+        self._bugs: Dict[Union[int, str], Optional[Bug]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, bug_ids: Iterable[Union[int, str]]) -> List[Bug]:
+        """ Get bugs by id. Only bugs not looked up before are fetched.
+        :return: the bugs found, in input order
+        """
+        bug_ids = list(dict.fromkeys(bug_ids))
+        with self._lock:
+            unresolved = [bug_id for bug_id in bug_ids if bug_id not in self._bugs]
+        if unresolved:
+            found = {bug.id: bug for bug in self._fetch(unresolved)}
+            not_found = [bug_id for bug_id in unresolved if bug_id not in found]
+            if not_found:
+                logger.warning(f"Couldn't find {len(not_found)} bugs, leaving them out: {not_found}")
+            with self._lock:
+                self._bugs.update({bug_id: found.get(bug_id) for bug_id in unresolved})
+        with self._lock:
+            return [self._bugs[bug_id] for bug_id in bug_ids if self._bugs[bug_id]]
+
+
 class BugTracker:
-    def __init__(self, config: dict, tracker_type: str):
+    # Number of bugs bulk updates work on at a time
+    BUG_UPDATE_CONCURRENCY = 8
+    # Number of bugs filter_attached_bugs looks up in Errata at a time
+    ERRATA_LOOKUP_CONCURRENCY = 16
+
+    def __init__(self, config: dict, tracker_type: str, bug_cache: Optional[BugCache] = None):
         self.config = config
         self._server = self.config.get('server', '')
         self.type = tracker_type
+        self._bug_cache = bug_cache
+        # str(bug id) -> (time fetched, status changes); see _get_status_changes
+        self._status_changes: Dict[str, Tuple[float, List[Tuple[float, str, str]]]] = {}
+        self._status_changes_lock = threading.Lock()
 
     def component_filter(self, filter_name='default') -> List:
         return self.config.get('filters', {}).get(filter_name)
@@ -457,6 +592,129 @@ class BugTracker:
                     verbose=False):
         raise NotImplementedError
 
+    # The following are used to answer searches and get_bugs from the local bug cache.
+    # Raw bugs are the tracker's own data for a bug, keyed by str(bug id).
+
+    def _cache_namespace(self, query=None) -> str:
+        return self.type
+
+    def _search_raw(self, query, verbose=False, changed_since: Optional[float] = None) -> Dict[str, dict]:
+        """ Search for bugs matching the query, and changed since the given timestamp if any """
+        raise NotImplementedError
+
+    def _get_bugs_raw(self, bugids: List, permissive=False, verbose=False) -> Dict[str, dict]:
+        raise NotImplementedError
+
+    def _changed_bug_ids(self, bugids: List[str], changed_since: float) -> Set[str]:
+        """ Tell which of the given bugs changed since the given timestamp """
+        raise NotImplementedError
+
+    def get_changed_bug_ids(self, bugids: Iterable, changed_since: float) -> Set[str]:
+        """ Tell which of the given bugs changed since the given timestamp
+        :return: ids of the changed bugs, as strings
+        """
+        return self._changed_bug_ids([str(b) for b in bugids], changed_since)
+
+    def _bug_from_raw(self, raw: dict) -> Bug:
+        raise NotImplementedError
+
+    def _cached_search(self, query, verbose=False, bug_cache: Optional[BugCache] = None,
+                       full_refresh=False) -> List[Bug]:
+        """ Search for bugs, only asking the tracker for bugs changed since the last sync of the same query.
+        Other bugs matching the query last time are answered from the local bug cache,
+        unless they changed in a way that they no longer match.
+        :param bug_cache: where to keep the results. Default to the tracker's bug cache
+        :param full_refresh: ignore the last sync and search for all bugs again
+        """
+        bug_cache = bug_cache or self._bug_cache
+        namespace = self._cache_namespace(query)
+        key = str(query)
+        synced_at = time.time()
+        raws = None
+        last_sync = None if full_refresh else bug_cache.get_query(namespace, key)
+        if last_sync:
+            last_synced_at, bug_ids = last_sync
+            since = last_synced_at - bug_cache.SYNC_MARGIN
+            changed = self._search_raw(query, verbose=verbose, changed_since=since)
+            unchanged = [b for b in bug_ids if b not in changed]
+            if unchanged:
+                # bugs that changed and didn't show up above no longer match
+                no_longer_matching = self._changed_bug_ids(unchanged, since)
+                unchanged = [b for b in unchanged if b not in no_longer_matching]
+            stored = bug_cache.get_bugs(namespace, unchanged)
+            if len(stored) == len(unchanged):
+                if verbose:
+                    logger.info(f"{len(unchanged)} bugs from the local bug cache, {len(changed)} changed")
+                bug_cache.put_bugs(namespace, changed, synced_at)
+                bug_cache.touch_bugs(namespace, unchanged, synced_at)
+                raws = {b: stored[b][1] for b in unchanged}
+                raws.update(changed)
+        if raws is None:
+            raws = self._search_raw(query, verbose=verbose)
+            bug_cache.put_bugs(namespace, raws, synced_at)
+        bug_cache.put_query(namespace, key, list(raws), synced_at)
+        return [self._bug_from_raw(raw) for raw in raws.values()]
+
+    def _cached_get_bugs(self, bugids: List, permissive=False, verbose=False) -> List[Bug]:
+        """ Get bugs, only asking the tracker for bugs not in the local bug cache or changed since they were synced """
+        namespace = self._cache_namespace()
+        keys = list(dict.fromkeys(str(b) for b in bugids))
+        synced_at = time.time()
+        stored = self._bug_cache.get_bugs(namespace, keys)
+        stale = {b for b in keys if b not in stored}
+        if stored:
+            since = min(s for s, _ in stored.values()) - self._bug_cache.SYNC_MARGIN
+            stale |= self._changed_bug_ids([b for b in keys if b in stored], since)
+        raws = {b: raw for b, (_, raw) in stored.items() if b not in stale}
+        if verbose:
+            logger.info(f"{len(raws)} bugs from the local bug cache, {len(stale)} to fetch")
+        self._bug_cache.touch_bugs(namespace, list(raws), synced_at)
+        if stale:
+            to_fetch = list(dict.fromkeys(b for b in bugids if str(b) in stale))
+            fetched = self._get_bugs_raw(to_fetch, permissive=permissive, verbose=verbose)
+            self._bug_cache.put_bugs(namespace, fetched, synced_at)
+            raws.update(fetched)
+        return [self._bug_from_raw(raws[b]) for b in keys if b in raws]
+
+    def _fetch_status_changes(self, bug_ids: List) -> Dict:
+        """ Fetch the status changes of bugs, as (timestamp, old status, new status), oldest first
+        :return: a dict of bug id -> status changes, for the bugs found
+        """
+        raise NotImplementedError
+
+    def _get_status_changes(self, bug_ids: List) -> Dict:
+        """ Get the status changes of bugs, as (timestamp, old status, new status), oldest first.
+
+        A bug's history only grows, so the status changes are kept for the life of the tracker, and in the bug cache
+        if any, and only fetched again for bugs changed since.
+        :return: a dict of bug id -> status changes, for the bugs found
+        """
+        namespace = f"{self.type}:status-changes"
+        ids = {str(b): b for b in bug_ids}
+        synced_at = time.time()
+        with self._status_changes_lock:
+            known = {b: self._status_changes[b] for b in ids if b in self._status_changes}
+        if self._bug_cache:
+            stored = self._bug_cache.get_bugs(namespace, [b for b in ids if b not in known])
+            known.update({b: (s, [tuple(c) for c in changes]) for b, (s, changes) in stored.items()})
+        if known:
+            since = min(s for s, _ in known.values()) - BugCache.SYNC_MARGIN
+            changed = self._changed_bug_ids(list(known), since)
+            known = {b: v for b, v in known.items() if b not in changed}
+
+        missing = [ids[b] for b in ids if b not in known]
+        fetched = {str(b): changes for b, changes in self._fetch_status_changes(missing).items()} if missing else {}
+        with self._status_changes_lock:
+            self._status_changes.update({b: (synced_at, changes) for b, changes in fetched.items()})
+            self._status_changes.update({b: (synced_at, changes) for b, (_, changes) in known.items()})
+        if self._bug_cache and fetched:
+            self._bug_cache.put_bugs(namespace, fetched, synced_at)
+        if self._bug_cache and known:
+            self._bug_cache.touch_bugs(namespace, list(known), synced_at)
+        result = {b: changes for b, (_, changes) in known.items()}
+        result.update(fetched)
+        return {ids[b]: changes for b, changes in result.items()}
+
     def add_comment(self, bugid, comment: str, private: bool, noop=False):
         raise NotImplementedError
 
@@ -466,6 +724,9 @@ class BugTracker:
     def _update_bug_status(self, bugid, target_status):
         raise NotImplementedError
 
+    def _set_bug_status(self, bug: Bug, target_status: str):
+        self._update_bug_status(bug.id, target_status)
+
     @staticmethod
     def advisory_bug_ids(advisory_obj):
         raise NotImplementedError
@@ -494,7 +755,7 @@ class BugTracker:
         elif noop:
             logger.info(f"Would have {action}")
         else:
-            self._update_bug_status(bug.id, target_status)
+            self._set_bug_status(bug, target_status)
             logger.info(action)
 
         comment_lines = []
@@ -506,23 +767,72 @@ class BugTracker:
             self.add_comment(bug.id, '\n'.join(comment_lines), private=True, noop=noop)
         return True
 
+    def update_bugs_status(self, bugs: Iterable[Bug], target_status: str,
+                           comment: Optional[str] = None, log_comment: bool = True, noop=False) -> Dict:
+        """ Update the status of many bugs as update_bug_status does, BUG_UPDATE_CONCURRENCY bugs at a time
+        :return: a dict of bug id -> True if the status has been (or would have been) updated,
+        False if the bug was already on target_status, or the exception raised updating it
+        """
+        return self._for_each_bug(
+            {bug.id: bug for bug in bugs},
+            lambda bug: self.update_bug_status(bug, target_status, comment=comment, log_comment=log_comment,
+                                               noop=noop),
+            f"change to {target_status}")
+
+    def add_comments(self, bugids: Iterable, comment: str, private: bool, noop=False) -> Dict:
+        """ Add the same comment to many bugs, BUG_UPDATE_CONCURRENCY bugs at a time
+        :return: a dict of bug id -> True if the comment has been (or would have been) added,
+        or the exception raised adding it
+        """
+        def _add_comment(bugid):
+            self.add_comment(bugid, comment, private=private, noop=noop)
+            return True
+
+        return self._for_each_bug({bugid: bugid for bugid in bugids}, _add_comment, "comment on")
+
+    def _for_each_bug(self, items: Dict, func: Callable, action: str) -> Dict:
+        """ Call func on each item of a bug id -> item dict concurrently, keeping failures as results """
+        if not items:
+            return {}
+
+        def _call(item):
+            try:
+                return func(item)
+            except Exception as e:
+                return e
+
+        pool = ThreadPool(min(self.BUG_UPDATE_CONCURRENCY, len(items)))
+        results = dict(zip(items.keys(), pool.map(_call, items.values())))
+        pool.close()
+        pool.join()
+        for bugid, result in results.items():
+            if isinstance(result, Exception):
+                logger.error(f"Failed to {action} {bugid}: {result}")
+        return results
+
     @staticmethod
     def get_corresponding_flaw_bugs(tracker_bugs: List[Bug], flaw_bug_tracker, brew_api,
-                                    strict: bool = True, verbose: bool = False) -> (Dict, Dict):
+                                    strict: bool = True, verbose: bool = False,
+                                    flaw_bugs: Optional[List[Bug]] = None) -> (Dict, Dict):
         """Get corresponding flaw bug objects for given list of tracker bug objects.
         flaw_bug_tracker object to fetch flaw bugs from
+        flaw_bugs: the flaw bugs of these trackers if already fetched; they are not fetched again
 
         :return: (tracker_flaws, flaw_id_bugs): tracker_flaws is a dict with tracker bug id as key and list of flaw
         bug id as value, flaw_id_bugs is a dict with flaw bug id as key and flaw bug object as value
         """
-        bug_tracker = flaw_bug_tracker
-        flaw_bugs = bug_tracker.get_flaw_bugs(
-            list(set(sum([t.corresponding_flaw_bug_ids for t in tracker_bugs], []))),
-            verbose=verbose
-        )
+        if flaw_bugs is None:
+            flaw_bugs = flaw_bug_tracker.get_flaw_bugs(
+                list(set(sum([t.corresponding_flaw_bug_ids for t in tracker_bugs], []))),
+                verbose=verbose
+            )
         flaw_tracker_map = {bug.id: {'bug': bug, 'trackers': []}
                             for bug in flaw_bugs}
 
+        # resolve all distinct components in one go rather than once per tracker
+        package_ids = brew.get_package_ids({t.whiteboard_component for t in tracker_bugs if t.whiteboard_component},
+                                           brew_api)
+
         # Validate that each tracker has a corresponding flaw bug
         # and a whiteboard component
         trackers_with_no_flaws = set()
@@ -534,7 +844,7 @@ class BugTracker:
                 continue
 
             # is this component a valid package name in brew?
-            if not brew_api.getPackageID(component):
+            if not package_ids[component]:
                 logger.info(f'package `{component}` not found in brew')
                 trackers_with_invalid_components.add(t.id)
                 continue
@@ -575,6 +885,48 @@ class BugTracker:
     def get_flaw_bugs(self, bug_ids: List, strict: bool = True, verbose: bool = False):
         raise NotImplementedError
 
+    async def get_attached_advisories(self, api: AsyncErrataAPI, bugid) -> List[Dict]:
+        """ Ask Errata which advisories a bug is attached to
+        :return: a list of advisories, each a dict with at least an "id" key
+        """
+        raise NotImplementedError
+
+    async def filter_attached_bugs(self, bugs: Iterable, advisory_bug_index: Optional[AdvisoryBugIndex] = None) -> List:
+        """ Get bugs that are attached to any advisory.
+
+        Errata can only tell which advisories a bug is attached to one bug at a time.
+        With a complete index (see AdvisoryBugIndex), no request is needed: a bug missing from it isn't attached to
+        an open advisory. With an incomplete one, any bug missing from it may be attached to an advisory outside the
+        index, so it still takes one request, ERRATA_LOOKUP_CONCURRENCY requests at a time.
+
+        :param bugs: a list of bugs
+        :param advisory_bug_index: if given, bugs found in the index are known to be attached without asking Errata.
+        Unless the index is complete, bugs not in the index are looked up one by one.
+        :return: a list of attached bugs, in input order
+        """
+        bugs = list(bugs)
+        attached_bug_ids = set()
+        to_lookup = bugs
+        if advisory_bug_index is not None:
+            attached_bug_ids = {bug.id for bug in bugs if bug.id in advisory_bug_index}
+            to_lookup = [] if advisory_bug_index.complete else [bug for bug in bugs if bug.id not in attached_bug_ids]
+            logger.info(f"{len(attached_bug_ids)} of {len(bugs)} bugs are attached to indexed advisories; "
+                        f"looking up the remaining {len(to_lookup)} in Errata")
+        if to_lookup:
+            semaphore = asyncio.Semaphore(self.ERRATA_LOOKUP_CONCURRENCY)
+
+            async def _lookup(bug):
+                async with semaphore:
+                    return await self.get_attached_advisories(api, bug.id)
+
+            api = AsyncErrataAPI()
+            try:
+                results = await asyncio.gather(*[_lookup(bug) for bug in to_lookup])
+            finally:
+                await api.close()
+            attached_bug_ids |= {bug.id for bug, advisories in zip(to_lookup, results) if advisories}
+        return [bug for bug in bugs if bug.id in attached_bug_ids]
+
 
 class JIRABugTracker(BugTracker):
     JIRA_BUG_BATCH_SIZE = 50
@@ -586,6 +938,20 @@ class JIRABugTracker(BugTracker):
     FIELD_BLOCKED_REASON = 'customfield_12316544'  # "Blocked Reason"
     FIELD_SEVERITY = 'customfield_12316142'  # "Severity"
 
+    # Fields read by JIRABug. Searches only request these instead of every field of every issue.
+    JIRA_BUG_FIELDS = [
+        'components', 'created', 'issuelinks', 'issuetype', 'labels', 'project', 'resolution', 'security',
+        'status', 'summary', 'versions', FIELD_BLOCKED_BY_BZ, FIELD_TARGET_VERSION, FIELD_RELEASE_BLOCKER,
+        FIELD_BLOCKED_REASON, FIELD_SEVERITY,
+    ]
+    JIRA_SEARCH_PAGE_SIZE = 100
+    JIRA_SEARCH_CONCURRENCY = 8
+
+    # How filter_bugs_by_cutoff_event finds the bugs that had a status before the cutoff:
+    # "jql" asks the server with `status was in (...) before(...)`;
+    # "changelog" fetches the bugs' changelogs once and replays them locally.
+    CUTOFF_MODES = ("jql", "changelog")
+
     @staticmethod
     def get_config(runtime) -> Dict:
         major, minor = runtime.get_major_minor()
@@ -608,10 +974,14 @@ class JIRABugTracker(BugTracker):
         client = JIRA(self._server, token_auth=token_auth)
         return client
 
-    def __init__(self, config):
-        super().__init__(config, 'jira')
+    def __init__(self, config, bug_cache: Optional[BugCache] = None):
+        super().__init__(config, 'jira', bug_cache)
         self._project = self.config.get('project', '')
         self._client: JIRA = self.login()
+        # (project, issue type, status, target status) -> transition ID, or None if there is no such transition
+        self._transition_ids: Dict[Tuple, Optional[str]] = {}
+        self._transition_ids_lock = threading.Lock()
+        self.cutoff_mode = "jql"
 
     @property
     def product(self):
@@ -624,32 +994,56 @@ class JIRABugTracker(BugTracker):
     def get_bug(self, bugid: str, **kwargs) -> JIRABug:
         return JIRABug(self._client.issue(bugid, **kwargs))
 
-    def get_bugs(self, bugids: List[str], permissive=False, verbose=False, **kwargs) -> List[JIRABug]:
+    def _load_issue(self, key: str) -> Issue:
+        # JIRABug only keeps the fields elliott uses; this gets the whole issue when asked for
+        return self._client.issue(key)
+
+    def get_bugs(self, bugids: List[str], permissive=False, verbose=False, concurrency: Optional[int] = None,
+                 **kwargs) -> List[JIRABug]:
+        """ Fetch issues by key, in the order of the given keys.
+        Keys are searched for in chunks of JIRA_BUG_BATCH_SIZE, `concurrency` chunks at a time
+        (default JIRA_SEARCH_CONCURRENCY).
+        :raises ValueError: listing all keys that couldn't be fetched, unless permissive
+        """
         invalid_bugs = [b for b in bugids if not self.looks_like_a_jira_project_bug(b)]
         if invalid_bugs:
-            logger.warn(f"Cannot fetch bugs from a different project (current project: {self._project}):"
-                        f" {invalid_bugs}")
-        bugids = [b for b in bugids if self.looks_like_a_jira_project_bug(b)]
+            logger.warning(f"Cannot fetch bugs from a different project (current project: {self._project}):"
+                           f" {invalid_bugs}")
+        bugids = list(dict.fromkeys(b for b in bugids if self.looks_like_a_jira_project_bug(b)))
         if not bugids:
             return []
+        if self._bug_cache:
+            return self._cached_get_bugs(bugids, permissive=permissive, verbose=verbose)
+        return [JIRABug(issue, self._load_issue) for issue in self._get_issues(bugids, permissive, verbose, concurrency)]
 
+    def _get_issues(self, bugids: List[str], permissive=False, verbose=False, concurrency: Optional[int] = None,
+                    fields: Optional[List[str]] = None, expand: Optional[str] = None) -> List[Issue]:
         # Split the request in chunks, in order not to fall into
         # jira.exceptions.JIRAError for request header size too large
-        bugs = []
-        for chunk_of_bugs in chunk(list(bugids), self.JIRA_BUG_BATCH_SIZE):
+        extra = {"expand": expand} if expand else {}
+
+        def _get_chunk(chunk_of_bugs):
             query = self._query(bugids=chunk_of_bugs, with_target_release=False)
-            if verbose:
-                logger.info(query)
-            bugs.extend(self._search(query))
+            return self._search_issues(query, verbose=verbose, fields=fields, **extra)
 
-        if len(bugs) < len(bugids):
-            bugids_not_found = set(bugids) - {b.id for b in bugs}
-            msg = f"Some bugs could not be fetched ({len(bugids) - len(bugs)}): {bugids_not_found}"
+        chunks = list(chunk(bugids, self.JIRA_BUG_BATCH_SIZE))
+        if len(chunks) == 1:
+            results = [_get_chunk(chunks[0])]
+        else:
+            pool = ThreadPool(min(concurrency or self.JIRA_SEARCH_CONCURRENCY, len(chunks)))
+            results = pool.map(_get_chunk, chunks)
+            pool.close()
+            pool.join()
+        found = {issue.key: issue for result in results for issue in result}
+
+        bugids_not_found = [b for b in bugids if b not in found]
+        if bugids_not_found:
+            msg = f"Some bugs could not be fetched ({len(bugids_not_found)}): {bugids_not_found}"
             if not permissive:
                 raise ValueError(msg)
             else:
-                logger.warn(msg)
-        return bugs
+                logger.warning(msg)
+        return [found[b] for b in bugids if b in found]
 
     def get_bug_remote_links(self, bug: JIRABug):
         remote_links = self._client.remote_links(bug)
@@ -681,6 +1075,25 @@ class JIRABugTracker(BugTracker):
     def _update_bug_status(self, bugid, target_status):
         return self._client.transition_issue(bugid, target_status)
 
+    def _set_bug_status(self, bug: Bug, target_status: str):
+        # transitioning by name looks up the issue's transitions each time; reuse IDs found for the same workflow
+        transition_id = self._transition_id(bug, target_status) if isinstance(bug, JIRABug) else None
+        return self._client.transition_issue(bug.id, transition_id or target_status)
+
+    def _transition_id(self, bug: JIRABug, target_status: str) -> Optional[str]:
+        """ Get the ID of the transition named target_status from the bug's status.
+        Transitions are looked up once per workflow, i.e. per project, issue type and status.
+        """
+        key = (bug.product, bug.issue_type, bug.status, target_status)
+        with self._transition_ids_lock:
+            if key in self._transition_ids:
+                return self._transition_ids[key]
+        transition_id = next((t["id"] for t in self._client.transitions(bug.id)
+                              if t["name"].lower() == target_status.lower()), None)
+        with self._transition_ids_lock:
+            self._transition_ids[key] = transition_id
+        return transition_id
+
     def add_comment(self, bugid: str, comment: str, private: bool, noop=False):
         if noop:
             logger.info(f"Would have added a private={private} comment to {bugid}")
@@ -729,11 +1142,97 @@ class JIRABugTracker(BugTracker):
             query += custom_query
         return query
 
-    def _search(self, query, verbose=False) -> List[JIRABug]:
+    def _search(self, query, verbose=False, fields: Optional[List[str]] = None,
+                bug_cache: Optional[BugCache] = None, full_refresh=False) -> List[JIRABug]:
+        """ Search for issues matching the JQL query.
+        With the local bug cache, only issues updated since the last sync of the query are fetched.
+        :param fields: fields to fetch. Default to JIRA_BUG_FIELDS. Issues with other fields aren't cached.
+        :param bug_cache: bug cache to use instead of the tracker's own, e.g. a sweep state file
+        :param full_refresh: with a bug cache, ignore the last sync of the query
+        """
+        bug_cache = bug_cache or self._bug_cache
+        if bug_cache and not fields:
+            return self._cached_search(query, verbose=verbose, bug_cache=bug_cache, full_refresh=full_refresh)
+        return [JIRABug(issue, self._load_issue) for issue in self._search_issues(query, verbose=verbose, fields=fields)]
+
+    def _search_issues(self, query, verbose=False, fields: Optional[List[str]] = None,
+                       expand: Optional[str] = None, max_pages: Optional[int] = None) -> Optional[List[Issue]]:
+        """ The first page tells the total number of matches; the remaining pages are then fetched concurrently.
+        :param max_pages: if given, give up when the search takes more pages than that
+        :return: the matching issues, or None if the search was given up
+        """
         if verbose:
             logger.info(query)
-        results = self._client.search_issues(query, maxResults=0)
-        return [JIRABug(j) for j in results]
+        fields = fields or self.JIRA_BUG_FIELDS
+        extra = {"expand": expand} if expand else {}
+
+        def _page(start_at):
+            return self._client.search_issues(query, startAt=start_at, maxResults=self.JIRA_SEARCH_PAGE_SIZE,
+                                              fields=fields, **extra)
+
+        first_page = _page(0)
+        # server may cap maxResults at less than we asked for
+        page_size = first_page.maxResults or self.JIRA_SEARCH_PAGE_SIZE
+        total = first_page.total or len(first_page)
+        pages = [first_page]
+        starts = list(range(page_size, total, page_size))
+        if max_pages is not None and len(starts) + 1 > max_pages:
+            return None
+        if starts:
+            if verbose:
+                logger.info(f"Fetching {total} issues in {len(starts) + 1} pages")
+            pool = ThreadPool(min(self.JIRA_SEARCH_CONCURRENCY, len(starts)))
+            pages.extend(pool.map(_page, starts))
+            pool.close()
+            pool.join()
+
+        # an issue can move between pages if it's updated while paging
+        issues = {issue.key: issue for page in pages for issue in page}
+        return list(issues.values())
+
+    @staticmethod
+    def _updated_since(changed_since: float) -> str:
+        # JQL only takes minutes; relative time avoids depending on the server's time zone
+        minutes = math.ceil((time.time() - changed_since) / 60)
+        return f"updated >= -{minutes}m"
+
+    def _search_raw(self, query, verbose=False, changed_since: Optional[float] = None) -> Dict[str, dict]:
+        if changed_since is not None:
+            query = f"({query}) and {self._updated_since(changed_since)}"
+        return {issue.key: issue.raw for issue in self._search_issues(query, verbose=verbose)}
+
+    def _get_bugs_raw(self, bugids: List[str], permissive=False, verbose=False) -> Dict[str, dict]:
+        return {issue.key: issue.raw for issue in self._get_issues(bugids, permissive=permissive, verbose=verbose)}
+
+    def _changed_bug_ids(self, bugids: List[str], changed_since: float) -> Set[str]:
+        """ Bugs are asked about in chunks of JIRA_BUG_BATCH_SIZE, JIRA_SEARCH_CONCURRENCY chunks at a time.
+        When few issues of the whole project changed since then, listing them takes fewer requests;
+        that is tried first, and given up as soon as it would take more requests than the chunks.
+        """
+        def _changed_chunk(chunk_of_bugs):
+            query = self._query(bugids=chunk_of_bugs, with_target_release=False,
+                                custom_query=f" and {self._updated_since(changed_since)}")
+            return [issue.key for issue in self._search_issues(query, fields=['updated'])]
+
+        chunks = list(chunk(bugids, self.JIRA_BUG_BATCH_SIZE))
+        if len(chunks) > 1:
+            query = f"project={self._project} and {self._updated_since(changed_since)}"
+            issues = self._search_issues(query, fields=['updated'], max_pages=len(chunks))
+            if issues is not None:
+                return {issue.key for issue in issues}.intersection(bugids)
+        if len(chunks) <= 1:
+            results = [_changed_chunk(c) for c in chunks]
+        else:
+            pool = ThreadPool(min(self.JIRA_SEARCH_CONCURRENCY, len(chunks)))
+            try:
+                results = pool.map(_changed_chunk, chunks)
+            finally:
+                pool.close()
+                pool.join()
+        return {key for result in results for key in result}.intersection(bugids)
+
+    def _bug_from_raw(self, raw: dict) -> JIRABug:
+        return JIRABug(Issue(self._client._options, self._client._session, raw=raw), self._load_issue)
 
     def blocker_search(self, status, search_filter='default', verbose=False, **kwargs):
         query = self._query(
@@ -744,20 +1243,20 @@ class JIRABugTracker(BugTracker):
         )
         return self._search(query, verbose=verbose, **kwargs)
 
-    def search(self, status, search_filter='default', verbose=False):
+    def search(self, status, search_filter='default', verbose=False, **kwargs):
         query = self._query(
             status=status,
             search_filter=search_filter
         )
-        return self._search(query, verbose=verbose)
+        return self._search(query, verbose=verbose, **kwargs)
 
-    def cve_tracker_search(self, status, search_filter='default', verbose=False):
+    def cve_tracker_search(self, status, search_filter='default', verbose=False, **kwargs):
         query = self._query(
             status=status,
             search_filter=search_filter,
             include_labels=["SecurityTracking"],
         )
-        return self._search(query, verbose=verbose)
+        return self._search(query, verbose=verbose, **kwargs)
 
     def remove_bugs(self, advisory_obj, bugids: List, noop=False):
         if noop:
@@ -774,20 +1273,81 @@ class JIRABugTracker(BugTracker):
 
     def filter_bugs_by_cutoff_event(self, bugs: Iterable, desired_statuses: Iterable[str],
                                     sweep_cutoff_timestamp: float, verbose=False) -> List:
+        """ Bugs are checked in chunks of JIRA_BUG_BATCH_SIZE, JIRA_SEARCH_CONCURRENCY chunks at a time """
+        if self.cutoff_mode == "changelog":
+            return self._filter_bugs_by_changelog(bugs, desired_statuses, sweep_cutoff_timestamp)
         dt = datetime.utcfromtimestamp(sweep_cutoff_timestamp).strftime("%Y/%m/%d %H:%M")
         val = ','.join(f'"{s}"' for s in desired_statuses)
-        query = f"issue in ({','.join([b.id for b in bugs])}) " \
-                f"and status was in ({val}) " \
-                f'before("{dt}")'
-        return self._search(query, verbose=verbose)
 
-    async def filter_attached_bugs(self, bugs: Iterable):
+        def _filter_chunk(chunk_of_bugs):
+            query = f"issue in ({','.join([b.id for b in chunk_of_bugs])}) " \
+                    f"and status was in ({val}) " \
+                    f'before("{dt}")'
+            return self._search(query, verbose=verbose)
+
+        chunks = list(chunk(list(bugs), self.JIRA_BUG_BATCH_SIZE))
+        if len(chunks) <= 1:
+            return [b for c in chunks for b in _filter_chunk(c)]
+        pool = ThreadPool(min(self.JIRA_SEARCH_CONCURRENCY, len(chunks)))
+        try:
+            return [b for result in pool.map(_filter_chunk, chunks) for b in result]
+        finally:
+            pool.close()
+            pool.join()
+
+    def _filter_bugs_by_changelog(self, bugs: Iterable, desired_statuses: Iterable[str],
+                                  sweep_cutoff_timestamp: float) -> List:
+        """ Same as `status was in (...) before(...)`, evaluated on the bugs' changelogs instead of by the server:
+        a bug qualifies if it had one of the desired statuses at any time before the cutoff.
+        """
         bugs = list(bugs)
-        api = AsyncErrataAPI()
-        results = await asyncio.gather(*[api.get_advisories_for_jira(bug.id, ignore_not_found=True) for bug in bugs])
-        attached_bugs = [bug for bug, advisories in zip(bugs, results) if advisories]
-        await api.close()
-        return attached_bugs
+        # JQL dates only take minutes
+        cutoff = sweep_cutoff_timestamp - sweep_cutoff_timestamp % 60
+        desired_statuses = {s.lower() for s in desired_statuses}
+        status_changes = self._get_status_changes([b.id for b in bugs])
+        qualified_bugs = []
+        for bug in bugs:
+            if bug.creation_time_parsed().timestamp() >= cutoff:
+                continue
+            changes = status_changes.get(bug.id, [])
+            # the status the bug was created with, then each it moved to before the cutoff
+            statuses = {changes[0][1] if changes else bug.status}
+            statuses.update(new for ts, _, new in changes if ts < cutoff)
+            if desired_statuses.intersection(s.lower() for s in statuses):
+                qualified_bugs.append(bug)
+        return qualified_bugs
+
+    def _fetch_status_changes(self, bug_ids: List[str]) -> Dict[str, List[Tuple[float, str, str]]]:
+        issues = self._get_issues(bug_ids, permissive=True, fields=["status"], expand="changelog")
+        result = {}
+        for issue in issues:
+            changes = [
+                (datetime.strptime(history["created"], '%Y-%m-%dT%H:%M:%S.%f%z').timestamp(),
+                 item["fromString"], item["toString"])
+                for history in self._changelog_histories(issue)
+                for item in history["items"] if item["field"] == "status"
+            ]
+            result[issue.key] = sorted(changes, key=lambda c: c[0])
+        return result
+
+    def _changelog_histories(self, issue: Issue) -> List[Dict]:
+        """ All histories of an issue's changelog.
+        A search only returns the first page of each changelog; the rest is fetched from /issue/{key}/changelog.
+        """
+        changelog = issue.raw.get("changelog", {})
+        histories = list(changelog.get("histories", []))
+        total = changelog.get("total", len(histories))
+        while len(histories) < total:
+            page = self._client._get_json(f"issue/{issue.key}/changelog",
+                                          params={"startAt": len(histories), "maxResults": self.JIRA_SEARCH_PAGE_SIZE})
+            if not page.get("values"):
+                logger.warning(f"Only got {len(histories)} of {total} changelog entries of {issue.key}")
+                break
+            histories.extend(page["values"])
+        return histories
+
+    async def get_attached_advisories(self, api: AsyncErrataAPI, bugid: str):
+        return await api.get_advisories_for_jira(bugid, ignore_not_found=True)
 
     @staticmethod
     def advisory_bug_ids(advisory_obj):
@@ -805,6 +1365,11 @@ class JIRABugTracker(BugTracker):
 
 
 class BugzillaBugTracker(BugTracker):
+    # Bugs changed by one update request
+    BZ_UPDATE_BATCH_SIZE = 100
+    # Chunks of bug histories fetched at once
+    BZ_HISTORY_CONCURRENCY = 4
+
     @staticmethod
     def get_config(runtime):
         major, minor = runtime.get_major_minor()
@@ -826,8 +1391,8 @@ class BugzillaBugTracker(BugTracker):
                              "login --api-key")
         return client
 
-    def __init__(self, config):
-        super().__init__(config, 'bugzilla')
+    def __init__(self, config, bug_cache: Optional[BugCache] = None):
+        super().__init__(config, 'bugzilla', bug_cache)
         self._client = self.login()
         self.product = self.config.get('product', '')
 
@@ -840,7 +1405,10 @@ class BugzillaBugTracker(BugTracker):
         if 'verbose' in kwargs:
             if kwargs.pop('verbose'):
                 logger.info(f'get_bugs called with bugids: {bugids}, permissive: {permissive} and kwargs: {kwargs}')
-        bugs = [BugzillaBug(b) for b in self._client.getbugs(bugids, permissive=permissive, **kwargs)]
+        if self._bug_cache and not kwargs:
+            bugs = self._cached_get_bugs(bugids, permissive=permissive)
+        else:
+            bugs = [BugzillaBug(b) for b in self._client.getbugs(bugids, permissive=permissive, **kwargs)]
         if len(bugs) < len(bugids):
             bugids_not_found = set(bugids) - {b.id for b in bugs}
             msg = f"Some bugs could not be fetched ({len(bugids)-len(bugs)}): {bugids_not_found}"
@@ -851,24 +1419,61 @@ class BugzillaBugTracker(BugTracker):
     def client(self):
         return self._client
 
-    def blocker_search(self, status, search_filter='default', verbose=False):
+    def blocker_search(self, status, search_filter='default', verbose=False, **kwargs):
         query = _construct_query_url(self.config, status, search_filter, flag='blocker+')
-        return self._search(query, verbose)
+        return self._search(query, verbose, **kwargs)
 
-    def search(self, status, search_filter='default', verbose=False):
+    def search(self, status, search_filter='default', verbose=False, **kwargs):
         query = _construct_query_url(self.config, status, search_filter)
-        return self._search(query, verbose)
+        return self._search(query, verbose, **kwargs)
 
-    def cve_tracker_search(self, status, search_filter='default', verbose=False):
+    def cve_tracker_search(self, status, search_filter='default', verbose=False, **kwargs):
         query = _construct_query_url(self.config, status, search_filter)
         query.addKeyword('SecurityTracking')
-        return self._search(query, verbose)
+        return self._search(query, verbose, **kwargs)
 
-    def _search(self, query, verbose=False):
+    def _search(self, query, verbose=False, bug_cache: Optional[BugCache] = None, full_refresh=False):
+        """ Search for bugs matching the query.
+        With the local bug cache, only bugs changed since the last sync of the query are fetched.
+        :param bug_cache: bug cache to use instead of the tracker's own, e.g. a sweep state file
+        :param full_refresh: with a bug cache, ignore the last sync of the query
+        """
+        bug_cache = bug_cache or self._bug_cache
+        if bug_cache:
+            return self._cached_search(query, verbose=verbose, bug_cache=bug_cache, full_refresh=full_refresh)
         if verbose:
             logger.info(query)
         return [BugzillaBug(b) for b in _perform_query(self._client, query)]
 
+    def _cache_namespace(self, query=None) -> str:
+        if query is None:
+            return self.type
+        # searches only fetch the query's fields; keep them apart from bugs fetched with all fields
+        return f"{self.type}:{','.join(sorted(query.fields or ['id']))}"
+
+    def _search_raw(self, query, verbose=False, changed_since: Optional[float] = None) -> Dict[str, dict]:
+        if verbose:
+            logger.info(query)
+        return {str(b.id): _bz_raw_to_json(b.get_raw_data())
+                for b in _perform_query(self._client, query, changed_since=changed_since)}
+
+    def _get_bugs_raw(self, bugids: List, permissive=False, verbose=False) -> Dict[str, dict]:
+        return {str(b.id): _bz_raw_to_json(b.get_raw_data()) for b in self._client.getbugs(bugids, permissive=permissive)}
+
+    def _changed_bug_ids(self, bugids: List[str], changed_since: float) -> Set[str]:
+        changed = set()
+        for ids in chunk(bugids, 500):
+            bugs = self._client.query({
+                "id": [int(b) for b in ids],
+                "last_change_time": _bz_timestamp(changed_since),
+                "include_fields": ["id"],
+            })
+            changed |= {str(b.id) for b in bugs}
+        return changed
+
+    def _bug_from_raw(self, raw: dict) -> BugzillaBug:
+        return BugzillaBug(BugzillaBugObject(self._client, dict=_bz_raw_from_json(raw)))
+
     def remove_bugs(self, advisory_obj, bugids: List, noop=False):
         if noop:
             print(f"Would've removed bugs: {bugids}")
@@ -906,14 +1511,77 @@ class BugzillaBugTracker(BugTracker):
         return BugzillaBug(new_bug)
 
     def _update_bug_status(self, bugid, target_status):
+        return self._client.update_bugs([bugid], self._build_status_update(target_status))
+
+    def _build_status_update(self, target_status, **kwargs):
         if target_status == 'CLOSED':
-            return self._client.update_bugs([bugid], self._client.build_update(status=target_status,
-                                                                               resolution='WONTFIX'))
-        return self._client.update_bugs([bugid], self._client.build_update(status=target_status))
+            return self._client.build_update(status=target_status, resolution='WONTFIX', **kwargs)
+        return self._client.build_update(status=target_status, **kwargs)
 
     def add_comment(self, bugid, comment: str, private, noop=False):
+        if noop:
+            logger.info(f"Would have added a private={private} comment to {bugid}")
+            return
         self._client.update_bugs([bugid], self._client.build_update(comment=comment, comment_private=private))
 
+    def update_bugs_status(self, bugs: Iterable[Bug], target_status: str,
+                           comment: Optional[str] = None, log_comment: bool = True, noop=False) -> Dict:
+        """ Update the status of many bugs as update_bug_status does.
+        Bugs with the same current status get the same comment, so they are updated together,
+        along with the comment, in one request per BZ_UPDATE_BATCH_SIZE bugs.
+        :return: a dict of bug id -> True if the status has been (or would have been) updated,
+        False if the bug was already on target_status, or the exception raised updating it
+        """
+        results = {}
+        bugids_by_status = {}
+        for bug in bugs:
+            if bug.status == target_status:
+                logger.info(f'{bug.id} is already on {target_status}')
+                results[bug.id] = False
+            else:
+                bugids_by_status.setdefault(bug.status, []).append(bug.id)
+
+        for current_status, bugids in bugids_by_status.items():
+            comment_lines = []
+            if log_comment:
+                comment_lines.append(f'Elliott changed bug status from {current_status} to {target_status}.')
+            if comment:
+                comment_lines.append(comment)
+            kwargs = {'comment': '\n'.join(comment_lines), 'comment_private': True} if comment_lines else {}
+            for batch in chunk(bugids, self.BZ_UPDATE_BATCH_SIZE):
+                action = f'changed {batch} from {current_status} to {target_status}'
+                if noop:
+                    logger.info(f"Would have {action}")
+                    results.update(dict.fromkeys(batch, True))
+                    continue
+                try:
+                    self._client.update_bugs(batch, self._build_status_update(target_status, **kwargs))
+                    logger.info(action)
+                    results.update(dict.fromkeys(batch, True))
+                except Exception as e:
+                    logger.error(f"Failed to change {batch} to {target_status}: {e}")
+                    results.update(dict.fromkeys(batch, e))
+        return results
+
+    def add_comments(self, bugids: Iterable, comment: str, private: bool, noop=False) -> Dict:
+        """ Add the same comment to many bugs, in one request per BZ_UPDATE_BATCH_SIZE bugs
+        :return: a dict of bug id -> True if the comment has been (or would have been) added,
+        or the exception raised adding it
+        """
+        results = {}
+        for batch in chunk(list(dict.fromkeys(bugids)), self.BZ_UPDATE_BATCH_SIZE):
+            if noop:
+                logger.info(f"Would have added a private={private} comment to {batch}")
+                results.update(dict.fromkeys(batch, True))
+                continue
+            try:
+                self._client.update_bugs(batch, self._client.build_update(comment=comment, comment_private=private))
+                results.update(dict.fromkeys(batch, True))
+            except Exception as e:
+                logger.error(f"Failed to comment on {batch}: {e}")
+                results.update(dict.fromkeys(batch, e))
+        return results
+
     def filter_bugs_by_cutoff_event(self, bugs: Iterable, desired_statuses: Iterable[str],
                                     sweep_cutoff_timestamp: float, verbose=False) -> List:
         """ Given a list of bugs, finds those that have changed to one of the desired statuses before the given timestamp.
@@ -949,42 +1617,20 @@ class BugzillaBugTracker(BugTracker):
                 f"{len(bugs) - len(before_cutoff_bugs)} of {len(bugs)} bugs are ignored because they were created after the sweep cutoff timestamp {sweep_cutoff_timestamp} ({datetime.utcfromtimestamp(sweep_cutoff_timestamp)})")
 
         # Queries bug history
-        bugs_history = self._client.bugs_history_raw([bug.id for bug in before_cutoff_bugs])
-
-        class BugStatusChange:
-            def __init__(self, timestamp: int, old: str, new: str) -> None:
-                self.timestamp = timestamp  # when this change is made?
-                self.old = old  # old status
-                self.new = new  # new status
-
-            @classmethod
-            def from_history_ent(cls, history):
-                """ Converts from bug history dict returned from Bugzilla to BugStatusChange object.
-                The history dict returned from Bugzilla includes bug changes on all fields, but we are only interested in the "status" field change.
-                :return: BugStatusChange object, or None if the history doesn't include a "status" field change.
-                """
-                status_change = next(filter(lambda change: change["field_name"] == "status", history["changes"]), None)
-                if not status_change:
-                    return None
-                return cls(to_timestamp(history["when"]), status_change["removed"], status_change["added"])
-
-        for bug, bug_history in zip(before_cutoff_bugs, bugs_history["bugs"]):
-            assert bug.id == bug_history[
-                "id"]  # `bugs_history["bugs"]` returned from Bugzilla API should have the same order as `before_cutoff_bugs`, but be safe
-
-            # We are only interested in "status" field changes
-            status_changes = filter(None, map(BugStatusChange.from_history_ent, bug_history["history"]))
+        status_changes = self._get_status_changes([bug.id for bug in before_cutoff_bugs])
+
+        for bug in before_cutoff_bugs:
+            # (timestamp, old status, new status), oldest first
+            changes = status_changes.get(bug.id, [])
 
             # status changes after the cutoff event
-            after_cutoff_status_changes = list(
-                itertools.dropwhile(lambda change: change.timestamp <= sweep_cutoff_timestamp, status_changes))
+            after_cutoff_status_changes = changes[bisect.bisect_right([c[0] for c in changes], sweep_cutoff_timestamp):]
 
             # determines the status of the bug at the moment of the sweep cutoff event
             if not after_cutoff_status_changes:
                 sweep_cutoff_status = bug.status  # no status change after the cutoff event; use current status
             else:
-                sweep_cutoff_status = after_cutoff_status_changes[
-                    0].old  # sweep_cutoff_status should be the old status of the first status change after the sweep cutoff event
+                sweep_cutoff_status = after_cutoff_status_changes[0][1]  # sweep_cutoff_status should be the old status of the first status change after the sweep cutoff event
 
             if sweep_cutoff_status not in desired_statuses:
                 logger.info(
@@ -992,9 +1638,9 @@ class BugzillaBugTracker(BugTracker):
                 continue
 
             # Per @Justin Pierce: If a BZ seems to qualify for a sweep currently and at the sweep cutoff event, then all state changes after the sweep cutoff event must be to a greater than the state which qualified the BZ at the sweep cutoff event.
-            regressed_changes = [change.new for change in after_cutoff_status_changes if
-                                 constants.VALID_BUG_STATES.index(change.new) <= constants.VALID_BUG_STATES.index(
-                                     sweep_cutoff_status)]
+            cutoff_status_index = constants.VALID_BUG_STATES.index(sweep_cutoff_status)
+            regressed_changes = [new for _, _, new in after_cutoff_status_changes if
+                                 constants.VALID_BUG_STATES.index(new) <= cutoff_status_index]
             if regressed_changes:
                 logger.warning(
                     f"BZ {bug.id} is ignored because its status was {sweep_cutoff_status} at the moment of sweep cutoff ({datetime.utcfromtimestamp(sweep_cutoff_timestamp)})"
@@ -1005,13 +1651,34 @@ class BugzillaBugTracker(BugTracker):
 
         return qualified_bugs
 
-    async def filter_attached_bugs(self, bugs: Iterable):
-        bugs = list(bugs)
-        api = AsyncErrataAPI()
-        results = await asyncio.gather(*[api.get_advisories_for_bug(bug.id) for bug in bugs])
-        attached_bugs = [bug for bug, advisories in zip(bugs, results) if advisories]
-        await api.close()
-        return attached_bugs
+    def _fetch_status_changes(self, bug_ids: List[int]) -> Dict[int, List[Tuple[float, str, str]]]:
+        """ Histories are fetched in chunks of BUG_LOOKUP_CHUNK_SIZE bugs, BZ_HISTORY_CONCURRENCY chunks at a time """
+        def _fetch(chunk_of_bug_ids):
+            return self._client.bugs_history_raw(chunk_of_bug_ids)["bugs"]
+
+        chunks = list(chunk(bug_ids, constants.BUG_LOOKUP_CHUNK_SIZE))
+        if len(chunks) > 1:
+            pool = ThreadPool(min(self.BZ_HISTORY_CONCURRENCY, len(chunks)))
+            try:
+                histories = [h for page in pool.map(_fetch, chunks) for h in page]
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            histories = [h for c in chunks for h in _fetch(c)]
+        result = {}
+        for bug_history in histories:
+            # The history includes bug changes on all fields, but we are only interested in "status" field changes
+            status_changes = (next((c for c in entry["changes"] if c["field_name"] == "status"), None)
+                              for entry in bug_history["history"])
+            result[bug_history["id"]] = [
+                (to_timestamp(entry["when"]), change["removed"], change["added"])
+                for entry, change in zip(bug_history["history"], status_changes) if change
+            ]
+        return result
+
+    async def get_attached_advisories(self, api: AsyncErrataAPI, bugid: int):
+        return await api.get_advisories_for_bug(bugid)
 
     @staticmethod
     def advisory_bug_ids(advisory_obj):
@@ -1104,16 +1771,41 @@ def _construct_query_url(config, status, search_filter='default', flag=None):
     return query_url
 
 
-def _perform_query(bzapi, query_url):
-    BZ_PAGE_SIZE = 1000
+def _bz_timestamp(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-    def iterate_query(query):
-        results = bzapi.query(query)
 
-        if len(results) == BZ_PAGE_SIZE:
-            query['offset'] += BZ_PAGE_SIZE
-            results += iterate_query(query)
-        return results
+def _bz_raw_to_json(value):
+    """ Make raw bug data from XML-RPC JSON serializable, for the local bug cache.
+    xmlrpc.client.DateTime values, such as creation_time, become {"__datetime__": "20230101T00:00:00"}.
+    """
+    if isinstance(value, xmlrpc.client.DateTime):
+        return {"__datetime__": value.value}
+    if isinstance(value, dict):
+        return {k: _bz_raw_to_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_bz_raw_to_json(v) for v in value]
+    return value
+
+
+def _bz_raw_from_json(value):
+    """ Reverse _bz_raw_to_json """
+    if isinstance(value, dict):
+        if set(value) == {"__datetime__"}:
+            return xmlrpc.client.DateTime(value["__datetime__"])
+        return {k: _bz_raw_from_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_bz_raw_from_json(v) for v in value]
+    return value
+
+
+def _perform_query(bzapi, query_url, concurrency=4, changed_since: Optional[float] = None):
+    """ Run the query, fetching BZ_PAGE_SIZE bugs per request.
+    Bugzilla doesn't tell the total number of results, so once the first page comes back full,
+    the next `concurrency` pages are requested at once until one of them comes back short.
+    :param changed_since: if given, only get bugs changed since this timestamp
+    """
+    BZ_PAGE_SIZE = 1000
 
     include_fields = query_url.fields
     if not include_fields:
@@ -1122,9 +1814,33 @@ def _perform_query(bzapi, query_url):
     query = bzapi.url_to_query(str(query_url))
     query["include_fields"] = include_fields
     query["limit"] = BZ_PAGE_SIZE
-    query["offset"] = 0
-
-    return iterate_query(query)
+    if changed_since is not None:
+        query["last_change_time"] = _bz_timestamp(changed_since)
+
+    def get_page(offset):
+        return bzapi.query({**query, "offset": offset})
+
+    results = get_page(0)
+    offset = BZ_PAGE_SIZE
+    last_page_full = len(results) == BZ_PAGE_SIZE
+    if last_page_full:
+        pool = ThreadPool(concurrency)
+        while last_page_full:
+            pages = pool.map(get_page, range(offset, offset + concurrency * BZ_PAGE_SIZE, BZ_PAGE_SIZE))
+            for page in pages:
+                results.extend(page)
+                last_page_full = len(page) == BZ_PAGE_SIZE
+                if not last_page_full:
+                    break
+            offset += concurrency * BZ_PAGE_SIZE
+        pool.close()
+        pool.join()
+
+    # a bug can move between pages if it's updated while paging
+    unique = {}
+    for bug in results:
+        unique.setdefault(bug.id, bug)
+    return list(unique.values())
 
 
 class SearchFilter(object):
@@ -1253,7 +1969,8 @@ def sort_cve_bugs(bugs):
     return sorted(bugs, key=cve_sort_key, reverse=True)
 
 
-def is_first_fix_any(flaw_bug: BugzillaBug, tracker_bugs: Iterable[Bug], current_target_release: str):
+async def is_first_fix_any(security_data_api: AsyncSecurityDataAPI, flaw_bug: BugzillaBug, tracker_bugs: Iterable[Bug],
+                           current_target_release: str):
     # all z stream bugs are considered first fix
     if current_target_release[-1] != '0':
         return True
@@ -1266,41 +1983,29 @@ def is_first_fix_any(flaw_bug: BugzillaBug, tracker_bugs: Iterable[Bug], current
         raise ValueError(f'flaw bug {flaw_bug.id} does not have an alias')
 
     alias = flaw_bug.alias[0]
-    cve_url = f"https://access.redhat.com/hydra/rest/securitydata/cve/{alias}.json"
-    response = requests.get(cve_url)
-    response.raise_for_status()
-    data = response.json()
+    data = await security_data_api.get_cve(alias)
 
     major, minor = util.minor_version_tuple(current_target_release)
     ocp_product_name = f"Red Hat OpenShift Container Platform {major}"
-    components_not_yet_fixed = []
-    pyxis_base_url = "https://pyxis.engineering.redhat.com/v1/repositories/registry/registry.access.redhat.com" \
-                     "/repository/{pkg_name}/images?page_size=1&include=data.brew"
 
     if 'package_state' not in data:
         logger.info(f'{flaw_bug.id} ({alias}) not considered a first-fix because no unfixed components were found')
         return False
 
-    for package_info in data['package_state']:
-        # previously we were also checking `package_info['fix_state'] in ['Affected', 'Under investigation']`
-        # but we don't need to verify that since according to @sfowler if a package has a tracker for a cve
-        # and was found in the list of unfixed components then it is assumed to be `Affected`
-        if ocp_product_name in package_info['product_name']:
-            pkg_name = package_info['package_name']
-            # for images `package_name` field is usually the container delivery repo
-            # otherwise we assume it's the exact brew package name
-            if '/' in pkg_name:
-                pyxis_url = pyxis_base_url.format(pkg_name=pkg_name)
-                response = requests.get(pyxis_url, auth=HTTPSPNEGOAuth())
-                if response.status_code == requests.codes.ok:
-                    data = response.json()['data']
-                    if data:
-                        pkg_name = data[0]['brew']['package']
-                    else:
-                        logger.warn(f'could not find brew package info at {pyxis_url}')
-                else:
-                    logger.warn(f'got status={response.status_code} for {pyxis_url}')
-            components_not_yet_fixed.append(pkg_name)
+    async def _brew_package(pkg_name):
+        # for images `package_name` field is usually the container delivery repo
+        # otherwise we assume it's the exact brew package name
+        if '/' in pkg_name:
+            return await security_data_api.get_brew_package(pkg_name) or pkg_name
+        return pkg_name
+
+    # previously we were also checking `package_info['fix_state'] in ['Affected', 'Under investigation']`
+    # but we don't need to verify that since according to @sfowler if a package has a tracker for a cve
+    # and was found in the list of unfixed components then it is assumed to be `Affected`
+    components_not_yet_fixed = await asyncio.gather(*[
+        _brew_package(package_info['package_name']) for package_info in data['package_state']
+        if ocp_product_name in package_info['product_name']
+    ])
 
     # get tracker components
     first_fix_components = []
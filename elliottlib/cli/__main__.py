@@ -10,10 +10,7 @@ web service.
 
 # Prepare for Python 3
 # stdlib
-from multiprocessing import cpu_count
-from multiprocessing.dummy import Pool as ThreadPool
 import asyncio
-import datetime
 import json
 import sys
 from typing import Dict, List
@@ -28,12 +25,12 @@ import elliottlib.brew
 import elliottlib.errata
 import elliottlib.exceptions
 
-from elliottlib.exceptions import ElliottFatalError
+from elliottlib.errata_async import AsyncErrataAPI, AsyncErrataUtils
+from elliottlib.exceptions import BuildSigningTimeoutError, ElliottFatalError
 from elliottlib.util import exit_unauthenticated, green_prefix
 from elliottlib.util import red_print
 from elliottlib.util import green_print, red_prefix
 from elliottlib.util import yellow_print, yellow_prefix
-from elliottlib.util import progress_func, pbar_header
 from elliottlib.cli.common import cli, use_default_advisory_option, find_default_advisory, click_coroutine
 
 # cli commands
@@ -72,7 +69,7 @@ from elliottlib.cli.move_builds_cli import move_builds_cli
 
 # 3rd party
 import click
-from errata_tool import ErrataException
+from aiohttp import ClientResponseError
 
 
 # -----------------------------------------------------------------------------
@@ -314,17 +311,16 @@ written out to summary_results.json.
         if advisory_nvrs:
             click.echo(f"Getting information of {len(advisory_nvrs)} advisories...")
             for advisory, nvrs in advisory_nvrs.items():
-                advisory_obj = elliottlib.errata.get_raw_erratum(advisory)
-                adv_type, adv_info = next(iter(advisory_obj["errata"].items()))
+                advisory_info = elliottlib.errata.AdvisoryInfo.fetch(advisory)
                 item = {
                     "id": advisory,
-                    "type": adv_type.upper(),
+                    "type": advisory_info.errata_type,
                     "url": elliottlib.constants.errata_url + f"/{advisory}",
-                    "summary": adv_info["synopsis"],
-                    "state": adv_info["status"],
+                    "summary": advisory_info.synopsis,
+                    "state": advisory_info.errata_state,
                     "nvrs": nvrs,
                 }
-                if adv_info["status"] == "SHIPPED_LIVE":
+                if advisory_info.errata_state == "SHIPPED_LIVE":
                     in_shipped_advisory.append(item)
                 else:
                     in_pending_advisory.append(item)
@@ -355,7 +351,8 @@ written out to summary_results.json.
               default=False, is_flag=True,
               help="Don't actually poll, just print the signed status of each build")
 @pass_runtime
-def poll_signed(runtime, minutes, advisory, default_advisory_type, noop):
+@click_coroutine
+async def poll_signed(runtime, minutes, advisory, default_advisory_type, noop):
     """Poll for the signed-status of RPM builds attached to
 ADVISORY. Returns rc=0 when all builds have been signed. Returns non-0
 after MINUTES have passed and all builds have not been signed. This
@@ -398,58 +395,37 @@ unsigned builds.
     if not noop:
         click.echo("Polling up to {} minutes for all RPMs to be signed".format(minutes))
 
+    api = AsyncErrataAPI()
     try:
-        e = elliottlib.errata.Advisory(errata_id=advisory)
-        all_builds = set([])
-        all_signed = False
-        # `errata_builds` is a dict with brew tags as keys, values are
-        # lists of builds on the advisory with that tag
-        for k, v in e.errata_builds.items():
-            all_builds = all_builds.union(set(v))
+        all_builds = await api.get_builds_flattened(advisory)
         green_prefix("Fetching initial states: ")
         click.echo("{} builds to check".format(len(all_builds)))
-        start_time = datetime.datetime.now()
-        while datetime.datetime.now() - start_time < datetime.timedelta(minutes=minutes):
-            pbar_header("Getting build signatures: ",
-                        "Should be pretty quick",
-                        all_builds)
-            pool = ThreadPool(cpu_count())
-            # Look up builds concurrently
-            click.secho("[", nl=False)
-
-            build_sigs = pool.map(
-                lambda build: progress_func(
-                    lambda: elliottlib.errata.build_signed(build),
-                    '*'),
-                all_builds)
-            # Wait for results
-            pool.close()
-            pool.join()
-            click.echo(']')
-
-            if all(build_sigs):
-                all_signed = True
-                break
-            elif noop:
-                # Escape the time-loop
-                break
-            else:
-                yellow_prefix("Not all builds signed: ")
-                click.echo("re-checking")
-                continue
-
-        if not all_signed:
-            red_prefix("Signing incomplete: ")
-            if noop:
-                click.echo("All builds not signed. ")
-            else:
-                click.echo("All builds not signed in given window ({} minutes). ".format(minutes))
-                exit(1)
+        signed_count = 0
+
+        def _on_signed(build):
+            nonlocal signed_count
+            signed_count += 1
+            green_prefix("Signed ({}/{}): ".format(signed_count, len(all_builds)))
+            click.echo(build)
+
+        await AsyncErrataUtils.wait_for_builds_signed(api, sorted(all_builds), 0 if noop else minutes * 60,
+                                                      on_signed=_on_signed)
+        green_prefix("All builds signed: ")
+        click.echo("Enjoy!")
+    except BuildSigningTimeoutError as ex:
+        red_prefix("Signing incomplete: ")
+        if noop:
+            click.echo("All builds not signed. ")
         else:
-            green_prefix("All builds signed: ")
-            click.echo("Enjoy!")
-    except ErrataException as ex:
-        raise ElliottFatalError(getattr(ex, 'message', repr(ex)))
+            click.echo("All builds not signed in given window ({} minutes). ".format(minutes))
+        for build in ex.unsigned_builds:
+            yellow_print("  Not signed: {}".format(build))
+        if not noop:
+            exit(1)
+    except ClientResponseError as ex:
+        raise ElliottFatalError(f"Failed to query Errata: {ex}")
+    finally:
+        await api.close()
 
 
 # Register additional commands / groups
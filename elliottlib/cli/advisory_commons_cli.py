@@ -1,7 +1,9 @@
 from elliottlib import logutil
-from elliottlib.cli.common import cli
+from elliottlib.cli.common import cli, print_advisory_summary, run_for_advisories
+from elliottlib.errata import AdvisoryInfo, erratum_lock
+from elliottlib.exceptions import ElliottFatalError
 from elliottlib.util import green_prefix
-from errata_tool import Erratum, ErrataException
+from errata_tool import Erratum
 import click
 import string
 import re
@@ -17,6 +19,10 @@ supported_update_fields = [
     'qe_email',
     'qe_group',
 ]
+# fields read under a different attribute name than the one they are updated with
+field_attrs = {
+    'owner_email': 'package_owner_email',
+}
 
 
 @cli.command("advisory-commons", short_help="Show or update advisory commons for a group of advisories")
@@ -77,73 +83,88 @@ will need updating. This command helps with that.
             raise click.BadParameter(f"Only these fields are supported for update: {supported_update_fields}")
     if not advisories:
         runtime.initialize()
-        advisories = runtime.group_config.advisories.values()
-
-    errors = []
-    for advisory_id in advisories:
-        update = False
-        try:
-            advisory = Erratum(errata_id=advisory_id)
-            green_prefix(f"{advisory_id}: ")
-
-            if field:
-                current = getattr(advisory, field)
-                click.echo(f"{field} = {current}")
-            if new:
-                if new == current:
-                    click.echo(f"No change. New value is same as current value: {field} = {current}")
-                else:
-                    click.echo(f"Preparing update to {field}: {current} ➔ {new}")
-                    advisory = _update_advisory(field, new, advisory)
-                    update = True
-            elif version_replace:
-                rex = r"^(\d.\d+.\d+):(\d.\d+.\d+)$"
-                match = re.search(rex, version_replace)
-                if not match:
-                    click.BadParameter(f"--version-replace needs to be of format {rex}. example '4.5.6:4.7.8'")
-                search_version, replace_version = match.groups()
-
-                # special case for description
-                f = "description"
-                click.echo(f"<{f}>")
+        advisories = list(runtime.group_config.advisories.values())
+
+    if version_replace:
+        rex = r"^(\d.\d+.\d+):(\d.\d+.\d+)$"
+        match = re.search(rex, version_replace)
+        if not match:
+            raise click.BadParameter(f"--version-replace needs to be of format {rex}. example '4.5.6:4.7.8'")
+        search_version, replace_version = match.groups()
+
+    def _process(advisory_id):
+        # output is collected and printed per advisory, followed by a summary
+        out = []
+        updates = []  # (field, value) to update the advisory with
+        attr = field_attrs.get(field, field)
+        if field and not hasattr(AdvisoryInfo, attr):
+            with erratum_lock:
+                advisory = Erratum(errata_id=advisory_id)
+        else:
+            advisory = AdvisoryInfo.fetch(advisory_id)
+
+        if field:
+            current = getattr(advisory, attr)
+            out.append(f"{field} = {current}")
+        if new:
+            if new == current:
+                out.append(f"No change. New value is same as current value: {field} = {current}")
+            else:
+                out.append(f"Preparing update to {field}: {current} ➔ {new}")
+                updates.append((field, new))
+        elif version_replace:
+            # special case for description
+            f = "description"
+            out.append(f"<{f}>")
+            current = getattr(advisory, f)
+            lines_to_match = [
+                "This advisory contains the RPM packages for Red Hat OpenShift Container Platform {version}",
+                "quay.io/openshift-release-dev/ocp-release:{version}"
+            ]
+            new_value = None
+            for line in lines_to_match:
+                search_line = line.format(version=search_version)
+                if search_line in current:
+                    replace_line = line.format(version=replace_version)
+                    new_value = current.replace(search_line, replace_line)
+                    out.append(f"Preparing line update: {search_line} ➔ {replace_line}")
+            if new_value is not None:
+                updates.append((f, new_value))
+            else:
+                out.append("No change. New value is same as current value")
+
+            # rest of the fields
+            fields = ["synopsis", "topic"]
+            for f in fields:
+                out.append(f"<{f}>")
                 current = getattr(advisory, f)
-                lines_to_match = [
-                    "This advisory contains the RPM packages for Red Hat OpenShift Container Platform {version}",
-                    "quay.io/openshift-release-dev/ocp-release:{version}"
-                ]
-                for line in lines_to_match:
-                    search_line = line.format(version=search_version)
-                    if search_line in current:
-                        replace_line = line.format(version=replace_version)
-                        new_value = current.replace(search_line, replace_line)
-                        click.echo(f"Preparing line update: {search_line} ➔ {replace_line}")
-                        update = True
-                if update:
-                    _update_advisory(f, new_value, advisory)
+                new_value = current.replace(search_version, replace_version)
+                if current == new_value:
+                    out.append("No change. New value is same as current value")
                 else:
-                    click.echo("No change. New value is same as current value")
-
-                # rest of the fields
-                fields = ["synopsis", "topic"]
-                for f in fields:
-                    click.echo(f"<{f}>")
-                    current = getattr(advisory, f)
-                    new_value = current.replace(search_version, replace_version)
-                    if current == new_value:
-                        click.echo("No change. New value is same as current value")
-                    else:
-                        click.echo(f"Preparing update: {current} ➔ {new_value}")
-                        _update_advisory(f, new_value, advisory)
-                        update = True
-
-            if not noop and update:
-                advisory.commit()
-                click.echo("Committed change")
-        except ErrataException as ex:
-            click.echo(f'Error fetching/changing {advisory_id}: {ex}')
-            errors.append(ex)
+                    out.append(f"Preparing update: {current} ➔ {new_value}")
+                    updates.append((f, new_value))
+
+        if not noop and updates:
+            with erratum_lock:
+                erratum = Erratum(errata_id=advisory_id)
+                for f, value in updates:
+                    _update_advisory(f, value, erratum)
+                erratum.commit()
+            out.append("Committed change")
+        return out
+
+    results, errors = run_for_advisories(advisories, _process)
+    for advisory_id in advisories:
+        if advisory_id in results:
+            green_prefix(f"{advisory_id}: ")
+            click.echo("\n".join(results[advisory_id]))
+        else:
+            click.echo(f'Error fetching/changing {advisory_id}: {errors[advisory_id]}')
+    if len(advisories) > 1:
+        print_advisory_summary(advisories, errors)
     if errors:
-        raise Exception(errors)
+        raise ElliottFatalError(f"Failed to fetch/change advisories {list(errors)}")
 
 
 def _update_advisory(field, value, advisory):
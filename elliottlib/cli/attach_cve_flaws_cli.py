@@ -1,19 +1,22 @@
+import asyncio
 import sys
 import traceback
 from logging import Logger
-from typing import Dict, Iterable, List, Set
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 import click
 from errata_tool import Erratum
 
-from elliottlib import constants
+from elliottlib import constants, exectools
+from elliottlib.lookup_cache import LookupCache
 from elliottlib.bzutil import sort_cve_bugs
 from elliottlib.cli.common import (cli, click_coroutine, find_default_advisory,
                                    use_default_advisory_option)
 from elliottlib.errata import is_security_advisory
 from elliottlib.errata_async import AsyncErrataAPI, AsyncErrataUtils
 from elliottlib.runtime import Runtime
-from elliottlib.bzutil import Bug, get_highest_security_impact, is_first_fix_any, BugTracker
+from elliottlib.security_data import AsyncSecurityDataAPI
+from elliottlib.bzutil import Bug, BugMemo, get_highest_security_impact, is_first_fix_any, BugTracker
 
 
 @cli.command('attach-cve-flaws',
@@ -58,39 +61,94 @@ async def attach_cve_flaws_cli(runtime: Runtime, advisory_id: int, noop: bool, d
         advisories = [find_default_advisory(runtime, default_advisory_type)]
     else:
         advisories = [advisory_id]
-    exit_code = 0
     flaw_bug_tracker = runtime.get_bug_tracker('bugzilla')
+    bug_trackers = [runtime.get_bug_tracker('jira'), runtime.get_bug_tracker('bugzilla')]
     errata_config = runtime.get_errata_config()
     errata_api = AsyncErrataAPI(errata_config.get("server", constants.errata_url))
+    security_data_api = AsyncSecurityDataAPI(lookup_cache=runtime.get_lookup_cache())
     brew_api = runtime.build_retrying_koji_client()
-    for advisory_id in advisories:
-        runtime.logger.info("Getting advisory %s", advisory_id)
-        advisory = Erratum(errata_id=advisory_id)
-
-        attached_trackers = []
-        for bug_tracker in [runtime.get_bug_tracker('jira'), runtime.get_bug_tracker('bugzilla')]:
-            attached_trackers.extend(get_attached_trackers(advisory, bug_tracker, runtime.logger))
+    flaw_bugs_memo = BugMemo(lambda ids: flaw_bug_tracker.get_flaw_bugs(sorted(ids)))
 
-        tracker_flaws, flaw_bugs = get_flaws(flaw_bug_tracker, attached_trackers, brew_api, runtime.logger)
+    # errata_tool shares its auth at class level, so Erratum objects are loaded and changed one at a time.
+    # Bug lookups and first-fix checks run concurrently across advisories.
+    # Advisories are independent; a failure on one doesn't stop the others.
+    def _log_error(advisory_id, e):
+        runtime.logger.error(traceback.format_exc())
+        runtime.logger.error(f'Exception on advisory {advisory_id}: {e}')
 
+    async def _load(advisory):
         try:
-            if flaw_bugs:
-                _update_advisory(runtime, advisory, flaw_bugs, flaw_bug_tracker, noop)
-                # Associate builds with CVEs
-                runtime.logger.info('Associating CVEs with builds')
-                await associate_builds_with_cves(errata_api, advisory, flaw_bugs, attached_trackers,
-                                                 tracker_flaws, noop)
-            else:
-                pass  # TODO: convert RHSA back to RHBA
+            return await _get_advisory_trackers(advisory, bug_trackers, runtime.logger)
         except Exception as e:
-            runtime.logger.error(traceback.format_exc())
-            runtime.logger.error(f'Exception: {e}')
+            _log_error(advisory.errata_id, e)
+            return None
+
+    async def _find_flaws(attached_trackers):
+        flaw_bugs = await exectools.to_thread(
+            flaw_bugs_memo.get, sorted({i for t in attached_trackers for i in t.corresponding_flaw_bug_ids}))
+        return await get_flaws(flaw_bug_tracker, attached_trackers, brew_api, runtime.logger,
+                               flaw_bugs=flaw_bugs, security_data_api=security_data_api)
+
+    exit_code = 0
+    try:
+        loaded_advisories = []
+        for advisory_id in advisories:
+            try:
+                runtime.logger.info("Getting advisory %s", advisory_id)
+                loaded_advisories.append(Erratum(errata_id=advisory_id))
+            except Exception as e:
+                _log_error(advisory_id, e)
+                exit_code = 1
+        advisory_trackers = await asyncio.gather(*[_load(advisory) for advisory in loaded_advisories])
+        if any(trackers is None for trackers in advisory_trackers):
             exit_code = 1
+        advisory_trackers = [(a, trackers) for a, trackers in zip(loaded_advisories, advisory_trackers)
+                             if trackers is not None]
 
-    await errata_api.close()
+        # fetch the flaw bugs of all advisories at once; advisories of a release often share flaws.
+        # Should that fail, each advisory looks up its own flaws.
+        try:
+            await exectools.to_thread(flaw_bugs_memo.get,
+                                      sorted({i for _, trackers in advisory_trackers for t in trackers
+                                              for i in t.corresponding_flaw_bug_ids}))
+        except Exception as e:
+            runtime.logger.warning(f'Failed to fetch the flaw bugs of all advisories at once: {e}')
+        found_flaws = await asyncio.gather(*[_find_flaws(trackers) for _, trackers in advisory_trackers],
+                                           return_exceptions=True)
+
+        for (advisory, attached_trackers), found in zip(advisory_trackers, found_flaws):
+            try:
+                if isinstance(found, Exception):
+                    raise found
+                tracker_flaws, flaw_bugs = found
+                if flaw_bugs:
+                    await exectools.to_thread(_update_advisory, runtime, advisory, flaw_bugs, flaw_bug_tracker, noop)
+                    # Associate builds with CVEs
+                    runtime.logger.info('Associating CVEs with builds')
+                    await associate_builds_with_cves(errata_api, advisory, flaw_bugs, attached_trackers,
+                                                     tracker_flaws, noop)
+                else:
+                    pass  # TODO: convert RHSA back to RHBA
+            except Exception as e:
+                _log_error(advisory.errata_id, e)
+                exit_code = 1
+    finally:
+        await security_data_api.close()
+        await errata_api.close()
     sys.exit(exit_code)
 
 
+async def _get_advisory_trackers(advisory: Erratum, bug_trackers: List[BugTracker], logger: Logger) -> List[Bug]:
+    attached_trackers = []
+    # look up JIRA and Bugzilla trackers concurrently
+    for trackers in await asyncio.gather(*[
+        exectools.to_thread(get_attached_trackers, advisory, bug_tracker, logger)
+        for bug_tracker in bug_trackers
+    ]):
+        attached_trackers.extend(trackers)
+    return attached_trackers
+
+
 def get_attached_trackers(advisory: Erratum, bug_tracker: BugTracker, logger: Logger):
     # get attached bugs from advisory
     advisory_bug_ids = bug_tracker.advisory_bug_ids(advisory)
@@ -104,15 +162,19 @@ def get_attached_trackers(advisory: Erratum, bug_tracker: BugTracker, logger: Lo
     return attached_tracker_bugs
 
 
-def get_flaws(flaw_bug_tracker: BugTracker, tracker_bugs: Iterable[Bug], brew_api, logger: Logger) -> (Dict, List):
+async def get_flaws(flaw_bug_tracker: BugTracker, tracker_bugs: Iterable[Bug], brew_api, logger: Logger,
+                    lookup_cache: Optional[LookupCache] = None, flaw_bugs: Optional[List[Bug]] = None,
+                    security_data_api: Optional[AsyncSecurityDataAPI] = None) -> (Dict, List):
     # validate and get target_release
     if not tracker_bugs:
         return {}, []  # Bug.get_target_release will panic on empty array
     current_target_release = Bug.get_target_release(tracker_bugs)
-    tracker_flaws, flaw_tracker_map = BugTracker.get_corresponding_flaw_bugs(
+    tracker_flaws, flaw_tracker_map = await exectools.to_thread(
+        BugTracker.get_corresponding_flaw_bugs,
         tracker_bugs,
         flaw_bug_tracker,
-        brew_api
+        brew_api,
+        flaw_bugs=flaw_bugs
     )
     logger.info(f'Found {len(flaw_tracker_map)} {flaw_bug_tracker.type} corresponding flaw bugs:'
                 f' {sorted(flaw_tracker_map.keys())}')
@@ -127,10 +189,18 @@ def get_flaws(flaw_bug_tracker: BugTracker, tracker_bugs: Iterable[Bug], brew_ap
         first_fix_flaw_bugs = [f['bug'] for f in flaw_tracker_map.values()]
     else:
         logger.info("Detected GA release, applying first-fix filtering..")
-        first_fix_flaw_bugs = [
-            flaw_bug_info['bug'] for flaw_bug_info in flaw_tracker_map.values()
-            if is_first_fix_any(flaw_bug_info['bug'], flaw_bug_info['trackers'], current_target_release)
-        ]
+        # a shared API looks up each CVE once across calls; otherwise use one for this call only
+        api = security_data_api or AsyncSecurityDataAPI(lookup_cache=lookup_cache)
+        try:
+            flaw_bug_infos = list(flaw_tracker_map.values())
+            first_fix = await asyncio.gather(*[
+                is_first_fix_any(api, flaw_bug_info['bug'], flaw_bug_info['trackers'], current_target_release)
+                for flaw_bug_info in flaw_bug_infos
+            ])
+        finally:
+            if not security_data_api:
+                await api.close()
+        first_fix_flaw_bugs = [info['bug'] for info, is_first_fix in zip(flaw_bug_infos, first_fix) if is_first_fix]
 
     logger.info(f'{len(first_fix_flaw_bugs)} out of {len(flaw_tracker_map)} flaw bugs considered "first-fix"')
     return tracker_flaws, first_fix_flaw_bugs
@@ -1,6 +1,9 @@
-from elliottlib.cli.common import cli, use_default_advisory_option, find_default_advisory
-from elliottlib.util import green_prefix
-from errata_tool import Erratum, ErrataException
+from elliottlib.cli.common import (cli, find_default_advisory, print_advisory_summary,
+                                   run_for_advisories, use_default_advisory_option)
+from elliottlib.errata import AdvisoryInfo, erratum_lock
+from elliottlib.exceptions import ElliottFatalError
+from elliottlib.util import green_print, red_print
+from errata_tool import Erratum
 import click
 
 
@@ -63,29 +66,30 @@ unless Bugzilla Bugs or JIRA Issues have been attached.
         advisories = list(runtime.group_config.advisories.values())
 
     click.echo(f"Attempting to move advisories {advisories} to {state}")
-    errors = []
-    for advisory in advisories:
-        try:
-            e = Erratum(errata_id=advisory)
 
-            if e.errata_state == state:
-                green_prefix(f"No Change ({advisory}): ")
-                click.echo(f"Target state is same as current state: {state}")
-            else:
-                if noop:
-                    green_prefix(f"NOOP ({advisory}): ")
-                    click.echo(f"Would have changed state {e.errata_state} ➔ {state}")
-                else:
-                    # Capture current state because `e.commit()` will
-                    # refresh the `e.errata_state` attribute
-                    old_state = e.errata_state
-                    e.setState(state)
-                    e.commit()
-                    green_prefix(f"Changed state ({advisory}): ")
-                    click.echo(f"{old_state} ➔ {state}")
-        except ErrataException as ex:
-            click.echo(f'Error fetching/changing state of {advisory}: {ex}')
-            errors.append(ex)
+    def _change_state(advisory):
+        current_state = AdvisoryInfo.fetch(advisory).errata_state
+        if current_state == state:
+            return f"No Change ({advisory}): Target state is same as current state: {state}"
+        if noop:
+            return f"NOOP ({advisory}): Would have changed state {current_state} ➔ {state}"
+        with erratum_lock:
+            e = Erratum(errata_id=advisory)
+            # Capture current state because `e.commit()` will
+            # refresh the `e.errata_state` attribute
+            old_state = e.errata_state
+            e.setState(state)
+            e.commit()
+        return f"Changed state ({advisory}): {old_state} ➔ {state}"
+
+    results, errors = run_for_advisories(advisories, _change_state)
+    for advisory in advisories:
+        if advisory in results:
+            green_print(results[advisory])
+        else:
+            red_print(f"Error fetching/changing state of {advisory}: {errors[advisory]}")
 
+    if len(advisories) > 1:
+        print_advisory_summary(advisories, errors)
     if errors:
-        raise Exception(errors)
+        raise ElliottFatalError(f"Failed to change state of advisories {list(errors)}")
@@ -11,6 +11,10 @@ CLI_OPTS = {
         'env': 'ELLIOTT_WORKING_DIR',
         'help': 'Persistent working directory to use'
     },
+    'bug_cache_path': {
+        'env': 'ELLIOTT_BUG_CACHE_PATH',
+        'help': 'SQLite file in which to cache bugs between runs (no cache by default)'
+    },
 }
 
 CLI_ENV_VARS = {k: v['env'] for (k, v) in CLI_OPTS.items()}
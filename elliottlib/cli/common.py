@@ -1,12 +1,14 @@
 import asyncio
 import sys
 from functools import update_wrapper
+from multiprocessing.dummy import Pool as ThreadPool
+from typing import Any, Callable, Dict, Iterable, Tuple
 
 import click
 
 from elliottlib import Runtime, constants, dotconfig, version
 from elliottlib.cli import cli_opts
-from elliottlib.util import green_prefix, red_prefix, yellow_print
+from elliottlib.util import green_prefix, green_print, red_prefix, red_print, yellow_print
 
 
 def print_version(ctx, param, value):
@@ -64,6 +66,15 @@ context_settings = dict(help_option_names=['-h', '--help'])
     help='Show debug output on console.')
 @click.option("--brew-event", metavar='EVENT', type=click.INT, default=None,
               help="Lock koji clients from runtime to this brew event.")
+@click.option(
+    '--bug-cache-path',
+    metavar='PATH', default=None,
+    help='SQLite file in which to cache JIRA issues and Bugzilla bugs between runs, so that only bugs changed '
+         'since the last run are fetched. [env: ELLIOTT_BUG_CACHE_PATH]')
+@click.option(
+    '--no-bug-cache',
+    default=False, is_flag=True,
+    help='Do not use the bug cache, even if a bug cache path is configured.')
 @click.pass_context
 def cli(ctx, **kwargs):
     cfg = dotconfig.Config(
@@ -108,5 +119,58 @@ def click_coroutine(f):
     https://github.com/pallets/click/issues/85
     """
     def wrapper(*args, **kwargs):
-        return asyncio.get_event_loop().run_until_complete(f(*args, **kwargs))
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:  # no current event loop, e.g. it was closed by asyncio.run()
+            loop = None
+        if loop is None or loop.is_closed():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+        return loop.run_until_complete(f(*args, **kwargs))
     return update_wrapper(wrapper, f)
+
+
+# advisories handled at the same time by run_for_advisories
+ADVISORY_CONCURRENCY = 5
+
+
+def run_for_advisories(advisories: Iterable[int], func: Callable[[int], Any]) \
+        -> Tuple[Dict[int, Any], Dict[int, Exception]]:
+    """ Call blocking `func(advisory)` for each advisory in a thread, at most ADVISORY_CONCURRENCY at a time.
+    errata_tool keeps its auth and timings at class level, so `func` should read advisories with
+    errata.AdvisoryInfo and hold errata.erratum_lock while it uses Erratum objects.
+    An error for one advisory doesn't stop the others.
+    :return: (results, errors) dicts keyed by advisory, in input order
+    """
+    def _run(advisory):
+        try:
+            return True, func(advisory)
+        except Exception as e:
+            return False, e
+
+    advisories = list(dict.fromkeys(advisories))
+    results, errors = {}, {}
+    if not advisories:
+        return results, errors
+    pool = ThreadPool(min(ADVISORY_CONCURRENCY, len(advisories)))
+    try:
+        outcomes = pool.map(_run, advisories)
+    finally:
+        pool.close()
+        pool.join()
+    for advisory, (ok, outcome) in zip(advisories, outcomes):
+        if ok:
+            results[advisory] = outcome
+        else:
+            errors[advisory] = outcome
+    return results, errors
+
+
+def print_advisory_summary(advisories: Iterable[int], errors: Dict[int, Exception]):
+    """ Print one line per advisory telling whether it succeeded """
+    click.echo("Summary:")
+    for advisory in dict.fromkeys(advisories):
+        if advisory in errors:
+            red_print(f"  {advisory}: failed: {errors[advisory]}")
+        else:
+            green_print(f"  {advisory}: succeeded")
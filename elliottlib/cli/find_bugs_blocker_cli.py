@@ -1,11 +1,12 @@
+import asyncio
 import click
 import sys
 import traceback
 
 from elliottlib.cli.find_bugs_sweep_cli import print_report, FindBugsMode
 from elliottlib.bzutil import BugTracker
-from elliottlib import (Runtime, constants)
-from elliottlib.cli.common import cli
+from elliottlib import (Runtime, constants, exectools)
+from elliottlib.cli.common import cli, click_coroutine
 from elliottlib.util import green_prefix
 
 
@@ -42,7 +43,8 @@ class FindBugsBlocker(FindBugsMode):
               default='text',
               help='Display format for output')
 @click.pass_obj
-def find_bugs_blocker_cli(runtime: Runtime, include_status, exclude_status, output):
+@click_coroutine
+async def find_bugs_blocker_cli(runtime: Runtime, include_status, exclude_status, output):
     """
 List active OCP blocker bugs for the target-releases.
 default bug status to search: ['NEW', 'ASSIGNED', 'POST', 'MODIFIED', 'ON_DEV', 'ON_QA']
@@ -61,25 +63,26 @@ Use --exclude_status to filter out from default status list.
     find_bugs_obj.include_status(include_status)
     find_bugs_obj.exclude_status(exclude_status)
     exit_code = 0
-    for b in [runtime.get_bug_tracker('jira'), runtime.get_bug_tracker('bugzilla')]:
-        try:
-            find_bugs_blocker(runtime, output, find_bugs_obj, b)
-        except Exception as e:
-            runtime.logger.error(traceback.format_exc())
-            runtime.logger.error(f'exception with {b.type} bug tracker: {e}')
+    bug_trackers = [runtime.get_bug_tracker('jira'), runtime.get_bug_tracker('bugzilla')]
+    # search JIRA and Bugzilla concurrently, but print results in a fixed order
+    results = await asyncio.gather(*[
+        exectools.to_thread(find_bugs_obj.search, bug_tracker_obj=b, verbose=runtime.debug) for b in bug_trackers
+    ], return_exceptions=True)
+    for b, result in zip(bug_trackers, results):
+        if isinstance(result, Exception):
+            runtime.logger.error("".join(traceback.format_exception(type(result), result, result.__traceback__)))
+            runtime.logger.error(f'exception with {b.type} bug tracker: {result}')
             exit_code = 1
+            continue
+        print_blocker_bugs(output, find_bugs_obj, b, result)
     sys.exit(exit_code)
 
 
-def find_bugs_blocker(runtime, output, find_bugs_obj, bug_tracker):
+def print_blocker_bugs(output, find_bugs_obj, bug_tracker, bugs):
     if output == 'text':
         statuses = sorted(find_bugs_obj.status)
         tr = bug_tracker.target_release()
         green_prefix(f"Searching {bug_tracker.type} for bugs with status {statuses} and target releases: {tr}\n")
-
-    bugs = find_bugs_obj.search(bug_tracker_obj=bug_tracker, verbose=runtime.debug)
-
-    if output == 'text':
         green_prefix(f"Found {len(bugs)} bugs: ")
         click.echo(", ".join(sorted(str(b.id) for b in bugs)))
 
@@ -1,5 +1,6 @@
 import re
 import sys
+from multiprocessing.dummy import Pool as ThreadPool
 from typing import Any, Dict, List, Optional, Sequence, TextIO, Tuple, cast
 
 import click
@@ -14,15 +15,33 @@ from elliottlib.assembly import AssemblyTypes
 from elliottlib.cli.common import cli, click_coroutine
 from elliottlib.config_model import KernelBugSweepConfig
 from elliottlib.exceptions import ElliottFatalError
-from elliottlib.util import green_print
+from elliottlib.util import chunk, green_print
 from elliottlib.bzutil import JIRABugTracker
 
+# number of keys or labels put into a single JQL search
+JQL_BATCH_SIZE = 100
+
 
 @retry(reraise=True, stop=stop_after_attempt(3))
 def _search_issues(jira_client, *args, **kwargs):
     return jira_client.search_issues(*args, **kwargs)
 
 
+def get_issues_by_keys(jira_client: JIRA, keys: Sequence[str]) -> Dict[str, Issue]:
+    """ Get Jira issues with batched `key in (...)` searches instead of one request per issue.
+    :return: a dict; key is issue key, value is Issue object
+    """
+    issues: Dict[str, Issue] = {}
+    for keys_chunk in chunk(sorted(set(keys)), JQL_BATCH_SIZE):
+        jql_str = f'key in ({",".join(keys_chunk)})'
+        for issue in cast(List[Issue], _search_issues(jira_client, jql_str, maxResults=False)):
+            issues[issue.key] = issue
+    missing = set(keys) - issues.keys()
+    if missing:
+        raise ValueError(f"Couldn't find Jira issue(s) {sorted(missing)}")
+    return issues
+
+
 class FindBugsKernelCli:
     def __init__(self, runtime: Runtime, trackers: Sequence[str],
                  clone: bool, reconcile: bool, comment: bool, dry_run: bool):
@@ -64,18 +83,16 @@ class FindBugsKernelCli:
             logger.info("Found %s tracker(s): %s", len(trackers_keys), trackers_keys)
         else:
             logger.info("Find kernel bugs linked from KMAINT tracker(s): %s", trackers_keys)
-            for key in trackers_keys:
-                logger.info("Getting tracker JIRA %s...", key)
-                tracker = jira_client.issue(key)
-                trackers.append(tracker)
+            tracker_issues = get_issues_by_keys(jira_client, trackers_keys)
+            trackers = [tracker_issues[key] for key in trackers_keys]
 
         # Get kernel bugs linked from KMAINT trackers
         report: Dict[str, Any] = {"kernel_bugs": []}
-        for tracker in trackers:
-            bugs = self._find_bugs(jira_client, tracker, bz_client, config.bugzilla.target_releases)
-            bug_ids = {int(b.id) for b in bugs}
-            logger.info("Found %s bug(s) from %s: %s", len(bugs), tracker, bug_ids)
-            for bug_id, bug in zip(bug_ids, bugs):
+        tracker_bugs = self._find_bugs(jira_client, trackers, bz_client, config.bugzilla.target_releases)
+        for tracker, bugs in zip(trackers, tracker_bugs):
+            logger.info("Found %s bug(s) from %s: %s", len(bugs), tracker, [b.id for b in bugs])
+            for bug in bugs:
+                bug_id = int(bug.id)
                 if bug_id in self._tracker_map and self._tracker_map[bug_id].key != tracker.key:
                     raise ValueError(f"Bug {bug_id} is linked in multiple KMAINT trackers: {tracker.key} {self._tracker_map[bug_id].key}")
                 self._id_bugs[bug_id] = bug
@@ -115,22 +132,44 @@ class FindBugsKernelCli:
         matched_issues = _search_issues(jira_client, jql, maxResults=50)
         return cast(List[Issue], matched_issues)
 
-    def _find_bugs(self, jira_client: JIRA, tracker: Issue, bz_client: Bugzilla, bz_target_releases: Sequence[str]):
+    def _find_bugs(self, jira_client: JIRA, trackers: Sequence[Issue], bz_client: Bugzilla,
+                   bz_target_releases: Sequence[str]) -> List[List[Bug]]:
+        """ Find kernel bugs linked from KMAINT trackers.
+        Remote links of all trackers are fetched concurrently, then all linked bugs are got from Bugzilla at once.
+        :return: a list of bugs matching the target releases for each tracker, in the same order as `trackers`
+        """
         logger = self._logger
-        logger.info("Searching bugs in JIRA %s...", tracker.key)
-        links = jira_client.remote_links(tracker.key)
-        # Search for kernel bugs in tracker content
+        if not trackers:
+            return []
+        logger.info("Searching bugs in JIRA(s) %s...", [t.key for t in trackers])
+        pool = ThreadPool(min(len(trackers), 8))
+        try:
+            tracker_links = pool.map(lambda t: jira_client.remote_links(t.key), trackers)
+        finally:
+            pool.close()
+            pool.join()
+        tracker_bug_ids = []
+        for tracker, links in zip(trackers, tracker_links):
+            bug_ids = self._extract_bug_ids(tracker, links)
+            if not bug_ids:
+                logger.info("No bugs found from %s", tracker.key)
+            tracker_bug_ids.append(bug_ids)
+        all_bug_ids = sorted({bug_id for bug_ids in tracker_bug_ids for bug_id in bug_ids})
+        if not all_bug_ids:
+            return [[] for _ in trackers]
+        filtered_bugs = {int(b.id): b for b in self._get_and_filter_bugs(bz_client, all_bug_ids, bz_target_releases)}
+        return [[filtered_bugs[bug_id] for bug_id in bug_ids if bug_id in filtered_bugs]
+                for bug_ids in tracker_bug_ids]
+
+    @staticmethod
+    def _extract_bug_ids(tracker: Issue, links: Sequence[Any]) -> List[int]:
+        """ Search for kernel bugs in tracker content and remote links """
         pattern = re.compile(r"(?:bugzilla.redhat.com/|bugzilla.redhat.com/show_bug.cgi\?id=|bz)(\d+)")
         content = f"{tracker.fields.summary}\n{tracker.fields.description}"
         for link in links:
             content += f"\n{link.object.title}\n{link.object.url}"
         m = pattern.findall(content)
-        bug_ids = sorted(set(map(int, m)))
-        if not bug_ids:
-            logger.info("No bugs found from %s", tracker.key)
-            return []
-        filtered_bugs = self._get_and_filter_bugs(bz_client, bug_ids, bz_target_releases)
-        return filtered_bugs
+        return sorted(set(map(int, m)))
 
     def _get_and_filter_bugs(self, bz_client: Bugzilla, bug_ids: List[int], bz_target_releases: Sequence[str]):
         """ Get specified bugs from Bugzilla, then return those bugs that match the defined target release.
@@ -158,13 +197,13 @@ class FindBugsKernelCli:
         logger = self._logger
         ocp_target_release = conf.target_release
         result: Dict[int, List[Issue]] = {}  # key is bug_id, value is a list of cloned jiras
+        logger.info("Checking if %s bug(s) were already cloned to OCP %s...", len(bugs), ocp_target_release)
+        existing_clones = self._find_existing_clones(jira_client, [int(bug.id) for bug in bugs], conf)
         for bug in bugs:
             bug_id = int(bug.id)
             kmaint_tracker = self._tracker_map.get(bug_id)
             kmaint_tracker_key = kmaint_tracker.key if kmaint_tracker else None
-            logger.info("Checking if %s was already cloned to OCP %s...", bug_id, ocp_target_release)
-            jql_str = f'project = {conf.project} and component = {conf.component} and labels = art:cloned-kernel-bug and labels = "art:bz#{bug_id}" and "Target Version" = "{ocp_target_release}" order by created DESC'
-            found_issues = cast(List[Issue], _search_issues(jira_client, jql_str=jql_str))
+            found_issues = existing_clones.get(bug_id, [])
             if not found_issues:  # this bug is not already cloned into OCP Jira
                 logger.info("Creating JIRA for bug %s...", bug.weburl)
                 fields = self._new_jira_fields_from_bug(bug, ocp_target_release, kmaint_tracker_key, conf)
@@ -194,6 +233,23 @@ class FindBugsKernelCli:
 
         return result
 
+    @staticmethod
+    def _find_existing_clones(jira_client: JIRA, bug_ids: Sequence[int],
+                              conf: KernelBugSweepConfig.TargetJiraConfig) -> Dict[int, List[Issue]]:
+        """ Find OCP Jiras cloned from the given bugs, with one JQL search per batch of bugs
+        :return: a dict; key is bug_id, value is a list of cloned jiras, newest first
+        """
+        result: Dict[int, List[Issue]] = {}
+        for bug_ids_chunk in chunk(sorted(set(bug_ids)), JQL_BATCH_SIZE):
+            labels = ", ".join(f'"art:bz#{bug_id}"' for bug_id in bug_ids_chunk)
+            jql_str = f'project = {conf.project} and component = {conf.component} and labels = art:cloned-kernel-bug and labels in ({labels}) and "Target Version" = "{conf.target_release}" order by created DESC'
+            for issue in cast(List[Issue], _search_issues(jira_client, jql_str=jql_str, maxResults=False)):
+                for label in issue.fields.labels:
+                    m = re.fullmatch(r"art:bz#(\d+)", label)
+                    if m and int(m[1]) in bug_ids_chunk:
+                        result.setdefault(int(m[1]), []).append(issue)
+        return result
+
     @staticmethod
     def _print_report(report: Dict, out: TextIO):
         print_func = green_print if out.isatty() else print  # use green_print if out is a TTY
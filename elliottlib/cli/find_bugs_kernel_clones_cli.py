@@ -10,6 +10,7 @@ from tenacity import retry, stop_after_attempt, wait_fixed
 from elliottlib import Runtime, brew
 from elliottlib.assembly import AssemblyTypes
 from elliottlib.cli.common import cli, click_coroutine
+from elliottlib.cli.find_bugs_kernel_cli import get_issues_by_keys
 from elliottlib.config_model import KernelBugSweepConfig
 from elliottlib.exceptions import ElliottFatalError
 from elliottlib.util import green_print
@@ -71,8 +72,9 @@ class FindBugsKernelClonesCli:
     def _get_jira_issues(self, jira_client: JIRA, issue_keys: List[str], config: KernelBugSweepConfig):
         found_issues: List[Issue] = []
         labels = {"art:cloned-kernel-bug"}
+        issues = get_issues_by_keys(jira_client, issue_keys)
         for key in issue_keys:
-            issue = jira_client.issue(key)
+            issue = issues[key]
             if not labels.issubset(set(issue.fields.labels)):
                 raise ValueError(f"Jira {key} doesn't have all required labels {labels}")
             if issue.fields.project.key != config.target_jira.project:
@@ -111,9 +113,9 @@ class FindBugsKernelClonesCli:
         logger = self._runtime.logger
         candidate_brew_tag = config.target_jira.candidate_brew_tag
         prod_brew_tag = config.target_jira.prod_brew_tag
-        trackers: Dict[str, Issue] = {}
         tracker_issues: Dict[str, List[Issue]] = {}
         issue_bug_ids: Dict[str, int] = {}
+        issue_tracker_keys: Dict[str, str] = {}
         for issue in issues:
             # extract bug id from labels: ["art:bz#12345"] -> 12345
             bug_id = next(map(lambda m: int(m[1]), filter(bool, map(lambda label: re.fullmatch(r"art:bz#(\d+)", label), issue.fields.labels))), None)
@@ -124,14 +126,17 @@ class FindBugsKernelClonesCli:
             tracker_key = next(map(lambda m: str(m[1]), filter(bool, map(lambda label: re.fullmatch(r"art:kmaint:(\S+)", label), issue.fields.labels))), None)
             if not tracker_key:
                 raise ValueError(f"Jira clone {issue.key} doesn't have the required `art:kmaint:*` label")
-            tracker = trackers.get(tracker_key)
-            if not tracker:
-                tracker = trackers[tracker_key] = jira_client.issue(tracker_key)
-                if tracker.fields.project.key != config.tracker_jira.project:
-                    raise ValueError(f"KMAINT tracker {tracker_key} is not in project {config.tracker_jira.project}")
-                if not set(config.tracker_jira.labels).issubset(set(tracker.fields.labels)):
-                    raise ValueError(f"KMAINT tracker {tracker_key} doesn't have required labels {config.tracker_jira.labels}")
-            tracker_issues.setdefault(tracker.key, []).append(issue)
+            issue_tracker_keys[issue.key] = tracker_key
+
+        # Get all KMAINT trackers at once
+        trackers = get_issues_by_keys(jira_client, list(set(issue_tracker_keys.values())))
+        for tracker_key, tracker in trackers.items():
+            if tracker.fields.project.key != config.tracker_jira.project:
+                raise ValueError(f"KMAINT tracker {tracker_key} is not in project {config.tracker_jira.project}")
+            if not set(config.tracker_jira.labels).issubset(set(tracker.fields.labels)):
+                raise ValueError(f"KMAINT tracker {tracker_key} doesn't have required labels {config.tracker_jira.labels}")
+        for issue in issues:
+            tracker_issues.setdefault(issue_tracker_keys[issue.key], []).append(issue)
 
         for tracker_id, tracker in trackers.items():
             # Determine which NVRs have the fix. e.g. ["kernel-5.14.0-284.14.1.el9_2"]
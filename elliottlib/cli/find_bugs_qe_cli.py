@@ -1,9 +1,11 @@
 import click
 import sys
 import traceback
+from typing import Dict
 
 from elliottlib import (Runtime, logutil)
 from elliottlib.cli.common import cli
+from elliottlib.exceptions import ElliottFatalError
 from elliottlib.cli.find_bugs_sweep_cli import FindBugsMode
 
 
@@ -57,23 +59,30 @@ def find_bugs_qe(runtime, find_bugs_obj, noop, bug_tracker):
     release_comment = (
         "An ART build cycle completed after this fix was made, which usually means it can be"
         f" expected in the next created {major_version}.{minor_version} nightly and release.")
-    for bug in bugs:
-        updated = bug_tracker.update_bug_status(bug, 'ON_QA', comment=release_comment, noop=noop)
-        if updated:
-            if bug.is_tracker_bug():
-                # leave a special comment for QE
-                comment = """Note for QE:
+    results = bug_tracker.update_bugs_status(bugs, 'ON_QA', comment=release_comment, noop=noop)
+    updated_bugs = [bug for bug in bugs if results[bug.id] is True]
+
+    # leave a special comment for QE on CVE trackers
+    comment = """Note for QE:
     This is a CVE bug. Please plan on verifying this bug ASAP.
     A CVE bug shouldn't be dropped from an advisory if QE doesn't have enough time to verify.
     Contact ProdSec if you have questions.
     """
-                bug_tracker.add_comment(bug.id, comment, private=True, noop=noop)
-
-            elif bug_tracker.type == 'jira':
-                # If a security level is specified, the bug won't be visible on advisories
-                # Make this explicit in the bug comment. Not applicable for security trackers/flaw bugs
-                security_level = bug.security_level
-                if security_level:
-                    comment = "This is not a public issue, the customer visible advisory will not link the fix." \
-                              "Setting the Security Level to public before the advisory ships will have it included"
-                    bug_tracker.add_comment(bug.id, comment, private=True, noop=noop)
+    tracker_bug_ids = [bug.id for bug in updated_bugs if bug.is_tracker_bug()]
+    results.update(_failures(bug_tracker.add_comments(tracker_bug_ids, comment, private=True, noop=noop)))
+
+    if bug_tracker.type == 'jira':
+        # If a security level is specified, the bug won't be visible on advisories
+        # Make this explicit in the bug comment. Not applicable for security trackers/flaw bugs
+        comment = "This is not a public issue, the customer visible advisory will not link the fix." \
+                  "Setting the Security Level to public before the advisory ships will have it included"
+        private_bug_ids = [bug.id for bug in updated_bugs if not bug.is_tracker_bug() and bug.security_level]
+        results.update(_failures(bug_tracker.add_comments(private_bug_ids, comment, private=True, noop=noop)))
+
+    failed_bug_ids = [bug_id for bug_id, result in results.items() if isinstance(result, Exception)]
+    if failed_bug_ids:
+        raise ElliottFatalError(f"Failed to update {len(failed_bug_ids)} bugs: {sorted(map(str, failed_bug_ids))}")
+
+
+def _failures(results: Dict) -> Dict:
+    return {bug_id: result for bug_id, result in results.items() if isinstance(result, Exception)}
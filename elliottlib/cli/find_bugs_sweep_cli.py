@@ -1,15 +1,19 @@
+import asyncio
 import json
 import click
 import sys
+import time
 import traceback
 from datetime import datetime
-from typing import List, Dict, Set
+from typing import List, Dict, Optional, Set
 
 from elliottlib.assembly import assembly_issues_config
-from elliottlib.bzutil import BugTracker, Bug, JIRABug
-from elliottlib import (Runtime, bzutil, constants, errata, logutil)
+from elliottlib.bug_cache import BugCache
+from elliottlib.bzutil import BugTracker, Bug, JIRABug, JIRABugTracker
+from elliottlib import (Runtime, bzutil, constants, errata, exectools, logutil)
 from elliottlib.cli import common
 from elliottlib.cli.common import click_coroutine
+from elliottlib.errata_async import AdvisoryBugIndex, AsyncErrataAPI
 from elliottlib.exceptions import ElliottFatalError
 from elliottlib.util import green_prefix, green_print, red_prefix, chunk
 
@@ -30,11 +34,12 @@ class FindBugsMode:
     def exclude_status(self, status: List):
         self.status -= set(status)
 
-    def search(self, bug_tracker_obj: BugTracker, verbose: bool = False):
+    def search(self, bug_tracker_obj: BugTracker, verbose: bool = False, **kwargs):
         func = bug_tracker_obj.cve_tracker_search if self.cve_only else bug_tracker_obj.search
         return func(
             self.status,
-            verbose=verbose
+            verbose=verbose,
+            **kwargs
         )
 
 
@@ -78,6 +83,16 @@ class FindBugsSweep(FindBugsMode):
 @click.option("--cve-only",
               is_flag=True,
               help="Only find CVE trackers")
+@click.option("--state-file", metavar="PATH",
+              help="SQLite file in which to keep the results of this sweep, so that the next sweep with the same "
+                   "file only looks at bugs changed since then. The results are the same as a full sweep.")
+@click.option("--full-refresh",
+              is_flag=True,
+              help="Ignore the results kept in --state-file and sweep all bugs again")
+@click.option("--jira-cutoff-mode", type=click.Choice(JIRABugTracker.CUTOFF_MODES), default="jql",
+              show_default=True,
+              help="How to find the JIRA bugs that changed to the desired status before the cutoff: "
+                   "ask the server with JQL, or fetch their changelogs and check them locally")
 @click.option("--noop", "--dry-run",
               is_flag=True,
               default=False,
@@ -85,7 +100,8 @@ class FindBugsSweep(FindBugsMode):
 @click.pass_obj
 @click_coroutine
 async def find_bugs_sweep_cli(runtime: Runtime, advisory_id, default_advisory_type, include_status, exclude_status,
-                              report, output, into_default_advisories, brew_event, cve_only, noop):
+                              report, output, into_default_advisories, brew_event, cve_only, state_file, full_refresh,
+                              jira_cutoff_mode, noop):
     """Find OCP bugs and (optional) add them to ADVISORY.
 
  The --group automatically determines the correct target-releases to search
@@ -114,10 +130,17 @@ advisory with the --add option.
 \b
     $ elliott -g openshift-4.8 --assembly 4.8.32 find-bugs:sweep --use-default-advisory rpm
 
+    Sweep again shortly after, only looking at bugs changed since the last sweep
+
+\b
+    $ elliott -g openshift-4.8 --assembly 4.8.32 find-bugs:sweep --state-file ~/.cache/elliott/sweep-4.8.32.db
+
 """
     count_advisory_attach_flags = sum(map(bool, [advisory_id, default_advisory_type, into_default_advisories]))
     if count_advisory_attach_flags > 1:
         raise click.BadParameter("Use only one of --use-default-advisory, --add, or --into-default-advisories")
+    if full_refresh and not state_file:
+        raise click.BadParameter("--full-refresh must be used with --state-file")
 
     runtime.initialize(mode="both")
     major_version, _ = runtime.get_major_minor()
@@ -125,16 +148,36 @@ advisory with the --add option.
     find_bugs_obj.include_status(include_status)
     find_bugs_obj.exclude_status(exclude_status)
 
+    # index bugs attached to the group's open advisories, so that checking whether bugs are attached
+    # doesn't need a request to Errata per bug
+    advisory_bug_index = await get_advisory_bug_index(runtime, advisory_id)
+
+    # JIRA and Bugzilla are independent, run them concurrently
+    bug_trackers = [runtime.get_bug_tracker('jira'), runtime.get_bug_tracker('bugzilla')]
+    bug_trackers[0].cutoff_mode = jira_cutoff_mode
+    sweep_state = BugCache(state_file) if state_file else None
+    attach_lock = asyncio.Lock()
+    try:
+        results = await asyncio.gather(*[
+            find_and_attach_bugs(runtime, advisory_id, default_advisory_type, major_version, find_bugs_obj,
+                                 output, brew_event, noop, count_advisory_attach_flags, b,
+                                 advisory_bug_index=advisory_bug_index,
+                                 sweep_state=sweep_state, full_refresh=full_refresh, attach_lock=attach_lock)
+            for b in bug_trackers
+        ], return_exceptions=True)
+    finally:
+        if sweep_state:
+            sweep_state.close()
+
     bugs: type_bug_list = []
     errors = []
-    for b in [runtime.get_bug_tracker('jira'), runtime.get_bug_tracker('bugzilla')]:
-        try:
-            bugs.extend(await find_and_attach_bugs(runtime, advisory_id, default_advisory_type, major_version, find_bugs_obj,
-                        output, brew_event, noop, count_advisory_attach_flags, b))
-        except Exception as e:
-            errors.append(e)
-            logger.error(traceback.format_exc())
-            logger.error(f'exception with {b.type} bug tracker: {e}')
+    for b, result in zip(bug_trackers, results):
+        if isinstance(result, Exception):
+            errors.append(result)
+            logger.error("".join(traceback.format_exception(type(result), result, result.__traceback__)))
+            logger.error(f'exception with {b.type} bug tracker: {result}')
+        else:
+            bugs.extend(result)
 
     if errors:
         raise ElliottFatalError(f"Error finding or attaching bugs: {errors}. See logs for more information.")
@@ -153,25 +196,53 @@ advisory with the --add option.
     sys.exit(0)
 
 
-async def get_bugs_sweep(runtime: Runtime, find_bugs_obj, brew_event, bug_tracker):
-    bugs = find_bugs_obj.search(bug_tracker_obj=bug_tracker, verbose=runtime.debug)
+async def get_advisory_bug_index(runtime: Runtime, advisory_id: Optional[int] = None) -> Optional[AdvisoryBugIndex]:
+    """ Build an index of bugs attached to the group's open advisories (and the given advisory, if any).
+    The open advisories are those of the group's Errata release, which makes the index complete.
+    Without a release in the errata config, only the group's default advisories are indexed.
+    :return: AdvisoryBugIndex, or None if there are no advisories to index
+    """
+    advisory_ids = set(runtime.get_default_advisories().values())
+    if advisory_id:
+        advisory_ids.add(advisory_id)
+    release_name = runtime.get_errata_config().get("release")
+    if not release_name and not advisory_ids:
+        return None
+    api = AsyncErrataAPI()
+    try:
+        if release_name:
+            return await AdvisoryBugIndex.build_for_release(api, release_name, advisory_ids)
+        return await AdvisoryBugIndex.build(api, advisory_ids)
+    finally:
+        await api.close()
+
+
+async def get_bugs_sweep(runtime: Runtime, find_bugs_obj, brew_event, bug_tracker,
+                         advisory_bug_index: Optional[AdvisoryBugIndex] = None,
+                         sweep_state: Optional[BugCache] = None, full_refresh: bool = False):
+    """ Find bugs to sweep.
+    :param sweep_state: if given, keep the search results and the cutoff check result of each bug there,
+    so that the next sweep only looks at bugs changed since this one
+    :param full_refresh: ignore the results kept in sweep_state
+    """
+    search_kwargs = {"bug_cache": sweep_state, "full_refresh": full_refresh} if sweep_state else {}
+    bugs = await exectools.to_thread(find_bugs_obj.search, bug_tracker_obj=bug_tracker, verbose=runtime.debug,
+                                     **search_kwargs)
 
     sweep_cutoff_timestamp = await get_sweep_cutoff_timestamp(runtime, cli_brew_event=brew_event)
     if sweep_cutoff_timestamp:
         utc_ts = datetime.utcfromtimestamp(sweep_cutoff_timestamp)
         logger.info(f"Filtering bugs that have changed ({len(bugs)}) to one of the desired statuses before the "
                     f"cutoff time {utc_ts}...")
-        qualified_bugs = []
-        for chunk_of_bugs in chunk(bugs, constants.BUG_LOOKUP_CHUNK_SIZE):
-            b = bug_tracker.filter_bugs_by_cutoff_event(chunk_of_bugs, find_bugs_obj.status,
-                                                        sweep_cutoff_timestamp, verbose=runtime.debug)
-            qualified_bugs.extend(b)
+        qualified_bugs = await filter_bugs_by_cutoff_event(runtime, bug_tracker, bugs, find_bugs_obj.status,
+                                                           sweep_cutoff_timestamp, sweep_state=sweep_state,
+                                                           full_refresh=full_refresh)
         logger.info(f"{len(qualified_bugs)} of {len(bugs)} bugs are qualified for the cutoff time {utc_ts}...")
         bugs = qualified_bugs
 
     # filter bugs that have been swept into other advisories
     logger.info("Filtering bugs that haven't been attached to any advisories...")
-    attached_bugs = await bug_tracker.filter_attached_bugs(bugs)
+    attached_bugs = await bug_tracker.filter_attached_bugs(bugs, advisory_bug_index=advisory_bug_index)
     if attached_bugs:
         attached_bug_ids = {b.id for b in attached_bugs}
         logger.warning("The following bugs have been attached to advisories: %s", attached_bug_ids)
@@ -184,28 +255,76 @@ async def get_bugs_sweep(runtime: Runtime, find_bugs_obj, brew_event, bug_tracke
     if included_bug_ids:
         logger.warning(f"The following {bug_tracker.type} bugs will be additionally included because they are "
                        f"explicitly defined in the assembly config: {included_bug_ids}")
-        included_bugs = bug_tracker.get_bugs(included_bug_ids)
+        included_bugs = await exectools.to_thread(bug_tracker.get_bugs, included_bug_ids)
         bugs.extend(included_bugs)
     if excluded_bug_ids:
         logger.warning(f"The following {bug_tracker.type} bugs will be excluded because they are explicitly "
                        f"defined in the assembly config: {excluded_bug_ids}")
         bugs = [bug for bug in bugs if bug.id not in excluded_bug_ids]
 
-    return bugs
+    # the order of search results varies; keep the output the same from run to run
+    return sorted(bugs, key=_bug_sort_key)
+
+
+def _bug_sort_key(bug: Bug):
+    # OCPBUGS-9 before OCPBUGS-10; Bugzilla ids are plain numbers
+    prefix, _, number = str(bug.id).rpartition('-')
+    return prefix, int(number) if number.isdigit() else 0, str(bug.id)
+
+
+async def filter_bugs_by_cutoff_event(runtime: Runtime, bug_tracker: BugTracker, bugs: type_bug_list,
+                                      statuses: Set[str], sweep_cutoff_timestamp: float,
+                                      sweep_state: Optional[BugCache] = None,
+                                      full_refresh: bool = False) -> type_bug_list:
+    """ Find bugs that have changed to one of the statuses before the cutoff time.
+    With a sweep state, the result for each bug is kept there, and reused for bugs that haven't changed since.
+    :return: the qualified bugs, in the given order
+    """
+    namespace = f"sweep-cutoff:{bug_tracker.type}:{sweep_cutoff_timestamp}:{','.join(sorted(statuses))}"
+    checked_at = time.time()
+    qualified: Dict[str, bool] = {}
+    if sweep_state and not full_refresh:
+        stored = sweep_state.get_bugs(namespace, [b.id for b in bugs])
+        if stored:
+            since = min(synced_at for synced_at, _ in stored.values()) - sweep_state.SYNC_MARGIN
+            changed = await exectools.to_thread(bug_tracker.get_changed_bug_ids, list(stored), since)
+            qualified = {bug_id: raw["qualified"] for bug_id, (_, raw) in stored.items() if bug_id not in changed}
+            logger.info(f"Reusing the cutoff check of {len(qualified)} unchanged {bug_tracker.type} bugs")
+
+    # the tracker splits the bugs in chunks, and checks a bounded number of chunks at a time
+    to_check = [b for b in bugs if str(b.id) not in qualified]
+    if to_check:
+        found = await exectools.to_thread(bug_tracker.filter_bugs_by_cutoff_event, to_check, statuses,
+                                          sweep_cutoff_timestamp, verbose=runtime.debug)
+        found_ids = {str(b.id) for b in found}
+        qualified.update({str(b.id): str(b.id) in found_ids for b in to_check})
+
+    if sweep_state:
+        sweep_state.put_bugs(namespace, {str(b.id): {"qualified": qualified[str(b.id)]} for b in bugs}, checked_at)
+    return [b for b in bugs if qualified[str(b.id)]]
 
 
 async def find_and_attach_bugs(runtime: Runtime, advisory_id, default_advisory_type, major_version,
-                               find_bugs_obj, output, brew_event, noop, count_advisory_attach_flags, bug_tracker):
+                               find_bugs_obj, output, brew_event, noop, count_advisory_attach_flags, bug_tracker,
+                               advisory_bug_index: Optional[AdvisoryBugIndex] = None,
+                               sweep_state: Optional[BugCache] = None, full_refresh: bool = False,
+                               attach_lock: Optional[asyncio.Lock] = None):
+    """ Find the bugs of one tracker and attach them to the advisories
+    :param attach_lock: held while attaching bugs; attach_bugs loads advisories with errata_tool, which isn't
+        thread-safe, so runs for different trackers must share it
+    """
+    attach_lock = attach_lock or asyncio.Lock()
     if output == 'text':
         statuses = sorted(find_bugs_obj.status)
         tr = bug_tracker.target_release()
         green_prefix(f"Searching {bug_tracker.type} for bugs with status {statuses} and target releases: {tr}\n")
 
-    bugs = await get_bugs_sweep(runtime, find_bugs_obj, brew_event, bug_tracker)
+    bugs = await get_bugs_sweep(runtime, find_bugs_obj, brew_event, bug_tracker, advisory_bug_index=advisory_bug_index,
+                                sweep_state=sweep_state, full_refresh=full_refresh)
 
     advisory_ids = runtime.get_default_advisories()
-    bugs_by_type = categorize_bugs_by_type(bugs, advisory_ids,
-                                           major_version=major_version)
+    bugs_by_type = await exectools.to_thread(categorize_bugs_by_type, bugs, advisory_ids,
+                                             major_version=major_version)
     for kind, kind_bugs in bugs_by_type.items():
         logger.info(f'{kind} bugs: {[b.id for b in kind_bugs]}')
 
@@ -214,19 +333,23 @@ async def find_and_attach_bugs(runtime: Runtime, advisory_id, default_advisory_t
     # `--add ADVISORY_NUMBER` should respect the user's wish
     # and attach all available bugs to whatever advisory is specified.
     if advisory_id and not default_advisory_type:
-        bug_tracker.attach_bugs([b.id for b in bugs], advisory_id=advisory_id, noop=noop, verbose=runtime.debug)
+        async with attach_lock:
+            await exectools.to_thread(bug_tracker.attach_bugs, [b.id for b in bugs], advisory_id=advisory_id,
+                                      noop=noop, verbose=runtime.debug)
         return bugs
 
     if not advisory_ids:
         logger.info("No advisories to attach to")
         return bugs
 
+    # one advisory at a time, see attach_lock
     advisory_types_to_attach = [default_advisory_type] if default_advisory_type else bugs_by_type.keys()
-    for advisory_type in sorted(advisory_types_to_attach):
-        kind_bugs = bugs_by_type.get(advisory_type)
-        if kind_bugs:
-            bug_tracker.attach_bugs([b.id for b in kind_bugs], advisory_id=advisory_ids[advisory_type], noop=noop,
-                                    verbose=runtime.debug)
+    async with attach_lock:
+        for advisory_type in sorted(advisory_types_to_attach):
+            if not bugs_by_type.get(advisory_type):
+                continue
+            await exectools.to_thread(bug_tracker.attach_bugs, [b.id for b in bugs_by_type[advisory_type]],
+                                      advisory_id=advisory_ids[advisory_type], noop=noop, verbose=runtime.debug)
     return bugs
 
 
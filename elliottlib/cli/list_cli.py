@@ -33,9 +33,11 @@ yourself online: https://errata.devel.redhat.com/filter/1965
     $ elliott list -n 10 -f 1337
 """
     try:
-        for erratum in elliottlib.errata.get_filtered_list(filter_id, limit=n):
+        for erratum in elliottlib.errata.iter_filtered_list(filter_id, limit=n):
+            # the listing has no publish date override; one GET of the advisory has it, unlike a full Advisory
+            advisory = elliottlib.errata.AdvisoryInfo.fetch(erratum.errata_id)
             click.echo("{release_date:11s} {state:15s} {synopsis:80s} {url}".format(
-                       release_date=erratum.publish_date_override,
+                       release_date=advisory.publish_date_override or "",
                        state=erratum.errata_state,
                        synopsis=erratum.synopsis,
                        url=erratum.url()))
@@ -2,7 +2,8 @@ import sys
 import click
 
 from elliottlib import errata, logutil
-from elliottlib.cli.common import cli
+from elliottlib.cli.common import cli, print_advisory_summary, run_for_advisories
+from elliottlib.exceptions import ElliottFatalError
 from elliottlib.util import ensure_erratatool_auth
 
 LOGGER = logutil.getLogger(__name__)
@@ -39,6 +40,9 @@ def move_builds_cli(runtime, from_advisory, to_advisory, kind, only, noop):
     $ elliott move-builds --from 123 --to 456 -k image --only nvr1,nvr2
     """
 
+    if from_advisory == to_advisory:
+        raise click.BadParameter("--from and --to must be different advisories")
+
     runtime.initialize(no_group=True)
     ensure_erratatool_auth()
 
@@ -66,16 +70,30 @@ def move_builds_cli(runtime, from_advisory, to_advisory, kind, only, noop):
         LOGGER.info(f"[DRY-RUN] Would've moved {len(build_nvrs)} builds from {from_advisory} to {to_advisory}")
         sys.exit(0)
 
-    # remove builds
-    from_erratum = errata.Advisory(errata_id=from_advisory)
-    from_erratum.ensure_state('NEW_FILES')
+    # Both advisories need to be in NEW_FILES
+    def _to_new_files(advisory_id):
+        old_state = errata.AdvisoryInfo.fetch(advisory_id).errata_state
+        with errata.erratum_lock:
+            erratum = errata.Advisory(errata_id=advisory_id)
+            erratum.ensure_state('NEW_FILES')
+        return erratum, old_state
+
+    results, errors = run_for_advisories([from_advisory, to_advisory], _to_new_files)
+    if errors:
+        if to_advisory in results:
+            # leave the target advisory as it was
+            to_erratum, old_state = results[to_advisory]
+            to_erratum.ensure_state(old_state)
+        print_advisory_summary([from_advisory, to_advisory], errors)
+        raise ElliottFatalError("Failed to move advisories to NEW_FILES. No builds have been moved.")
+
+    # builds can only be attached once they are removed from the source advisory
+    from_erratum, _ = results[from_advisory]
     from_erratum.remove_builds(build_nvrs)
     # we do not attempt to move advisory to old state since without builds ET doesn't allow advisory to move to QE
 
     # add builds
-    to_erratum = errata.Advisory(errata_id=to_advisory)
-    old_state = to_erratum.errata_state
-    to_erratum.ensure_state('NEW_FILES')
+    to_erratum, old_state = results[to_advisory]
     to_erratum.attach_builds(attached_builds, kind)
     if old_state != 'NEW_FILES':
         to_erratum.ensure_state(old_state)
@@ -46,7 +46,7 @@ first comment.
     release = "{}.{}".format(major, minor)
 
     try:
-        for erratum in elliottlib.errata.get_filtered_list(filter_id, limit=50):
+        for erratum in elliottlib.errata.iter_filtered_list(filter_id, limit=50):
             metadata_comments_json = elliottlib.errata.get_metadata_comments_json(erratum.errata_id)
             if not metadata_comments_json:
                 # Does not contain ART metadata, skip it
@@ -2,18 +2,19 @@ import click
 from errata_tool import ErrataException
 
 from elliottlib import logutil, errata
-from elliottlib.cli.common import cli, use_default_advisory_option, find_default_advisory
+from elliottlib.cli.common import (cli, find_default_advisory, print_advisory_summary,
+                                   run_for_advisories, use_default_advisory_option)
 from elliottlib.exceptions import ElliottFatalError
-from elliottlib.util import green_prefix
+from elliottlib.util import green_print
 from elliottlib.bzutil import get_jira_bz_bug_ids, JIRABugTracker, BugzillaBugTracker
 
 LOGGER = logutil.getLogger(__name__)
 
 
 @cli.command("remove-bugs", short_help="Remove provided BUGS from ADVISORY")
-@click.option('--advisory', '-a', 'advisory_id',
-              type=int, metavar='ADVISORY',
-              help='Remove found bugs from ADVISORY')
+@click.option('--advisory', '-a', 'advisory_ids',
+              type=int, metavar='ADVISORY', multiple=True,
+              help='Remove found bugs from ADVISORY. Can be given multiple times')
 @use_default_advisory_option
 @click.argument('bug_ids', metavar='<BUGID>', nargs=-1, required=False, default=None)
 @click.option("--all", "remove_all",
@@ -25,7 +26,7 @@ LOGGER = logutil.getLogger(__name__)
               default=False,
               help="Don't change anything")
 @click.pass_obj
-def remove_bugs_cli(runtime, advisory_id, default_advisory_type, bug_ids, remove_all, noop):
+def remove_bugs_cli(runtime, advisory_ids, default_advisory_type, bug_ids, remove_all, noop):
     """Remove given BUGS (JIRA or Bugzilla) from ADVISORY.
 
     Remove bugs that have been attached an advisory:
@@ -33,6 +34,11 @@ def remove_bugs_cli(runtime, advisory_id, default_advisory_type, bug_ids, remove
 \b
     $ elliott --group openshift-4.10 remove-bugs OCPBUGS-4 123456 --advisory 1234123
 
+    Remove all bugs from two advisories
+
+\b
+    $ elliott --group openshift-4.10 remove-bugs --all -a 1234123 -a 1234124
+
     Remove two bugs from default image advisory
 
 \b
@@ -46,37 +52,55 @@ def remove_bugs_cli(runtime, advisory_id, default_advisory_type, bug_ids, remove
 """
     if bool(remove_all) == bool(bug_ids):
         raise click.BadParameter("Specify either <BUGID> or --all param")
-    if bool(advisory_id) == bool(default_advisory_type):
+    if bool(advisory_ids) == bool(default_advisory_type):
         raise click.BadParameter("Specify exactly one of --use-default-advisory or advisory arg")
 
     runtime.initialize()
     if default_advisory_type is not None:
-        advisory_id = find_default_advisory(runtime, default_advisory_type)
-
-    advisory = errata.Advisory(errata_id=advisory_id)
-    if not advisory:
-        raise ElliottFatalError(f"Error: Could not locate advisory {advisory_id}")
-    attached_jira_ids = JIRABugTracker.advisory_bug_ids(advisory)
-    attached_bz_ids = BugzillaBugTracker.advisory_bug_ids(advisory)
-
-    if remove_all:
-        jira_ids, bz_ids = attached_jira_ids, attached_bz_ids
-    else:
-        jira_ids, bz_ids = get_jira_bz_bug_ids(bug_ids)
-        jira_ids = set(jira_ids) & set(attached_jira_ids)
-        bz_ids = set(bz_ids) & set(attached_bz_ids)
-
-    if jira_ids:
-        remove_bugs(advisory, jira_ids, runtime.get_bug_tracker('jira'), noop)
-    if bz_ids:
-        remove_bugs(advisory, bz_ids, runtime.get_bug_tracker('bugzilla'), noop)
+        advisory_ids = [find_default_advisory(runtime, default_advisory_type)]
+
+    if not remove_all:
+        jira_bug_ids, bz_bug_ids = get_jira_bz_bug_ids(bug_ids)
+    jira_tracker = runtime.get_bug_tracker('jira')
+    bz_tracker = runtime.get_bug_tracker('bugzilla')
+
+    def _remove_from_advisory(advisory_id):
+        # attached bugs are read without errata_tool, so advisories can be looked up concurrently
+        info = errata.AdvisoryInfo.fetch(advisory_id)
+        attached_jira_ids = JIRABugTracker.advisory_bug_ids(info)
+        attached_bz_ids = BugzillaBugTracker.advisory_bug_ids(info)
+
+        if remove_all:
+            jira_ids, bz_ids = attached_jira_ids, attached_bz_ids
+        else:
+            jira_ids = set(jira_bug_ids) & set(attached_jira_ids)
+            bz_ids = set(bz_bug_ids) & set(attached_bz_ids)
+        if not jira_ids and not bz_ids:
+            return
+
+        with errata.erratum_lock:
+            advisory = errata.Advisory(errata_id=advisory_id)
+            if not advisory:
+                raise ElliottFatalError(f"Error: Could not locate advisory {advisory_id}")
+            if jira_ids:
+                remove_bugs(advisory, jira_ids, jira_tracker, noop)
+            if bz_ids:
+                remove_bugs(advisory, bz_ids, bz_tracker, noop)
+
+    if len(advisory_ids) == 1:
+        _remove_from_advisory(advisory_ids[0])
+        return
+
+    _, errors = run_for_advisories(advisory_ids, _remove_from_advisory)
+    print_advisory_summary(advisory_ids, errors)
+    if errors:
+        raise ElliottFatalError(f"Failed to remove bugs from advisories {list(errors)}")
 
 
 def remove_bugs(advisory, bug_ids, bug_tracker, noop):
-    green_prefix(f"Found {len(bug_ids)} {bug_tracker.type} bugs attached to advisory: ")
-    click.echo(f"{bug_ids}")
+    green_print(f"Found {len(bug_ids)} {bug_tracker.type} bugs attached to advisory {advisory.errata_id}: {bug_ids}")
 
-    green_prefix(f"Removing {bug_tracker.type} bugs from advisory {advisory.errata_id}..")
+    green_print(f"Removing {bug_tracker.type} bugs from advisory {advisory.errata_id}..")
     try:
         bug_tracker.remove_bugs(advisory, bug_ids, noop)
     except ErrataException as ex:
@@ -5,6 +5,7 @@ from multiprocessing import cpu_count
 from multiprocessing.dummy import Pool as ThreadPool
 from elliottlib import errata
 from elliottlib.bzutil import BugTracker, JIRABugTracker, BugzillaBugTracker, get_jira_bz_bug_ids
+from elliottlib.exceptions import ElliottFatalError
 from elliottlib.util import green_print, progress_func, pbar_header
 from elliottlib.cli.common import cli, use_default_advisory_option, find_default_advisory
 
@@ -121,8 +122,6 @@ providing an advisory with the -a/--advisory option.
 
 
 def repair_bugs(bug_ids, original_state, new_state, comment, close_placeholder, noop, bug_tracker: BugTracker):
-    changed_bug_count = 0
-
     # Fetch bugs in parallel because it can be really slow doing it
     # one-by-one when you have hundreds of bugs
     pbar_header("Fetching data for {} bugs: ".format(len(bug_ids)),
@@ -139,17 +138,28 @@ def repair_bugs(bug_ids, original_state, new_state, comment, close_placeholder,
     pool.join()
     click.echo(']')
 
+    placeholder_bugs = []
+    bugs_to_repair = []
     for bug in attached_bugs:
         if close_placeholder and "Placeholder" in bug.summary:
             # if set close placeholder, ignore bug state
-            bug_tracker.update_bug_status(bug, "CLOSED")
-            changed_bug_count += 1
-        else:
-            if bug.status in original_state:
-                bug_tracker.update_bug_status(bug, new_state)
-                # only add comments for non-placeholder bug
-                if comment and not noop:
-                    bug_tracker.add_comment(bug, comment, private=False)
-                changed_bug_count += 1
-
+            placeholder_bugs.append(bug)
+        elif bug.status in original_state:
+            bugs_to_repair.append(bug)
+
+    # update bugs in bulk rather than one by one
+    results = bug_tracker.update_bugs_status(placeholder_bugs, "CLOSED", noop=noop)
+    repaired = bug_tracker.update_bugs_status(bugs_to_repair, new_state, noop=noop)
+    results.update(repaired)
+    # only add comments for non-placeholder bug
+    if comment:
+        repaired_ids = [bug_id for bug_id, result in repaired.items() if not isinstance(result, Exception)]
+        results.update({bug_id: result for bug_id, result in
+                        bug_tracker.add_comments(repaired_ids, comment, private=False, noop=noop).items()
+                        if isinstance(result, Exception)})
+
+    failed_bug_ids = [bug_id for bug_id, result in results.items() if isinstance(result, Exception)]
+    changed_bug_count = len(results) - len(failed_bug_ids)
     green_print("{} bugs successfully modified (or would have been)".format(changed_bug_count))
+    if failed_bug_ids:
+        raise ElliottFatalError(f"Failed to modify {len(failed_bug_ids)} bugs: {sorted(map(str, failed_bug_ids))}")
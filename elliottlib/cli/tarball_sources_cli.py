@@ -3,15 +3,18 @@ import os
 import errno
 import shutil
 import koji
-import errata_tool
 import tempfile
 import pipes
 import click
+from multiprocessing.dummy import Pool as ThreadPool
 from typing import List, Set, Dict, Tuple, Text, Optional
 from elliottlib import constants, tarball_sources, util, logutil, brew
 
 LOGGER = logutil.getLogger(__name__)
 
+# advisories whose builds are looked up at a time
+ADVISORY_LOOKUP_CONCURRENCY = 8
+
 
 @click.group("tarball-sources", short_help="Create or publish tarball sources")
 @click.pass_context
@@ -66,13 +69,16 @@ Use --force to add new tarball sources to an existing directory.".format(os.path
     nvr_dirs = {}  # type: Dict[str, Set[str]]
 
     # Getting build NVRs for specified Koji/Brew components from advisories
-    # NOTE This is SLOW. However doing this in parallel doesn't work
-    # due to a race condition existing in the implementation of `errata_tool.Erratum`'s parant class ErrataConnector.
-    for advisory in advisories:
-        click.echo(
-            "Finding builds from advisory {}...".format(advisory))
-        builds = tarball_sources.find_builds_from_advisory(
-            advisory, components)
+    click.echo("Finding builds from advisories {}...".format(", ".join(map(str, advisories))))
+    pool = ThreadPool(min(ADVISORY_LOOKUP_CONCURRENCY, len(advisories)))
+    try:
+        advisory_builds = pool.map(lambda advisory: tarball_sources.find_builds_from_advisory(advisory, components),
+                                   advisories)
+    finally:
+        pool.close()
+        pool.join()
+
+    for advisory, builds in zip(advisories, advisory_builds):
         if not builds:
             util.yellow_print(
                 "No matched builds found from advisory {}. Wrong advisory number?".format(advisory))
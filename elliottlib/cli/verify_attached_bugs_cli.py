@@ -1,15 +1,16 @@
 import asyncio
 import re
-from typing import Any, Dict, Iterable, List, Set, Tuple
+from multiprocessing.dummy import Pool as ThreadPool
+from typing import Any, Awaitable, Dict, Iterable, List, Set, Tuple
 import click
-from errata_tool import Erratum
 
-from elliottlib import bzutil, constants, logutil
+from elliottlib import bzutil, constants, exectools, logutil
 from elliottlib.cli.common import cli, click_coroutine, pass_runtime
+from elliottlib.errata import AdvisoryInfo
 from elliottlib.errata_async import AsyncErrataAPI, AsyncErrataUtils
 from elliottlib.runtime import Runtime
 from elliottlib.util import (minor_version_tuple, red_print)
-from elliottlib.bzutil import Bug
+from elliottlib.bzutil import Bug, BugMemo, JIRABug
 from elliottlib.cli.attach_cve_flaws_cli import get_flaws
 from elliottlib.cli.find_bugs_sweep_cli import FindBugsSweep, categorize_bugs_by_type
 
@@ -72,25 +73,25 @@ async def verify_attached_bugs_cli(runtime: Runtime, verify_bug_status: bool, ad
 async def verify_attached_bugs(runtime: Runtime, verify_bug_status: bool, advisory_id_map: Dict[str, int], verify_flaws:
                                bool, no_verify_blocking_bugs: bool, skip_multiple_advisories_check: bool):
     validator = BugValidator(runtime, output="text")
-    advisory_bug_map = validator.get_attached_bugs(list(advisory_id_map.values()))
+    advisory_bug_map = await validator.get_attached_bugs(list(advisory_id_map.values()))
     bugs = {b for bugs in advisory_bug_map.values() for b in bugs}
 
     # bug.is_ocp_bug() filters by product/project, so we don't get flaw bugs or bugs of other products or
     # placeholder
     non_flaw_bugs = [b for b in bugs if b.is_ocp_bug()]
 
-    validator.validate(non_flaw_bugs, verify_bug_status, no_verify_blocking_bugs)
-
     # skip advisory type check if advisories are
     # manually passed in, and we don't know their type
     if '?' not in advisory_id_map.keys():
         validator.verify_bugs_advisory_type(non_flaw_bugs, advisory_id_map, advisory_bug_map)
 
+    # the remaining checks are independent of each other; run them concurrently
+    checks = [exectools.to_thread(validator.validate, non_flaw_bugs, verify_bug_status, no_verify_blocking_bugs)]
     if not skip_multiple_advisories_check:
-        await validator.verify_bugs_multiple_advisories(non_flaw_bugs)
-
+        checks.append(validator.verify_bugs_multiple_advisories(non_flaw_bugs))
     if verify_flaws:
-        await validator.verify_attached_flaws(advisory_bug_map)
+        checks.append(validator.verify_attached_flaws(advisory_bug_map))
+    await validator.run_checks(checks)
 
     # Close client session
     await validator.close()
@@ -139,8 +140,12 @@ async def verify_bugs(runtime, verify_bug_status, output, no_verify_blocking_bug
     find_bugs_obj = FindBugsSweep(cve_only=False)
     ocp_bugs = []
     logger.info(f'Using {runtime.assembly} assembly to search bugs')
-    for b in [runtime.get_bug_tracker('jira'), runtime.get_bug_tracker('bugzilla')]:
-        bugs = find_bugs_obj.search(bug_tracker_obj=b, verbose=runtime.debug)
+    bug_trackers = [runtime.get_bug_tracker('jira'), runtime.get_bug_tracker('bugzilla')]
+    # search JIRA and Bugzilla concurrently
+    results = await asyncio.gather(*[
+        exectools.to_thread(find_bugs_obj.search, bug_tracker_obj=b, verbose=runtime.debug) for b in bug_trackers
+    ])
+    for b, bugs in zip(bug_trackers, results):
         logger.info(f"Found {len(bugs)} {b.type} bugs: {[b.id for b in bugs]}")
         ocp_bugs.extend(bugs)
 
@@ -163,7 +168,13 @@ class BugValidator:
         self.et_data: Dict[str, Any] = runtime.get_errata_config()
         self.errata_api = AsyncErrataAPI(self.et_data.get("server", constants.errata_url))
         self.problems: List[str] = []
+        # set while checks run concurrently; their problems are printed once all are done
+        self._defer_problems = False
         self.output = output
+        # bugs fetched while validating; the same blockers and flaws come up for many bugs and advisories,
+        # so each is only fetched once
+        self._bugs = BugMemo(self._fetch_bugs)
+        self._flaw_bugs = BugMemo(lambda ids: runtime.get_bug_tracker('bugzilla').get_flaw_bugs(ids))
 
     async def close(self):
         await self.errata_api.close()
@@ -195,9 +206,13 @@ class BugValidator:
 
     async def verify_bugs_multiple_advisories(self, non_flaw_bugs: List[Bug]):
         logger.info(f'Checking {len(non_flaw_bugs)} bugs, if any bug is attached to multiple advisories')
+        jira_tracker = self.runtime.get_bug_tracker('jira')
+        bz_tracker = self.runtime.get_bug_tracker('bugzilla')
 
         async def get_all_advisory_ids(bug):
-            all_advisories_id = bug.all_advisory_ids()
+            bug_tracker = jira_tracker if JIRABug.looks_like_a_jira_bug(bug.id) else bz_tracker
+            advisories = await bug_tracker.get_attached_advisories(self.errata_api, bug.id)
+            all_advisories_id = [advisory['id'] for advisory in advisories]
             if len(all_advisories_id) > 1:
                 return f'Bug <{bug.weburl}|{bug.id}> is attached in multiple advisories: {all_advisories_id}'
             return None
@@ -209,20 +224,27 @@ class BugValidator:
 
     async def verify_attached_flaws(self, advisory_bugs: Dict[int, List[Bug]]):
         futures = []
+        flaw_bug_ids = set()
         for advisory_id, attached_bugs in advisory_bugs.items():
             attached_trackers = [b for b in attached_bugs if b.is_tracker_bug()]
             attached_flaws = [b for b in attached_bugs if b.is_flaw_bug()]
             logger.info(f"Verifying advisory {advisory_id}: attached-trackers: "
                         f"{[b.id for b in attached_trackers]} "
                         f"attached-flaws: {[b.id for b in attached_flaws]}")
+            flaw_bug_ids.update(i for t in attached_trackers for i in t.corresponding_flaw_bug_ids)
             futures.append(self._verify_attached_flaws_for(advisory_id, attached_trackers, attached_flaws))
+        # fetch the flaw bugs of all advisories at once; advisories of a release often share flaws
+        await exectools.to_thread(self._get_flaw_bugs, flaw_bug_ids)
         await asyncio.gather(*futures)
 
     async def _verify_attached_flaws_for(self, advisory_id: int, attached_trackers: Iterable[Bug], attached_flaws: Iterable[Bug]):
         flaw_bug_tracker = self.runtime.get_bug_tracker('bugzilla')
         brew_api = self.runtime.build_retrying_koji_client()
-        tracker_flaws, first_fix_flaw_bugs = get_flaws(flaw_bug_tracker, attached_trackers, brew_api,
-                                                       self.runtime.logger)
+        flaw_bugs = await exectools.to_thread(
+            self._get_flaw_bugs, {i for t in attached_trackers for i in t.corresponding_flaw_bug_ids})
+        tracker_flaws, first_fix_flaw_bugs = await get_flaws(flaw_bug_tracker, attached_trackers, brew_api,
+                                                             self.runtime.logger, lookup_cache=self.runtime.get_lookup_cache(),
+                                                             flaw_bugs=flaw_bugs)
 
         # Check if attached flaws match expected flaws
         first_fix_flaw_ids = {b.id for b in first_fix_flaw_bugs}
@@ -300,20 +322,29 @@ class BugValidator:
             self._complain(f"On advisory {advisory_id}, bugs for the following CVEs are not attached but listed in "
                            f"advisory's `CVE Names` field: {', '.join(sorted(missing_cves))}")
 
-    def get_attached_bugs(self, advisory_ids: List[str]) -> Dict[int, Set[Bug]]:
+    async def get_attached_bugs(self, advisory_ids: List[str]) -> Dict[int, Set[Bug]]:
         """ Get bugs attached to specified advisories
         :return: a dict with advisory id as key and set of bug objects as value
         """
         logger.info(f"Retrieving bugs for advisories: {advisory_ids}")
-        advisories = [Erratum(errata_id=advisory_id) for advisory_id in advisory_ids]
-
-        attached_bug_map = {advisory_id: set() for advisory_id in advisory_ids}
-        for bug_tracker_type in ['jira', 'bugzilla']:
-            bug_tracker = self.runtime.get_bug_tracker(bug_tracker_type)
-            advisory_bug_id_map = {advisory.errata_id: bug_tracker.advisory_bug_ids(advisory)
-                                   for advisory in advisories}
+        bug_trackers = [self.runtime.get_bug_tracker(bug_tracker_type) for bug_tracker_type in ['jira', 'bugzilla']]
+        # errata_tool objects share their auth at class level, so advisories are fetched with the async client
+        raw_advisories = await asyncio.gather(*[self.errata_api.get_advisory(advisory_id)
+                                                for advisory_id in advisory_ids])
+        advisories = {advisory_id: AdvisoryInfo(raw) for advisory_id, raw in zip(advisory_ids, raw_advisories)}
+
+        def get_bugs(bug_tracker):
+            advisory_bug_id_map = {advisory_id: bug_tracker.advisory_bug_ids(advisories[advisory_id])
+                                   for advisory_id in advisory_ids}
             bug_map = bug_tracker.get_bugs_map([bug_id for bug_list in advisory_bug_id_map.values()
                                                 for bug_id in bug_list])
+            return advisory_bug_id_map, bug_map
+
+        # fetch bugs from JIRA and Bugzilla concurrently
+        results = await asyncio.gather(*[exectools.to_thread(get_bugs, bug_tracker) for bug_tracker in bug_trackers])
+
+        attached_bug_map = {advisory_id: set() for advisory_id in advisory_ids}
+        for advisory_bug_id_map, bug_map in results:
             for advisory_id in advisory_ids:
                 set_of_bugs = {bug_map[bid] for bid in advisory_bug_id_map[advisory_id] if bid in bug_map}
                 attached_bug_map[advisory_id] = attached_bug_map[advisory_id] | set_of_bugs
@@ -333,13 +364,40 @@ class BugValidator:
                 )
         return filtered_bugs
 
+    def _get_bugs(self, bug_ids: Iterable) -> List[Bug]:
+        """ Get JIRA and Bugzilla bugs by id. Only bugs this validator hasn't looked up before are fetched,
+        in one batch per tracker.
+        :return: the bugs found
+        """
+        jira_ids, bz_ids = bzutil.get_jira_bz_bug_ids(set(bug_ids))
+        return self._bugs.get(jira_ids | bz_ids)
+
+    def _fetch_bugs(self, bug_ids: List) -> List[Bug]:
+        # retrieve bugs from JIRA and Bugzilla concurrently
+        jira_ids, bz_ids = bzutil.get_jira_bz_bug_ids(set(bug_ids))
+        lookups = []
+        if jira_ids:
+            lookups.append((self.runtime.get_bug_tracker('jira'), jira_ids))
+        if bz_ids:
+            lookups.append((self.runtime.get_bug_tracker('bugzilla'), bz_ids))
+        pool = ThreadPool(len(lookups))
+        results = pool.starmap(lambda bug_tracker, ids: bug_tracker.get_bugs(ids), lookups)
+        pool.close()
+        pool.join()
+        return [bug for bugs_found in results for bug in bugs_found]
+
+    def _get_flaw_bugs(self, flaw_bug_ids: Iterable[int]) -> List[Bug]:
+        """ Get flaw bugs by id. Only flaw bugs this validator hasn't looked up before are fetched.
+        :return: the flaw bugs found
+        """
+        return self._flaw_bugs.get(sorted(set(flaw_bug_ids)))
+
     def _get_blocking_bugs_for(self, bugs):
         # get blocker bugs in the next version for all bugs we are examining
         candidate_blockers = []
         for b in bugs:
             if b.depends_on:
                 candidate_blockers.extend(b.depends_on)
-        jira_ids, bz_ids = bzutil.get_jira_bz_bug_ids(set(candidate_blockers))
 
         v = minor_version_tuple(self.target_releases[0])
         next_version = (v[0], v[1] + 1)
@@ -352,14 +410,8 @@ class BugValidator:
             components_not_managed_by_art = self.runtime.get_bug_tracker('jira').component_filter()
             return b.component not in components_not_managed_by_art
 
-        # retrieve blockers and filter to those with correct product and target version
-        blockers = []
-        if jira_ids:
-            blockers.extend(self.runtime.get_bug_tracker('jira')
-                            .get_bugs(jira_ids))
-        if bz_ids:
-            blockers.extend(self.runtime.get_bug_tracker('bugzilla')
-                            .get_bugs(bz_ids))
+        # retrieve blockers, and filter to those with correct product and target version
+        blockers = self._get_bugs(candidate_blockers)
         logger.debug(f"Candidate Blocker bugs found: {[b.id for b in blockers]}")
         blocking_bugs = {}
         for bug in blockers:
@@ -431,6 +483,21 @@ class BugValidator:
             if bug.is_invalid_tracker_bug():
                 self._complain(f"Bug <{bug.weburl}|{bug.id}> is an invalid tracker bug. Please fix")
 
+    async def run_checks(self, checks: Iterable[Awaitable]):
+        """ Run checks concurrently. The problems they find are printed once all are done, sorted,
+        so that the output doesn't depend on which check finishes first.
+        """
+        first = len(self.problems)
+        self._defer_problems = True
+        try:
+            await asyncio.gather(*checks)
+        finally:
+            self._defer_problems = False
+            self.problems[first:] = sorted(self.problems[first:], key=str)
+            for problem in self.problems[first:]:
+                red_print(problem)
+
     def _complain(self, problem: str):
-        red_print(problem)
+        if not self._defer_problems:
+            red_print(problem)
         self.problems.append(problem)
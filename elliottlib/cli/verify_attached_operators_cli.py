@@ -8,8 +8,6 @@ import yaml
 import json
 from zipfile import ZipFile
 
-from errata_tool import Erratum
-
 from elliottlib import brew, constants, exectools, errata
 from elliottlib.cli.common import cli, pass_runtime
 from elliottlib.exceptions import ElliottFatalError, BrewBuildException
@@ -117,7 +115,7 @@ def _get_attached_image_builds(brew_session, advisories):
     build_nvrs = []
     for advisory in advisories:
         green_print(f"Retrieving builds from advisory {advisory}")
-        advisory = Erratum(errata_id=advisory)
+        advisory = errata.AdvisoryInfo.fetch(advisory)
         for build_list in advisory.errata_builds.values():  # one per product version
             build_nvrs.extend(build_list)
 
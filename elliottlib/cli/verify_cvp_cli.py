@@ -79,7 +79,8 @@ async def verify_cvp_cli(runtime: Runtime, all_images, nvrs, include_content_set
 
     inspector = None
     try:
-        inspector = CVPInspector(group_config=runtime.group_config, image_metas=runtime.image_metas(), logger=runtime.logger)
+        inspector = CVPInspector(group_config=runtime.group_config, image_metas=runtime.image_metas(), logger=runtime.logger,
+                                 lookup_cache=runtime.get_lookup_cache())
 
         # Get latest CVP sanity_test results for specified NVRs
         runtime.logger.info(f"Getting CVP test results for {len(nvr_builds)} image builds...")
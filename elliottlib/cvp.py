@@ -12,19 +12,36 @@ from aiohttp.client_exceptions import (ClientResponseError,
 from tenacity import (before_sleep_log, retry, retry_if_exception_type,
                       stop_after_attempt, wait_exponential)
 
-from elliottlib.exectools import limit_concurrency
+from elliottlib.exectools import limit_concurrency, to_thread
 from elliottlib.imagecfg import ImageMetadata
+from elliottlib.lookup_cache import LookupCache
 from elliottlib.resultsdb import ResultsDBAPI
 from elliottlib.util import all_same, brew_arch_for_go_arch, parse_nvr
 
 
 class CVPInspector:
+    """ Looks up CVP test results of image builds and diagnoses failed checks.
+
+    All requests go through one aiohttp session, closed by close().
+    If a lookup cache is given, the optional check results of a test run are kept there by the ref_url of the run,
+    since they never change once found. A build can be tested again, so its passed sanity test result is only kept
+    for SANITY_RESULT_TTL seconds.
+    """
 
     CVP_TEST_CASE_SANITY = "cvp.rhproduct.default.sanity"
+    # only PASSED, FAILED, INFO, NEEDS_INSPECTION are now valid outcome values (https://resultsdb20.docs.apiary.io/#introduction/changes-since-1.0)
+    PASSED_OUTCOMES = {"PASSED", "INFO"}
+    FAILED_OUTCOMES = {"NEEDS_INSPECTION", "FAILED"}
+
+    SANITY_RESULT_TTL = 3600
+    OPTIONAL_RESULTS_TTL = 30 * 24 * 3600
 
     def __init__(self, group_config: Dict, image_metas: Iterable[ImageMetadata],
-                 logger: Optional[logging.Logger] = None) -> None:
-        self._resultsdb_api = ResultsDBAPI()
+                 logger: Optional[logging.Logger] = None, lookup_cache: Optional[LookupCache] = None,
+                 concurrency: int = 32) -> None:
+        self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency))
+        self._resultsdb_api = ResultsDBAPI(session=self._session)
+        self._lookup_cache = lookup_cache
         self._group_config = group_config
         self._image_metas = list(image_metas)
         self._content_set_to_repo_names = {}
@@ -38,18 +55,26 @@ class CVPInspector:
 
     async def close(self):
         await self._resultsdb_api.close()
+        await self._session.close()
 
     async def latest_sanity_test_results(self, nvrs: Iterable[str]) -> Dict[str, Optional[Dict]]:
         """ Get latest CVP test results for specified build NVRs
         """
         nvr_results = {}
         nvrs = set(nvrs)
-        results = await self._resultsdb_api.get_latest_results((self.CVP_TEST_CASE_SANITY, ), nvrs)
+        if self._lookup_cache:
+            nvr_results.update(await to_thread(self._lookup_cache.get_many, "cvp:sanity-result", nvrs))
+        results = await self._resultsdb_api.get_latest_results((self.CVP_TEST_CASE_SANITY, ),
+                                                               sorted(nvrs - nvr_results.keys()))
         for r in results:
             nvr = r["data"]["item"][0]
             if nvr in nvr_results:
                 raise KeyError(f"Found duplicated CVP test results for NVR {nvr}: {r}, {nvr_results[nvr]}")
             nvr_results[nvr] = r
+        if self._lookup_cache:
+            passed = {r["data"]["item"][0]: r for r in results if r["outcome"] in self.PASSED_OUTCOMES}
+            if passed:
+                await to_thread(self._lookup_cache.put_many, "cvp:sanity-result", passed, self.SANITY_RESULT_TTL)
         for nvr in nvrs - nvr_results.keys():
             nvr_results[nvr] = None  # missing result
         return nvr_results
@@ -61,17 +86,14 @@ class CVPInspector:
         missing = {}
         passed = {}
         failed = {}
-        # only PASSED, FAILED, INFO, NEEDS_INSPECTION are now valid outcome values (https://resultsdb20.docs.apiary.io/#introduction/changes-since-1.0)
-        PASSED_OUTCOMES = {"PASSED", "INFO"}
-        FAILED_OUTCOMES = {"NEEDS_INSPECTION", "FAILED"}
         for nvr, result in nvr_results.items():
             if not result:
                 missing[nvr] = result
                 continue
             outcome = result["outcome"]
-            if outcome in PASSED_OUTCOMES:
+            if outcome in self.PASSED_OUTCOMES:
                 passed[nvr] = result
-            elif outcome in FAILED_OUTCOMES:
+            elif outcome in self.FAILED_OUTCOMES:
                 failed[nvr] = result
             else:
                 raise ValueError(f"Unrecognized CVP test result outcome: {outcome}")
@@ -83,23 +105,30 @@ class CVPInspector:
                before_sleep=before_sleep_log(self._logger, logging.WARNING))
         @limit_concurrency(limit=32)
         async def _fetch(url):
-            r = await session.get(url)
-            if r.status == 404:
-                return None
-            r.raise_for_status()
-            text = await r.text()  # can't use r.json() because the url doesn't return correct content-type
+            async with self._session.get(url) as r:
+                if r.status == 404:
+                    return None
+                r.raise_for_status()
+                text = await r.text()  # can't use r.json() because the url doesn't return correct content-type
             return json.loads(text)
 
-        async with aiohttp.ClientSession() as session:
-            futures = []
-            for cvp_result in test_results:
-                # Each CVP test result stored in ResultsDB has a link to an external storage with more CVP test details
-                # e.g. https://external-ci-coldstorage.datahub.redhat.com/cvp/cvp-product-test/openshift-enterprise-console-container-v4.9.0-202205181110.p0.ge43e6e7.assembly.art2675/edef5ab1-62fb-480e-b0da-f63ce6d19d28/
-                url = urljoin(cvp_result["ref_url"], "sanity-tests-optional-results.json")
-                # example results https://external-ci-coldstorage.datahub.redhat.com/cvp/cvp-product-test/openshift-enterprise-console-container-v4.9.0-202205181110.p0.ge43e6e7.assembly.art2675/edef5ab1-62fb-480e-b0da-f63ce6d19d28/sanity-tests-optional-results.json
-                futures.append(_fetch(url))
-            optional_results = await asyncio.gather(*futures)
-        return optional_results
+        test_results = list(test_results)
+        ref_urls = list(dict.fromkeys(r["ref_url"] for r in test_results))
+        # ref_url -> optional results; the optional results of a finished test run never change
+        optional_results = {}
+        if self._lookup_cache:
+            optional_results.update(await to_thread(self._lookup_cache.get_many, "cvp:optional-results", ref_urls))
+        # Each CVP test result stored in ResultsDB has a link to an external storage with more CVP test details
+        # e.g. https://external-ci-coldstorage.datahub.redhat.com/cvp/cvp-product-test/openshift-enterprise-console-container-v4.9.0-202205181110.p0.ge43e6e7.assembly.art2675/edef5ab1-62fb-480e-b0da-f63ce6d19d28/
+        # example results https://external-ci-coldstorage.datahub.redhat.com/cvp/cvp-product-test/openshift-enterprise-console-container-v4.9.0-202205181110.p0.ge43e6e7.assembly.art2675/edef5ab1-62fb-480e-b0da-f63ce6d19d28/sanity-tests-optional-results.json
+        to_fetch = [u for u in ref_urls if u not in optional_results]
+        fetched = await asyncio.gather(*[_fetch(urljoin(u, "sanity-tests-optional-results.json")) for u in to_fetch])
+        # results not found yet (None) may still be uploaded; don't keep those
+        found = {u: o for u, o in zip(to_fetch, fetched) if o is not None}
+        if self._lookup_cache and found:
+            await to_thread(self._lookup_cache.put_many, "cvp:optional-results", found, self.OPTIONAL_RESULTS_TTL)
+        optional_results.update(zip(to_fetch, fetched))
+        return [optional_results[r["ref_url"]] for r in test_results]
 
     def categorize_sanity_test_optional_results(self, nvr_results: Dict[str, Optional[Dict]], included_checks: Set[str] = set()):
         """ Categorize CVP sanity test optional results
@@ -358,9 +387,8 @@ class CVPInspector:
         nvre = parse_nvr(nvr)
         url = f"https://download.eng.bos.redhat.com/brewroot/packages/{nvre['name']}/{nvre['version']}/{nvre['release']}/data/logs/{arch}.log"
         self._logger.info("Fetching build log for %s %s (%s)", nvr, arch, url)
-        async with aiohttp.ClientSession() as session:
-            async with await session.get(url) as response:
-                response.raise_for_status()
-                log = await response.text()
+        async with self._session.get(url) as response:
+            response.raise_for_status()
+            log = await response.text()
         self._logger.info("Done fetching build log for %s %s (%s)", nvr, arch, url)
         return log
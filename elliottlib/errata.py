@@ -7,19 +7,22 @@ associated metadata.
 Classes representing an ERRATUM (a single errata)
 
 """
+import asyncio
 import datetime
 import json
 import ssl
 import re
+import threading
 import click
 import requests
 from functools import lru_cache
 from elliottlib import exceptions, constants, brew, logutil
 from elliottlib.util import green_print, chunk
 from elliottlib import bzutil
+from elliottlib.errata_async import AsyncErrataAPI, AsyncErrataUtils, BugAttachResult
 from requests_gssapi import HTTPSPNEGOAuth
 from errata_tool import Erratum, ErrataException, ErrataConnector
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 import xmlrpc.client
@@ -30,6 +33,11 @@ ErrataConnector._url = constants.errata_url
 errata_xmlrpc = xmlrpc.client.ServerProxy(constants.errata_xmlrpc_url)
 
 
+# errata_tool's ErrataConnector keeps its auth and timings at class level, shared by all Erratum objects.
+# Code that uses Erratum objects from several threads at once holds this lock while doing so.
+erratum_lock = threading.RLock()
+
+
 class Advisory(Erratum):
     """
     Wrapper class of errata_tool.Erratum
@@ -94,12 +102,153 @@ class Advisory(Erratum):
         green_print('Removed build(s) successfully')
 
 
+class AdvisoryInfo:
+    """
+    Immutable, read-only view of an advisory.
+
+    Unlike errata_tool.Erratum, which issues several requests and checks the signature of
+    every attached build when constructed, an AdvisoryInfo is built from a single
+    GET /api/v1/erratum/{id} response. Builds, legacy product/people info and CDN repos
+    are fetched on first access and cached. Instances don't share any class level state
+    and can be safely shared across threads.
+
+    Attribute names follow errata_tool.Erratum where possible, so read-only callers can switch over.
+    Attached bugs (errata_bugs and jira_issues) are tuples rather than lists, so they can't be changed either.
+    """
+    __slots__ = ("errata_id", "errata_type", "errata_state", "errata_name", "synopsis", "content_types",
+                 "text_only", "publish_date", "publish_date_override", "security_impact", "topic",
+                 "description", "solution", "text_only_cpe", "cve_names", "errata_bugs", "jira_issues",
+                 "manager_id", "raw", "_lazy", "_lock")
+
+    def __init__(self, raw: Dict):
+        """
+        :param raw: the response of GET /api/v1/erratum/{id}
+        """
+        errata_type, erratum = next(iter(raw["errata"].items()))
+        content = raw["content"]["content"]
+        values = {
+            "errata_id": erratum["id"],
+            "errata_type": errata_type.upper(),
+            "errata_state": erratum["status"],
+            "errata_name": erratum["fulladvisory"],
+            "synopsis": erratum["synopsis"],
+            "content_types": erratum.get("content_types", []),
+            "text_only": erratum.get("text_only", False),
+            "publish_date": self._format_date(erratum.get("publish_date")),
+            "publish_date_override": self._format_date(erratum.get("publish_date_override")),
+            "security_impact": erratum.get("security_impact"),
+            "topic": content["topic"],
+            "description": content["description"],
+            "solution": content["solution"],
+            "text_only_cpe": content.get("text_only_cpe"),
+            "cve_names": content.get("cve") or None,
+            "errata_bugs": tuple(int(b["bug"]["id"]) for b in raw["bugs"]["bugs"]),
+            "jira_issues": tuple(i["jira_issue"]["key"] for i in raw["jira_issues"]["jira_issues"]),
+            "manager_id": erratum.get("manager_id"),
+            "raw": raw,
+            "_lazy": {},
+            "_lock": threading.Lock(),
+        }
+        for key, value in values.items():
+            object.__setattr__(self, key, value)
+
+    @classmethod
+    def fetch(cls, advisory_id) -> "AdvisoryInfo":
+        return cls(get_raw_erratum(advisory_id))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{type(self).__name__} is immutable; use errata.Advisory to make changes")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"{type(self).__name__} is immutable; use errata.Advisory to make changes")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.errata_id}, {self.errata_name}, {self.errata_state})"
+
+    @staticmethod
+    def _format_date(value):
+        # same format as errata_tool.Erratum
+        if not value:
+            return None
+        return datetime.datetime.strptime(str(value), '%Y-%m-%dT%H:%M:%SZ').strftime('%Y-%b-%d')
+
+    def _load(self, key, loader):
+        with self._lock:
+            if key not in self._lazy:
+                self._lazy[key] = loader()
+            return self._lazy[key]
+
+    def url(self):
+        return f"{constants.errata_url}/advisory/{self.errata_id}"
+
+    @property
+    def errata_builds(self) -> Dict[str, List[str]]:
+        """ NVRs of attached builds, grouped by product version """
+        def _loader():
+            return {pv: [nvr for build in info["builds"] for nvr in build]
+                    for pv, info in _errata_get(f"/api/v1/erratum/{self.errata_id}/builds").items()}
+        return self._load("builds", _loader)
+
+    @property
+    def metadata_cdn_repos(self) -> List[Dict]:
+        return self._load("cdn_repos", lambda: _errata_get(f"/api/v1/erratum/{self.errata_id}/metadata_cdn_repos"))
+
+    @property
+    def _legacy(self) -> Dict:
+        # /advisory/{id}.json is the only place Errata exposes product, release and people info
+        return self._load("legacy", lambda: _errata_get(f"/advisory/{self.errata_id}.json"))
+
+    @property
+    def product(self) -> str:
+        return self._legacy["product"]["short_name"]
+
+    @property
+    def release(self) -> str:
+        return self._legacy["release"]["name"]
+
+    @property
+    def package_owner_email(self) -> str:
+        return self._legacy["people"]["package_owner"]
+
+    @property
+    def manager_email(self) -> Optional[str]:
+        return self._legacy["people"].get("manager")
+
+    @property
+    def qe_email(self) -> str:
+        return self._legacy["people"]["assigned_to"]
+
+    @property
+    def qe_group(self) -> str:
+        return self._legacy["people"]["qe_group"]
+
+
+def _errata_get(path, **kwargs):
+    """
+    GET an Errata Tool API endpoint and return the parsed json.
+    A new auth object is created for every request, so it is safe to call from multiple threads
+    (unlike ErrataConnector which shares state at class level).
+    """
+    res = requests.get(constants.errata_url + path,
+                       verify=ssl.get_default_verify_paths().openssl_cafile,
+                       auth=HTTPSPNEGOAuth(),
+                       **kwargs)
+    if res.status_code == 200:
+        return res.json()
+    elif res.status_code == 401:
+        raise exceptions.ErrataToolUnauthenticatedException(res.text)
+    else:
+        raise exceptions.ErrataToolError("Other error (status_code={code}): {msg}".format(
+            code=res.status_code,
+            msg=res.text))
+
+
 def get_raw_erratum(advisory_id):
     """
     Retrieve the raw dictionary object that we get for an erratum,
     without wasting time processing it, loading builds, etc.
     """
-    return ErrataConnector()._get(f"/api/v1/erratum/{advisory_id}")
+    return _errata_get(f"/api/v1/erratum/{advisory_id}")
 
 
 def add_jira_issue(advisory_id, jira_issue_id):
@@ -292,41 +441,100 @@ def build_signed(build):
             msg=res.text))
 
 
-def get_filtered_list(filter_id=constants.errata_default_filter, limit=5):
-    """return a list of Advisory() objects from results using the provided
-    filter_id
+class FilteredAdvisory:
+    """
+    An advisory as listed by an Errata filter.
+
+    The filter listing already carries the id, type, name, state and synopsis of each advisory.
+    Any other attribute (or str()) constructs the full Advisory on first access; it is then cached.
+    """
+    def __init__(self, item: Dict):
+        """
+        :param item: an entry of the GET /filter/{id}.json response
+        """
+        self.raw = item
+        self.errata_id = item["id"]
+        self.errata_type = item.get("type")
+        self.errata_name = item.get("advisory_name")
+        self.errata_state = item.get("status")
+        self.synopsis = item.get("synopsis")
+        self._advisory = None
+        self._lock = threading.Lock()
+
+    @property
+    def advisory(self) -> Advisory:
+        with self._lock:
+            if self._advisory is None:
+                self._advisory = Advisory(errata_id=self.errata_id)
+            return self._advisory
+
+    def __getattr__(self, name):
+        # only called for attributes not set in __init__
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.advisory, name)
+
+    def __str__(self):
+        return str(self.advisory)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.errata_id}, {self.errata_name}, {self.errata_state})"
+
+    def url(self):
+        return f"{constants.errata_url}/advisory/{self.errata_id}"
+
+
+def iter_filtered_list(filter_id=constants.errata_default_filter, limit=None):
+    """Lazily yield FilteredAdvisory objects from the results of the
+    provided filter_id. Pages are requested one at a time, and no more
+    pages are requested once `limit` advisories have been yielded.
 
     :param filter_id: The ID number of the pre-defined filter
-    :param int limit: How many erratum to list
-    :return: A list of Advisory objects
+    :param int limit: How many erratum to list. None for all of them.
 
     :raises exceptions.ErrataToolUnauthenticatedException: If the user is not authenticated to make the request
     :raises exceptions.ErrataToolError: If the given filter does not exist, and, any other unexpected error
 
     Note: Errata filters are defined in the ET web interface
     """
-    filter_endpoint = constants.errata_filter_list_url.format(id=filter_id)
-    res = requests.get(filter_endpoint,
-                       verify=ssl.get_default_verify_paths().openssl_cafile,
-                       auth=HTTPSPNEGOAuth())
-    if res.status_code == 200:
+    if limit is not None and limit <= 0:
+        return
+    seen = set()
+    page = 1
+    while True:
         # When asked for an advisory list which does not exist
         # normally you would expect a code like '404' (not
         # found). However, the Errata Tool sadistically returns a 200
         # response code. That leaves us with one option: Decide that
-        # successfully parsing the response as a JSONinfo object indicates
-        # a successful API call.
+        # successfully parsing the response as a list of advisories
+        # indicates a successful API call.
         try:
-            return [Advisory(errata_id=advs['id']) for advs in res.json()][:limit]
-        except Exception:
+            items = _errata_get(f"/filter/{filter_id}.json", params={"page": page})
+            items = [item for item in items if item["id"] not in seen]
+        except (ValueError, TypeError, KeyError):
             raise exceptions.ErrataToolError("Could not locate the given advisory filter: {fid}".format(
                 fid=filter_id))
-    elif res.status_code == 401:
-        raise exceptions.ErrataToolUnauthenticatedException(res.text)
-    else:
-        raise exceptions.ErrataToolError("Other error (status_code={code}): {msg}".format(
-            code=res.status_code,
-            msg=res.text))
+        # An empty page is the end of the list. So is a page without anything new,
+        # in case the page parameter is ignored.
+        if not items:
+            return
+        for item in items:
+            seen.add(item["id"])
+            yield FilteredAdvisory(item)
+            if limit is not None and len(seen) >= limit:
+                return
+        page += 1
+
+
+def get_filtered_list(filter_id=constants.errata_default_filter, limit=5):
+    """return a list of FilteredAdvisory objects from results using the provided
+    filter_id. See iter_filtered_list.
+
+    :param filter_id: The ID number of the pre-defined filter
+    :param int limit: How many erratum to list
+    :return: A list of FilteredAdvisory objects
+    """
+    return list(iter_filtered_list(filter_id, limit=limit))
 
 
 def add_comment(advisory_id, comment):
@@ -539,104 +747,67 @@ def get_advisories_for_bug(bug_id, session=None):
     return r.json()
 
 
-def parse_exception_error_message(e):
-    """
-    :param e: exception messages (format is like 'Bug #1685399 The bug is filed already in RHBA-2019:1589.
-        # Bug #1685398 The bug is filed already in RHBA-2019:1589.' )
-
-    :return: [1685399, 1685398]
-    """
-    return [int(b.split('#')[1]) for b in re.findall(r'Bug #[0-9]*', str(e))]
-
-
 def remove_bugzilla_bugs(advisory_obj, bugids: List):
     advisory_obj.removeBugs([bug for bug in bugids])
     advisory_obj.commit()
 
 
+# advisory id -> lock held while attaching bugs to it; each update replaces the advisory's whole bug list
+_attach_locks: Dict[int, threading.Lock] = {}
+_attach_locks_lock = threading.Lock()
+
+
+def _attach_bugs(advisory: Erratum, bugids: List, noop: bool, batch_size: int) -> BugAttachResult:
+    async def _attach():
+        # the same server the advisory object talks to
+        api = AsyncErrataAPI(advisory._url)
+        try:
+            return await AsyncErrataUtils.attach_bugs(api, advisory.errata_id, bugids, chunk_size=batch_size,
+                                                      dry_run=noop)
+        finally:
+            await api.close()
+
+    with _attach_locks_lock:
+        lock = _attach_locks.setdefault(advisory.errata_id, threading.Lock())
+    with lock:
+        result = asyncio.run(_attach())
+    if result.attached:
+        # keep the advisory object in step, so that a later commit doesn't drop the bugs
+        advisory.refresh()
+    return result
+
+
 def add_bugzilla_bugs_with_retry(advisory: Erratum, bugids: List, noop: bool = False,
-                                 batch_size: int = constants.BUG_ATTACH_CHUNK_SIZE):
+                                 batch_size: int = constants.BUG_ATTACH_CHUNK_SIZE) -> BugAttachResult:
     """
-    adding specified bugs into advisory, retry 2 times: first time
-    parse the exception message to get failed bug id list, remove from original
-    list then add bug to advisory again, if still has failures raise exceptions
+    adding specified bugs into advisory in batches. Bugs Errata refuses, e.g. because they are filed already
+    in another advisory, are left out; see AsyncErrataUtils.attach_bugs
 
     :param advisory: advisory object
     :param bugids: iterable of bugzilla bug ids to attach to advisory
     :param noop: do not modify anything
     :param batch_size: perform operation in batches of given size
-    :return:
+    :return: which bugs were attached, already attached and refused
     """
     logger.info(f'Request to attach {len(bugids)} bugs to the advisory {advisory.errata_id}')
     if not advisory:
         raise exceptions.ElliottFatalError("Error: advisory object cannot be empty")
-
-    existing_bugs = bzutil.BugzillaBugTracker.advisory_bug_ids(advisory)
-    new_bugs = set(bugids) - set(existing_bugs)
-    logger.info(f'New bugs (not already attached to advisory): {len(new_bugs)}')
-    logger.debug(f'New bugs: {sorted(new_bugs)}')
-    logger.debug(f'Bugs already attached: {sorted(set(bugids) & set(existing_bugs))}')
-    if not new_bugs:
-        return
-
-    for chunk_of_bugs in chunk(list(new_bugs), batch_size):
-        if noop:
-            logger.info('Dry run: Would have attached bugs')
-            continue
-        try:
-            advisory.addBugs(chunk_of_bugs)
-            advisory.commit()
-        except ErrataException as e:
-            logger.info(f"ErrataException Message: {e}\nRetrying...")
-            block_list = parse_exception_error_message(e)
-            retry_list = [x for x in chunk_of_bugs if x not in block_list]
-            if len(retry_list) == 0:
-                continue
-            try:
-                advisory = Erratum(errata_id=advisory.errata_id)
-                advisory.addBugs(retry_list)
-                advisory.commit()
-            except ErrataException as e:
-                raise exceptions.ElliottFatalError(getattr(e, 'message', repr(e)))
-            logger.info("remaining bugs attached")
-        logger.info("All bugzilla bugs attached")
+    return _attach_bugs(advisory, bugids, noop, batch_size)
 
 
 def add_jira_bugs_with_retry(advisory: Erratum, bugids: List[str], noop: bool = False,
-                             batch_size: int = constants.BUG_ATTACH_CHUNK_SIZE):
+                             batch_size: int = constants.BUG_ATTACH_CHUNK_SIZE) -> BugAttachResult:
     """
     :param advisory: advisory object
     :param bugids: iterable of jira bug ids to attach to advisory
     :param noop: do not modify anything
     :param batch_size: perform operation in batches of given size
+    :return: which bugs were attached, already attached and refused
     """
     logger.info(f'Request to attach {len(bugids)} bugs to the advisory {advisory.errata_id}')
     if not advisory:
         raise exceptions.ElliottFatalError("Error: advisory object cannot be empty")
-
-    existing_bugs = bzutil.JIRABugTracker.advisory_bug_ids(advisory)
-    new_bugs = set(bugids) - set(existing_bugs)
-    logger.info(f'New bugs (not already attached to advisory): {len(new_bugs)}')
-    logger.debug(f'New bugs: {sorted(new_bugs)}')
-    logger.debug(f'Bugs already attached: {sorted(set(bugids) & set(existing_bugs))}')
-    if not new_bugs:
-        return
-    for chunk_of_bugs in chunk(bugids, batch_size):
-        if noop:
-            logger.info('Dry run: Would have attached bugs')
-            continue
-        try:
-            advisory.addJiraIssues(chunk_of_bugs)
-            advisory.commit()
-        except ErrataException as e:
-            attached_bugs = re.findall("Issue (.*) The issue is filed already in", str(e))
-            if attached_bugs:
-                chunk_of_bugs = [b for b in chunk_of_bugs if b not in [b.upper() for b in attached_bugs]]
-                advisory = Erratum(errata_id=advisory.errata_id)
-                advisory.addJiraIssues(chunk_of_bugs)
-                advisory.commit()
-            else:
-                raise e
+    return _attach_bugs(advisory, bugids, noop, batch_size)
 
 
 def get_rpmdiff_runs(advisory_id, status=None, session=None):
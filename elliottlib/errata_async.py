@@ -1,6 +1,9 @@
 import asyncio
 import base64
-from typing import Dict, Iterable, List, Set, Union
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Union
 from urllib.parse import quote, urlparse
 from aiohttp import ClientResponseError, ClientTimeout
 
@@ -10,9 +13,13 @@ from elliottlib.exectools import limit_concurrency
 
 from elliottlib.rpm_utils import parse_nvr
 from elliottlib import constants, util, logutil
+from elliottlib.exceptions import BuildSigningTimeoutError
 
 _LOGGER = logutil.getLogger(__name__)
 
+# what Errata says about a bug it won't attach, e.g. "Bug #1685399 The bug is filed already in RHBA-2019:1589."
+_REFUSED_BUG_PATTERN = re.compile(r"Bug #\d+|is filed already")
+
 
 class AsyncErrataAPI:
     def __init__(self, url: str = constants.errata_url):
@@ -41,7 +48,14 @@ class AsyncErrataAPI:
         if "headers" in kwargs:
             headers.update(kwargs.pop("headers"))
         async with self._session.request(method, self._errata_url + path, headers=headers, **kwargs) as resp:
-            resp.raise_for_status()
+            try:
+                resp.raise_for_status()
+            except ClientResponseError as e:
+                # the body says what Errata objected to; the reason phrase alone doesn't
+                body = await resp.text()
+                if body:
+                    e.message = f"{e.message}: {body}"
+                raise
             result = await (resp.json() if parse_json else resp.read())
         return result
 
@@ -49,6 +63,12 @@ class AsyncErrataAPI:
         path = f"/api/v1/erratum/{quote(str(advisory))}"
         return await self._make_request(aiohttp.hdrs.METH_GET, path)
 
+    async def set_bugs(self, advisory: Union[int, str], bug_ids: Iterable[Union[int, str]]):
+        """ Replace the Bugzilla bugs and JIRA issues attached to an advisory """
+        path = f"/api/v1/erratum/{quote(str(advisory))}"
+        data = {"advisory": {"idsfixed": " ".join(str(b) for b in bug_ids)}}
+        return await self._make_request(aiohttp.hdrs.METH_PUT, path, json=data)
+
     async def get_builds(self, advisory: Union[int, str]):
         # As of May 25, 2023, /api/v1/erratum/{id}/builds_list doesn't return all builds.
         # Use /api/v1/erratum/{id}/builds instead.
@@ -92,6 +112,11 @@ class AsyncErrataAPI:
         path = f"/api/v1/cve_package_exclusion/{int(exclusion_id)}"
         await self._make_request(aiohttp.hdrs.METH_DELETE, path, parse_json=False)
 
+    @limit_concurrency(limit=16)
+    async def get_build(self, build: Union[int, str]) -> Dict:
+        path = f"/api/v1/build/{quote(str(build))}"
+        return await self._make_request(aiohttp.hdrs.METH_GET, path)
+
     @limit_concurrency(limit=16)
     async def get_advisories_for_jira(self, jira_key: str, ignore_not_found=False):
         path = f"/jira_issues/{quote(jira_key)}/advisories.json"
@@ -111,6 +136,99 @@ class AsyncErrataAPI:
         path = f"/bugs/{bz_key}/advisories.json"
         return await self._make_request(aiohttp.hdrs.METH_GET, path)
 
+    async def get_advisories_for_release(self, release_name: str) -> List[Dict]:
+        """ List the advisories of an Errata release, e.g. "RHOSE ASYNC - AUTO".
+        Each advisory is a dict with (among others) "id" and "status" keys.
+        """
+        params = {"filter[name]": release_name}
+        result = await self._make_request(aiohttp.hdrs.METH_GET, "/api/v1/releases", params=params)
+        releases = result.get("data", [])
+        if not releases:
+            raise ValueError(f"Errata release {release_name} not found")
+        path = f"/release/{int(releases[0]['id'])}/advisories.json"
+        return await self._make_request(aiohttp.hdrs.METH_GET, path)
+
+
+def attached_bug_ids(advisory: Dict) -> List[Union[int, str]]:
+    """ Bugzilla bug IDs and JIRA keys attached to an advisory
+    :param advisory: the response of AsyncErrataAPI.get_advisory
+    """
+    bug_ids: List[Union[int, str]] = [int(b["bug"]["id"]) for b in advisory["bugs"]["bugs"]]
+    bug_ids.extend(i["jira_issue"]["key"] for i in advisory["jira_issues"]["jira_issues"])
+    return bug_ids
+
+
+@dataclass
+class BugAttachResult:
+    """ Outcome of AsyncErrataUtils.attach_bugs """
+    attached: List[Union[int, str]] = field(default_factory=list)
+    already_attached: List[Union[int, str]] = field(default_factory=list)
+    # bugs Errata refused, e.g. because they are filed in another advisory
+    rejected: List[Union[int, str]] = field(default_factory=list)
+
+
+class AdvisoryBugIndex:
+    """ An index of bugs attached to a known set of advisories.
+
+    Looking up which advisories a bug is attached to takes one Errata request per bug.
+    When the advisories of interest are known beforehand (e.g. the open advisories of a group),
+    it is much cheaper to fetch the bug list of each advisory once (one request per advisory)
+    and answer "is this bug attached" with a dictionary lookup.
+    Bugzilla bugs are keyed by int ID, JIRA issues by key.
+
+    An index is complete when it holds every open advisory a bug of interest can be attached to,
+    so that a bug missing from it is known not to be attached to an open advisory.
+    """
+    # advisories fetched at a time while building the index
+    FETCH_CONCURRENCY = 16
+
+    def __init__(self, advisory_bugs: Dict[int, Iterable[Union[int, str]]], complete: bool = False):
+        """
+        :param advisory_bugs: a dict mapping advisory IDs to bug IDs / JIRA keys attached to them
+        :param complete: whether the advisories are all the open advisories bugs of interest can be attached to
+        """
+        self.advisory_ids = set(advisory_bugs.keys())
+        self.complete = complete
+        self._bug_advisories: Dict[Union[int, str], Set[int]] = {}
+        for advisory_id, bug_ids in advisory_bugs.items():
+            for bug_id in bug_ids:
+                self._bug_advisories.setdefault(bug_id, set()).add(advisory_id)
+
+    @classmethod
+    async def build(cls, api: AsyncErrataAPI, advisory_ids: Iterable[int], complete: bool = False) \
+            -> "AdvisoryBugIndex":
+        advisory_ids = sorted(set(advisory_ids))
+        _LOGGER.info("Indexing bugs attached to advisories %s", advisory_ids)
+        semaphore = asyncio.Semaphore(cls.FETCH_CONCURRENCY)
+
+        async def _get_advisory(advisory_id):
+            async with semaphore:
+                return await api.get_advisory(advisory_id)
+
+        advisories = await asyncio.gather(*[_get_advisory(advisory_id) for advisory_id in advisory_ids])
+        return cls({advisory_id: attached_bug_ids(advisory) for advisory_id, advisory in zip(advisory_ids, advisories)},
+                   complete=complete)
+
+    @classmethod
+    async def build_for_release(cls, api: AsyncErrataAPI, release_name: str,
+                                advisory_ids: Iterable[int] = ()) -> "AdvisoryBugIndex":
+        """ Build a complete index of the open advisories of an Errata release, and the given advisories if any """
+        release_advisories = await api.get_advisories_for_release(release_name)
+        open_advisory_ids = {advisory["id"] for advisory in release_advisories
+                             if advisory["status"] not in constants.errata_inactive_advisory_labels}
+        _LOGGER.info("Errata release %s has %s open advisories", release_name, len(open_advisory_ids))
+        return await cls.build(api, open_advisory_ids | set(advisory_ids), complete=True)
+
+    def __contains__(self, bug_id):
+        return bug_id in self._bug_advisories
+
+    def __len__(self):
+        return len(self._bug_advisories)
+
+    def advisories_for(self, bug_id: Union[int, str]) -> Set[int]:
+        """ Returns IDs of indexed advisories the given bug is attached to """
+        return set(self._bug_advisories.get(bug_id, set()))
+
 
 class AsyncErrataUtils:
     @classmethod
@@ -278,3 +396,97 @@ class AsyncErrataUtils:
 
         await asyncio.gather(*futures)
         _LOGGER.info("Reconciled CVE package exclusions for advisory %s", advisory_id)
+
+    @classmethod
+    async def attach_bugs(cls, api: AsyncErrataAPI, advisory_id: int, bug_ids: Iterable[Union[int, str]],
+                          chunk_size: int = constants.BUG_ATTACH_CHUNK_SIZE, dry_run=False) -> BugAttachResult:
+        """ Attach Bugzilla bugs and/or JIRA issues to an advisory, chunk_size at a time.
+
+        Each update replaces the whole bug list of the advisory, so the chunks are sent one after another,
+        and the caller must not attach bugs to the same advisory concurrently; different advisories are fine.
+        When Errata refuses bugs in a chunk (e.g. because they are filed already in another advisory),
+        the chunk is split in halves until the bugs it refuses are found,
+        so that a few bad bugs take a few requests each rather than one request per bug in the chunk.
+        The other bugs are still attached.
+        :param bug_ids: Bugzilla bug IDs (int) and JIRA keys
+        :raises ClientResponseError: if Errata fails for a reason other than refused bugs,
+            e.g. a server error or missing permissions
+        """
+        current = attached_bug_ids(await api.get_advisory(advisory_id))
+        attached = set(current)
+        result = BugAttachResult()
+        new_bugs = []
+        for bug_id in dict.fromkeys(bug_ids):
+            (result.already_attached if bug_id in attached else new_bugs).append(bug_id)
+        _LOGGER.info("Attaching %s new bugs to advisory %s (%s already attached)",
+                     len(new_bugs), advisory_id, len(result.already_attached))
+        if dry_run:
+            _LOGGER.warning("[DRY RUN] Would have attached bugs to advisory %s: %s", advisory_id, new_bugs)
+            return result
+
+        async def _attach(chunk_of_bugs):
+            try:
+                await api.set_bugs(advisory_id, current + result.attached + chunk_of_bugs)
+            except ClientResponseError as e:
+                # only split the chunk if Errata refused bugs in it; for any other error it wouldn't help
+                if e.status >= 500 or not _REFUSED_BUG_PATTERN.search(e.message):
+                    raise
+                error = e
+            else:
+                result.attached.extend(chunk_of_bugs)
+                return
+            if len(chunk_of_bugs) == 1:
+                _LOGGER.warning("Errata refused to attach bug %s to advisory %s: %s",
+                                chunk_of_bugs[0], advisory_id, error.message)
+                result.rejected.append(chunk_of_bugs[0])
+                return
+            middle = len(chunk_of_bugs) // 2
+            await _attach(chunk_of_bugs[:middle])
+            await _attach(chunk_of_bugs[middle:])
+
+        for chunk_of_bugs in util.chunk(new_bugs, chunk_size):
+            await _attach(chunk_of_bugs)
+        _LOGGER.info("Attached %s bugs to advisory %s", len(result.attached), advisory_id)
+        if result.rejected:
+            _LOGGER.warning("Errata refused %s bugs for advisory %s: %s", len(result.rejected), advisory_id,
+                            result.rejected)
+        return result
+
+    @classmethod
+    async def wait_for_builds_signed(cls, api: AsyncErrataAPI, builds: Iterable[str], timeout: float,
+                                     initial_delay: float = 10, max_delay: float = 300,
+                                     on_signed: Optional[Callable[[str], None]] = None):
+        """ Poll Errata until all given builds have their RPMs signed.
+        Only builds that are still unsigned are checked again in the next round.
+        The delay between rounds doubles (with jitter) from initial_delay up to max_delay.
+        :param api: Errata API
+        :param builds: build NVRs
+        :param timeout: seconds to wait for all builds to be signed. 0 means to check only once.
+        :param on_signed: callback called with the NVR of each build once it is seen signed
+        :raises BuildSigningTimeoutError: if some builds are still unsigned when the timeout expires
+        """
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout
+        unsigned = list(dict.fromkeys(builds))
+        delay = initial_delay
+        while True:
+            results = await asyncio.gather(*[api.get_build(build) for build in unsigned])
+            still_unsigned = []
+            for build, info in zip(unsigned, results):
+                if info["rpms_signed"]:
+                    if on_signed:
+                        on_signed(build)
+                else:
+                    still_unsigned.append(build)
+            unsigned = still_unsigned
+            if not unsigned:
+                return
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise BuildSigningTimeoutError(f"{len(unsigned)} build(s) not signed within {timeout} seconds: "
+                                               f"{', '.join(unsigned)}", unsigned)
+            # sleep no longer than the time left, so that the last check happens right at the deadline
+            wait = min(random.uniform(delay / 2, delay), remaining)
+            _LOGGER.info("%s build(s) not signed yet. Checking again in %.0f seconds", len(unsigned), wait)
+            await asyncio.sleep(wait)
+            delay = min(delay * 2, max_delay)
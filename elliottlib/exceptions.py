@@ -31,3 +31,10 @@ class ErrataToolError(Exception):
 class BugzillaFatalError(Exception):
     """A broad exception for errors during Bugzilla API call"""
     pass
+
+
+class BuildSigningTimeoutError(Exception):
+    """Builds attached to an advisory were not all signed before the deadline"""
+    def __init__(self, message, unsigned_builds):
+        super().__init__(message)
+        self.unsigned_builds = unsigned_builds
@@ -0,0 +1,72 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+
+class LookupCache:
+    """ Local SQLite store of data looked up in other services, such as CVE data, kept for a limited time.
+
+    Entries are keyed by a name, telling what kind of data they hold (e.g. "hydra:cve"), and a key within that name.
+    Each entry expires after the time to live it was stored with; expired entries are dropped on open.
+    Unlike the bug cache, nothing here needs to be synced: an entry is either fresh enough to use, or looked up again.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # lookups are cached from several threads at once; access is serialized with a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""CREATE TABLE IF NOT EXISTS lookups (
+                name TEXT NOT NULL, key TEXT NOT NULL, expires_at REAL NOT NULL, value TEXT NOT NULL,
+                PRIMARY KEY (name, key))""")
+            self._conn.execute("DELETE FROM lookups WHERE expires_at <= ?", (time.time(),))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get(self, name: str, key: str) -> Optional[Any]:
+        """ Get a stored value
+        :return: the value, or None if it isn't stored or has expired
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM lookups WHERE name = ? AND key = ? AND expires_at > ?",
+                                     (name, str(key), time.time())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_many(self, name: str, keys: Iterable[str]) -> Dict[str, Any]:
+        """ Get stored values by key
+        :return: a dict of key -> value, for the keys stored and not expired
+        """
+        keys = [str(k) for k in keys]
+        now = time.time()
+        rows = []
+        with self._lock:
+            # stay below SQLite's limit on the number of host parameters
+            for i in range(0, len(keys), 500):
+                batch = keys[i:i + 500]
+                rows.extend(self._conn.execute(
+                    f"SELECT key, value FROM lookups WHERE name = ? AND expires_at > ? "
+                    f"AND key IN ({','.join('?' * len(batch))})", [name, now, *batch]).fetchall())
+        return {key: json.loads(value) for key, value in rows}
+
+    def put(self, name: str, key: str, value: Any, ttl: float):
+        """ Store a value for ttl seconds """
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO lookups (name, key, expires_at, value) VALUES (?, ?, ?, ?)",
+                               (name, str(key), time.time() + ttl, json.dumps(value)))
+
+    def put_many(self, name: str, values: Dict[str, Any], ttl: float):
+        """ Store values by key for ttl seconds """
+        expires_at = time.time() + ttl
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO lookups (name, key, expires_at, value) VALUES (?, ?, ?, ?)",
+                [(name, str(key), expires_at, json.dumps(value)) for key, value in values.items()])
@@ -1,27 +1,57 @@
 import asyncio
-import itertools
+import logging
 from typing import Iterable, Optional
 from urllib.parse import urlparse
 
-from aiohttp import ClientSession
+from aiohttp import ClientResponseError, ClientSession, ServerDisconnectedError, TCPConnector
+from tenacity import before_sleep_log, retry, retry_if_exception, stop_after_attempt, wait_exponential
 
-from elliottlib import constants
+from elliottlib import constants, logutil
+from elliottlib.util import chunk
+
+_LOGGER = logutil.getLogger(__name__)
+
+
+def _is_retryable(error: BaseException):
+    """ Server errors and dropped connections are worth retrying; client errors are not """
+    if isinstance(error, ClientResponseError):
+        return error.status >= 500
+    return isinstance(error, ServerDisconnectedError)
 
 
 class ResultsDBAPI:
-    def __init__(self, url: Optional[str] = None, session: Optional[ClientSession] = None):
-        self._url = url or constants.RESULTSDB_API_URL
-        parsed_url = urlparse(self._url)
-        self._session = session or ClientSession(f"{parsed_url.scheme}://{parsed_url.netloc}")
+    def __init__(self, url: Optional[str] = None, session: Optional[ClientSession] = None, concurrency: int = 8):
+        """
+        :param url: ResultsDB API URL
+        :param session: aiohttp session to send requests with, left open by close(). If not given, one is created with
+        at most `concurrency` connections, and closed by close().
+        :param concurrency: maximum number of requests get_latest_results sends at a time
+        """
+        parsed_url = urlparse(url or constants.RESULTSDB_API_URL)
+        self._url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+        self._concurrency = concurrency
+        self._own_session = session is None
+        self._session = session or ClientSession(connector=TCPConnector(limit=concurrency))
 
     async def close(self):
-        await self._session.close()
+        if self._own_session:
+            await self._session.close()
+
+    @retry(reraise=True, stop=stop_after_attempt(5), wait=wait_exponential(multiplier=1, min=1, max=10),
+           retry=retry_if_exception(_is_retryable), before_sleep=before_sleep_log(_LOGGER, logging.WARNING))
+    async def _get_latest_results_batch(self, params: dict):
+        async with self._session.get(f"{self._url}/api/v2.0/results/latest", params=params) as response:
+            response.raise_for_status()
+            batch_results = await response.json()
+        return batch_results.get("data", [])
 
     async def get_latest_results(self, test_cases: Iterable[str], items: Iterable[str], batch_size: int = 50):
         """ Get latest test results from ResultsDB
         It takes filter parameters, and returns the most recent result for all the relevant Testcases. Only Testcases with at least one Result that meet the filter are present
         https://resultsdb20.docs.apiary.io/#reference/0/results/get-a-list-of-latest-results-for-a-specified-filter
 
+        Items are looked up in batches of `batch_size`, sent concurrently; results are returned in the order of the batches.
+
         # an example CVP test result for ose-insights-operator-container-v4.5.0-202007240519.p0:
         # https://resultsdb-api.engineering.redhat.com/api/v2.0/results/latest?testcases=cvp.rhproduct.default.sanity&item=ose-insights-operator-container-v4.5.0-202007240519.p0
         """
@@ -31,15 +61,11 @@ class ResultsDBAPI:
         }
         if test_cases:
             params["testcases"] = ",".join(test_cases)
-        it = iter(items)
-        url = "/api/v2.0/results/latest"
-        results = []
-        while True:
-            chunk = list(itertools.islice(it, batch_size))
-            if not chunk:
-                return results
-            params["item"] = ",".join(map(str, chunk))
-            async with self._session.get(url, params=params) as response:
-                response.raise_for_status()
-                batch_results = await response.json()
-                results.extend(batch_results.get("data", []))
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def _get_batch(batch):
+            async with semaphore:
+                return await self._get_latest_results_batch({**params, "item": ",".join(map(str, batch))})
+
+        batch_results = await asyncio.gather(*[_get_batch(batch) for batch in chunk(list(items), batch_size)])
+        return [r for results in batch_results for r in results]
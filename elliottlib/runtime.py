@@ -18,6 +18,8 @@ from elliottlib.exceptions import ElliottFatalError
 from elliottlib.imagecfg import ImageMetadata
 from elliottlib.model import Missing, Model
 from elliottlib.rpmcfg import RPMMetadata
+from elliottlib.bug_cache import BugCache
+from elliottlib.lookup_cache import LookupCache
 from elliottlib.bzutil import BugTracker, BugzillaBugTracker, JIRABugTracker
 
 
@@ -55,6 +57,10 @@ class Runtime(object):
         if str(os.environ.get('USEJIRA')).lower() in ["false", "0"]:
             self.use_jira = False
         self._bug_trackers = {}
+        self.bug_cache_path: Optional[str] = None
+        self.no_bug_cache = False
+        self._bug_cache: Optional[BugCache] = None
+        self._lookup_cache: Optional[LookupCache] = None
         self.brew_event: Optional[int] = None
         self.assembly: Optional[str] = 'stream'
         self.assembly_basis_event: Optional[int] = None
@@ -291,9 +297,28 @@ class Runtime(object):
             bug_tracker_cls = BugzillaBugTracker
         elif bug_tracker_type == 'jira':
             bug_tracker_cls = JIRABugTracker
-        self._bug_trackers[bug_tracker_type] = bug_tracker_cls(bug_tracker_cls.get_config(self))
+        self._bug_trackers[bug_tracker_type] = bug_tracker_cls(bug_tracker_cls.get_config(self),
+                                                               bug_cache=self.get_bug_cache())
         return self._bug_trackers[bug_tracker_type]
 
+    def get_bug_cache(self) -> Optional[BugCache]:
+        """ The local bug cache, if a path was given and it wasn't disabled with --no-bug-cache """
+        if self.no_bug_cache or not self.bug_cache_path:
+            return None
+        with self.mutex:
+            if not self._bug_cache:
+                self._bug_cache = BugCache(self.bug_cache_path)
+        return self._bug_cache
+
+    def get_lookup_cache(self) -> LookupCache:
+        """ The cache of data looked up in other services, e.g. CVE data, in the working directory.
+        It's kept between runs if a working directory is given, like the rest of the working directory.
+        """
+        with self.mutex:
+            if not self._lookup_cache:
+                self._lookup_cache = LookupCache(os.path.join(self.working_dir, "lookups.db"))
+        return self._lookup_cache
+
     @property
     def remove_tmp_working_dir(self):
         """
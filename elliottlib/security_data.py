@@ -0,0 +1,101 @@
+import asyncio
+import base64
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import quote, urlparse
+
+import aiohttp
+import gssapi
+from aiohttp import ClientTimeout
+
+from elliottlib import exectools, logutil
+from elliottlib.lookup_cache import LookupCache
+
+_LOGGER = logutil.getLogger(__name__)
+
+HYDRA_URL = "https://access.redhat.com/hydra/rest/securitydata"
+PYXIS_URL = "https://pyxis.engineering.redhat.com/v1"
+
+
+class AsyncSecurityDataAPI:
+    """ Looks up CVE data in the Hydra security data API, and the Brew packages of image repositories in Pyxis.
+
+    Each result is looked up once for the life of the object, however many flaws ask for it.
+    If a lookup cache is given, results are also kept there for CACHE_TTL seconds,
+    so that later runs don't need to look them up again.
+    """
+
+    # CVE data rarely changes within hours
+    CACHE_TTL = 6 * 3600
+
+    def __init__(self, hydra_url: str = HYDRA_URL, pyxis_url: str = PYXIS_URL,
+                 lookup_cache: Optional[LookupCache] = None, concurrency: int = 16):
+        self._hydra_url = hydra_url.rstrip("/")
+        self._pyxis_url = pyxis_url.rstrip("/")
+        self._lookup_cache = lookup_cache
+        self._pyxis_gssapi_name = gssapi.Name(f"HTTP@{urlparse(self._pyxis_url).hostname}",
+                                              gssapi.NameType.hostbased_service)
+        self._gssapi_flags = [gssapi.RequirementFlag.out_of_sequence_detection]
+        self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency),
+                                              timeout=ClientTimeout(total=60 * 5))
+        # (name, key) -> task looking it up; concurrent lookups of the same key share a request
+        self._lookups: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    async def close(self):
+        await self._session.close()
+
+    def _pyxis_auth_header(self):
+        client_ctx = gssapi.SecurityContext(name=self._pyxis_gssapi_name, usage='initiate', flags=self._gssapi_flags)
+        out_token = client_ctx.step(b"")
+        return f'Negotiate {base64.b64encode(out_token).decode()}'
+
+    async def _lookup(self, name: str, key: str, fetch: Callable[[], Awaitable[Optional[Dict]]]) -> Optional[Dict]:
+        if (name, key) not in self._lookups:
+            self._lookups[(name, key)] = asyncio.ensure_future(self._cached_fetch(name, key, fetch))
+        return await self._lookups[(name, key)]
+
+    async def _cached_fetch(self, name: str, key: str, fetch: Callable[[], Awaitable[Optional[Dict]]]) \
+            -> Optional[Dict]:
+        if self._lookup_cache:
+            cached = await exectools.to_thread(self._lookup_cache.get, name, key)
+            if cached is not None:
+                return cached
+        result = await fetch()
+        # None means the lookup failed; don't keep that
+        if self._lookup_cache and result is not None:
+            await exectools.to_thread(self._lookup_cache.put, name, key, result, self.CACHE_TTL)
+        return result
+
+    async def get_cve(self, alias: str) -> Dict:
+        """ Get the security data of a CVE, e.g. its package_state
+        :param alias: CVE ID, e.g. CVE-2023-1234
+        """
+        async def _fetch():
+            url = f"{self._hydra_url}/cve/{quote(alias)}.json"
+            async with self._session.get(url) as resp:
+                resp.raise_for_status()
+                return await resp.json()
+
+        return await self._lookup("hydra:cve", alias, _fetch)
+
+    async def get_brew_package(self, repository: str) -> Optional[str]:
+        """ Get the Brew package of the images in a container delivery repository
+        :param repository: repository name, e.g. openshift4/ose-cli
+        :return: Brew package name, or None if it couldn't be found
+        """
+        async def _fetch():
+            url = f"{self._pyxis_url}/repositories/registry/registry.access.redhat.com/repository/" \
+                  f"{quote(repository)}/images"
+            params = {"page_size": "1", "include": "data.brew"}
+            headers = {"Authorization": self._pyxis_auth_header()}
+            async with self._session.get(url, params=params, headers=headers) as resp:
+                if resp.status != 200:
+                    _LOGGER.warning(f'got status={resp.status} for {url}')
+                    return None
+                data = (await resp.json())['data']
+            if not data:
+                _LOGGER.warning(f'could not find brew package info at {url}')
+                return {"package": None}
+            return {"package": data[0]['brew']['package']}
+
+        result = await self._lookup("pyxis:package", repository, _fetch)
+        return result["package"] if result else None
@@ -4,10 +4,9 @@ from io import BytesIO
 import collections
 import tarfile
 import pygit2
-import errata_tool
 import koji
 import logging
-from . import constants
+from . import constants, errata
 from future.standard_library import install_aliases
 install_aliases()
 from urllib.parse import urldefrag
@@ -25,9 +24,7 @@ BuildWithProductVersion = collections.namedtuple(
 def find_builds_from_advisory(advisory_number, components):
     """ Returns a filtered list of builds attached to advisories
 
-    NOTE: This function fetches the advisory info and attached builds using `errata_tool.Erratum()` Python API,
-    which is pretty SLOW because it iterates over builds for signature checking but doesn't have an option to disable.
-    Note that API cannot be called concurrently due to a race condition in its API implementation (instances of errata_tool.Erratum share class variables).
+    NOTE: This function uses `errata.AdvisoryInfo`, which is safe to call concurrently.
 
     :param advisory_number: an advisory number
     :param components: list of Koji/Brew components or NVRs to filter builds on the advisory
@@ -37,10 +34,10 @@ def find_builds_from_advisory(advisory_number, components):
     LOGGER.debug(
         "Fetching advisory {} from Errata Tool...".format(advisory_number))
 
-    advisory = errata_tool.Erratum(errata_id=advisory_number)
+    advisory = errata.AdvisoryInfo.fetch(advisory_number)
     LOGGER.info("Got info for advisory {} - {} - {}: {} - {}".format(advisory_number, advisory.errata_state,
                                                                      advisory.errata_name, advisory.synopsis, advisory.url()))
-    flattened_builds = [BuildWithProductVersion(nvr, advisory._product, product_version) for product_version,
+    flattened_builds = [BuildWithProductVersion(nvr, advisory.product, product_version) for product_version,
                         nvrs in advisory.errata_builds.items() for nvr in nvrs]
 
     def matches_components(build):
@@ -1,10 +1,14 @@
 import unittest
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import ANY, AsyncMock, Mock, patch
+
+from click.testing import CliRunner
 
 from elliottlib.bzutil import BugzillaBug
 from elliottlib import constants
 from elliottlib.cli import attach_cve_flaws_cli
+from elliottlib.cli.common import cli
 from elliottlib.errata_async import AsyncErrataAPI
+from elliottlib.runtime import Runtime
 
 
 class TestAttachCVEFlawsCLI(unittest.IsolatedAsyncioTestCase):
@@ -111,6 +115,56 @@ class TestAttachCVEFlawsCLI(unittest.IsolatedAsyncioTestCase):
             dry_run=False)
         self.assertEqual(actual, None)
 
+    @patch("elliottlib.cli.attach_cve_flaws_cli.associate_builds_with_cves", new_callable=AsyncMock)
+    @patch("elliottlib.cli.attach_cve_flaws_cli._update_advisory")
+    @patch("elliottlib.cli.attach_cve_flaws_cli.get_flaws", new_callable=AsyncMock)
+    @patch("elliottlib.cli.attach_cve_flaws_cli.get_attached_trackers")
+    @patch("elliottlib.cli.attach_cve_flaws_cli.Erratum")
+    @patch("elliottlib.cli.attach_cve_flaws_cli.AsyncSecurityDataAPI")
+    @patch("elliottlib.cli.attach_cve_flaws_cli.AsyncErrataAPI")
+    def test_attach_cve_flaws_into_default_advisories(self, errata_api, security_data_api, erratum,
+                                                      get_attached_trackers, get_flaws, update_advisory, associate):
+        def _initialize(runtime, **kwargs):
+            runtime.group_config = Mock(advisories={"image": 1, "rpm": 2, "extras": 3})
+            runtime.logger = Mock()
+
+        def _erratum(errata_id):
+            if errata_id == 1:
+                raise IOError("Errata is down")
+            return Mock(errata_id=errata_id)
+
+        jira, bugzilla = Mock(type="jira"), Mock(type="bugzilla")
+        trackers = {
+            2: [Mock(id=11, corresponding_flaw_bug_ids=[101, 102])],
+            3: [Mock(id=12, corresponding_flaw_bug_ids=[102, 103])],
+        }
+        flaws = {i: Mock(id=i) for i in [101, 102, 103]}
+        bugzilla.get_flaw_bugs.side_effect = lambda ids: [flaws[i] for i in ids]
+        erratum.side_effect = _erratum
+        get_attached_trackers.side_effect = \
+            lambda advisory, bug_tracker, logger: trackers[advisory.errata_id] if bug_tracker is bugzilla else []
+        get_flaws.side_effect = lambda flaw_bug_tracker, tracker_bugs, brew_api, logger, flaw_bugs, security_data_api: \
+            ({t.id: t.corresponding_flaw_bug_ids for t in tracker_bugs}, flaw_bugs)
+        security_data_api.return_value.close = AsyncMock()
+        errata_api.return_value.close = AsyncMock()
+
+        with patch.object(Runtime, "initialize", autospec=True, side_effect=_initialize), \
+                patch.object(Runtime, "get_bug_tracker", side_effect={"jira": jira, "bugzilla": bugzilla}.get), \
+                patch.object(Runtime, "get_errata_config", return_value={}), \
+                patch.object(Runtime, "get_lookup_cache", return_value=None), \
+                patch.object(Runtime, "build_retrying_koji_client"):
+            result = CliRunner().invoke(cli, ['-g', 'openshift-4.6', 'attach-cve-flaws', '--into-default-advisories'])
+
+        # advisory 1 failed, the others were still updated, one at a time in input order
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual([call.args[1].errata_id for call in update_advisory.call_args_list], [2, 3])
+        self.assertEqual(associate.await_count, 2)
+        # the flaws of both advisories were fetched at once, and shared between them
+        bugzilla.get_flaw_bugs.assert_called_once_with([101, 102, 103])
+        update_advisory.assert_any_call(ANY, ANY, [flaws[101], flaws[102]], bugzilla, False)
+        update_advisory.assert_any_call(ANY, ANY, [flaws[102], flaws[103]], bugzilla, False)
+        security_data_api.return_value.close.assert_awaited_once()
+
 
 if __name__ == '__main__':
     unittest.main()
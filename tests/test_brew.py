@@ -274,6 +274,25 @@ class TestBrew(unittest.TestCase):
         actual = brew.get_latest_builds(tag_component_tuples, fake_session)
         self.assertListEqual(actual, expected)
 
+    def test_get_package_ids(self):
+        package_ids = {"foo": 1, "bar": 2, "nope": None}
+
+        def fake_get_package_id(name):
+            return mock.MagicMock(result=package_ids[name])
+
+        fake_session = mock.MagicMock()
+        fake_context_manager = fake_session.multicall.return_value.__enter__.return_value
+        fake_context_manager.getPackageID.side_effect = fake_get_package_id
+        with mock.patch.dict(brew._package_id_cache, clear=True):
+            actual = brew.get_package_ids(["foo", "bar", "nope", "foo"], fake_session)
+            self.assertEqual(actual, package_ids)
+            self.assertEqual(fake_context_manager.getPackageID.call_count, 3)
+
+            # known names, including ones that were not found, are not looked up again
+            actual = brew.get_package_ids(["foo", "nope"], fake_session)
+            self.assertEqual(actual, {"foo": 1, "nope": None})
+            self.assertEqual(fake_session.multicall.call_count, 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,209 @@
+import os
+import re
+import tempfile
+import time
+import unittest
+import xmlrpc.client
+
+import bugzilla
+from flexmock import flexmock
+from jira import Issue
+
+from elliottlib import bzutil
+from elliottlib.bug_cache import BugCache
+from elliottlib.bzutil import BugzillaBugTracker, JIRABugTracker
+
+JIRA_OPTIONS = {"server": "https://issues.example.com", "rest_path": "api", "rest_api_version": "2",
+                "agile_rest_path": "agile", "headers": {}}
+
+
+def jira_issue(key, status="New"):
+    return Issue(JIRA_OPTIONS, None, raw={"key": key, "fields": {"status": {"name": status}}})
+
+
+class TestBugCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "bugs.db")
+        self.cache = BugCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp_dir.cleanup()
+
+    def test_bugs(self):
+        self.cache.put_bugs("jira", {"OCPBUGS-1": {"key": "OCPBUGS-1"}, "OCPBUGS-2": {"key": "OCPBUGS-2"}}, 10)
+        self.cache.put_bugs("bugzilla", {"1": {"id": 1}}, 10)
+        self.cache.touch_bugs("jira", ["OCPBUGS-2"], 20)
+        actual = self.cache.get_bugs("jira", ["OCPBUGS-1", "OCPBUGS-2", "OCPBUGS-3", "1"])
+        self.assertEqual(actual, {"OCPBUGS-1": (10, {"key": "OCPBUGS-1"}), "OCPBUGS-2": (20, {"key": "OCPBUGS-2"})})
+        self.assertEqual(self.cache.get_bugs("bugzilla", [1]), {"1": (10, {"id": 1})})
+
+    def test_queries(self):
+        self.assertIsNone(self.cache.get_query("jira", "project=OCPBUGS"))
+        self.cache.put_query("jira", "project=OCPBUGS", ["OCPBUGS-1"], time.time())
+        self.cache.put_query("jira", "project=OLD", ["OCPBUGS-2"], time.time() - BugCache.QUERY_TTL - 1)
+        self.cache.close()
+
+        # stale queries are dropped when the cache is opened again
+        self.cache = BugCache(self.path)
+        self.assertEqual(self.cache.get_query("jira", "project=OCPBUGS")[1], ["OCPBUGS-1"])
+        self.assertIsNone(self.cache.get_query("jira", "project=OLD"))
+
+
+class TestJIRABugCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = BugCache(os.path.join(self.tmp_dir.name, "bugs.db"))
+        flexmock(JIRABugTracker).should_receive("login").and_return(None)
+        self.jira = JIRABugTracker({"project": "OCPBUGS"}, bug_cache=self.cache)
+        self.jira._client = flexmock(_options=JIRA_OPTIONS, _session=None)
+        # fake server state: issue key -> status; and which issues were updated since the last sync
+        self.issues = {f"OCPBUGS-{i}": "New" for i in range(1, 6)}
+        self.updated = set()
+        self.queries = []
+        # whether a project-wide search of changed issues would take too many pages
+        self.busy_project = False
+
+        def _search_issues(query, verbose=False, fields=None, max_pages=None):
+            self.queries.append(query)
+            if max_pages is not None and self.busy_project:
+                return None
+            keys = self.issues
+            match = re.search(r"issue in \(([^)]*)\)", query)
+            if match:
+                keys = match.group(1).split(",")
+            if "status" in query:
+                keys = [k for k in keys if self.issues[k] == "New"]
+            if "updated >= -" in query:
+                keys = [k for k in keys if k in self.updated]
+            return [jira_issue(k, self.issues[k]) for k in keys]
+
+        self.jira._search_issues = _search_issues
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp_dir.cleanup()
+
+    def test_search(self):
+        query = 'project=OCPBUGS and status in ("New")'
+        actual = self.jira._search(query)
+        self.assertEqual(sorted(b.id for b in actual), sorted(self.issues))
+        self.assertEqual(self.queries, [query])
+
+        # OCPBUGS-1 moves out of the query, OCPBUGS-2 is updated, OCPBUGS-6 is new
+        self.issues["OCPBUGS-1"] = "Closed"
+        self.issues["OCPBUGS-6"] = "New"
+        self.updated = {"OCPBUGS-1", "OCPBUGS-2", "OCPBUGS-6"}
+        self.queries.clear()
+        actual = self.jira._search(query)
+        self.assertEqual(sorted(b.id for b in actual), [f"OCPBUGS-{i}" for i in range(2, 7)])
+        self.assertTrue(all(b.status == "New" for b in actual))
+        self.assertEqual(len(self.queries), 2)
+        self.assertTrue(self.queries[0].startswith(f"({query}) and updated >= -"))
+        self.assertIn("issue in (OCPBUGS-1,OCPBUGS-3,OCPBUGS-4,OCPBUGS-5)", self.queries[1])
+
+    def test_search_with_fields_is_not_cached(self):
+        self.jira._search("project=OCPBUGS", fields=["summary"])
+        self.jira._search("project=OCPBUGS", fields=["summary"])
+        self.assertEqual(self.queries, ["project=OCPBUGS", "project=OCPBUGS"])
+
+    def test_get_bugs(self):
+        actual = self.jira.get_bugs(["OCPBUGS-2", "OCPBUGS-1"])
+        self.assertEqual([b.id for b in actual], ["OCPBUGS-2", "OCPBUGS-1"])
+
+        self.issues["OCPBUGS-1"] = "Closed"
+        self.updated = {"OCPBUGS-1"}
+        self.queries.clear()
+        actual = self.jira.get_bugs(["OCPBUGS-3", "OCPBUGS-2", "OCPBUGS-1"])
+        self.assertEqual([(b.id, b.status) for b in actual],
+                         [("OCPBUGS-3", "New"), ("OCPBUGS-2", "New"), ("OCPBUGS-1", "Closed")])
+        # one query to find changed bugs among the cached ones, one to fetch the changed and missing bugs
+        self.assertEqual(len(self.queries), 2)
+        self.assertIn("issue in (OCPBUGS-2,OCPBUGS-1) and updated >= -", self.queries[0])
+        self.assertIn("issue in (OCPBUGS-3,OCPBUGS-1)", self.queries[1])
+
+    def test_get_changed_bug_ids(self):
+        self.updated = {"OCPBUGS-2", "OCPBUGS-5"}
+        bug_ids = [f"OCPBUGS-{i}" for i in range(1, 121)]
+        actual = self.jira.get_changed_bug_ids(bug_ids, time.time() - 3600)
+        self.assertEqual(actual, {"OCPBUGS-2", "OCPBUGS-5"})
+        # few issues of the project changed; listing them is cheaper than asking about the bugs
+        self.assertEqual(len(self.queries), 1)
+        self.assertTrue(self.queries[0].startswith("project=OCPBUGS and updated >= -"))
+
+        # too many did; the bugs are asked about JIRA_BUG_BATCH_SIZE at a time instead
+        self.busy_project = True
+        self.queries.clear()
+        actual = self.jira.get_changed_bug_ids(bug_ids, time.time() - 3600)
+        self.assertEqual(actual, {"OCPBUGS-2", "OCPBUGS-5"})
+        self.assertEqual(len(self.queries), 4)
+        self.assertTrue(all("issue in (" in q and "updated >= -" in q for q in self.queries[1:]))
+
+
+class TestBugzillaBugCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = BugCache(os.path.join(self.tmp_dir.name, "bugs.db"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp_dir.cleanup()
+
+    def test_search(self):
+        flexmock(BugzillaBugTracker).should_receive("login").and_return(bugzilla.Bugzilla(url=None))
+        bz = BugzillaBugTracker({}, bug_cache=self.cache)
+        query = flexmock(fields=["id", "status"])
+        query.should_receive("__str__").and_return("https://bugzilla.example.com/buglist.cgi?product=OCP")
+
+        def bug(bug_id, status):
+            return flexmock(id=bug_id, get_raw_data=lambda: {"id": bug_id, "status": status})
+
+        flexmock(bzutil).should_receive("_perform_query").with_args(bz._client, query, changed_since=None) \
+            .and_return([bug(1, "NEW"), bug(2, "NEW")]).once()
+        actual = bz._search(query)
+        self.assertEqual(sorted((b.id, b.status) for b in actual), [(1, "NEW"), (2, "NEW")])
+
+        flexmock(bzutil).should_receive("_perform_query").with_args(bz._client, query, changed_since=float) \
+            .and_return([bug(2, "ASSIGNED")]).once()
+        flexmock(bz._client).should_receive("query").and_return([]).once()
+        actual = bz._search(query)
+        self.assertEqual(sorted((b.id, b.status) for b in actual), [(1, "NEW"), (2, "ASSIGNED")])
+
+    def test_status_changes(self):
+        history_requests = []
+        changed = set()
+
+        def bugs_history_raw(bug_ids):
+            history_requests.append(list(bug_ids))
+            return {"bugs": [{"id": b, "history": [
+                {"when": xmlrpc.client.DateTime("20230101T00:00:00"),
+                 "changes": [{"field_name": "cc", "removed": "", "added": "qe@example.com"}]},
+                {"when": xmlrpc.client.DateTime(f"2023010{1 + (b in changed)}T10:00:00"),
+                 "changes": [{"field_name": "status", "removed": "NEW", "added": "MODIFIED"}]},
+            ]} for b in bug_ids]}
+
+        def bz_tracker():
+            client = bugzilla.Bugzilla(url=None)
+            flexmock(client).should_receive("bugs_history_raw").replace_with(bugs_history_raw)
+            flexmock(client).should_receive("query").replace_with(
+                lambda query: [flexmock(id=b) for b in query["id"] if b in changed])
+            flexmock(BugzillaBugTracker).should_receive("login").and_return(client)
+            return BugzillaBugTracker({}, bug_cache=self.cache)
+
+        bug_ids = list(range(1, 251))
+        actual = bz_tracker()._get_status_changes(bug_ids)
+        self.assertEqual(actual[1], [(1672567200.0, "NEW", "MODIFIED")])
+        self.assertEqual(sorted(len(ids) for ids in history_requests), [50, 100, 100])
+
+        # a later run only fetches the histories of bugs changed since
+        changed.add(5)
+        history_requests.clear()
+        actual = bz_tracker()._get_status_changes(bug_ids)
+        self.assertEqual(history_requests, [[5]])
+        self.assertEqual(actual[5], [(1672653600.0, "NEW", "MODIFIED")])
+        self.assertEqual(actual[6], [(1672567200.0, "NEW", "MODIFIED")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,22 @@
+import asyncio
+import dataclasses
 import logging
 import unittest
 import xmlrpc.client
 from datetime import datetime, timezone
 
 from unittest import mock
+from unittest.mock import patch
 import requests
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from flexmock import flexmock
+from jira import Issue
 
-from elliottlib import bzutil, constants, exceptions
+from elliottlib import brew, bzutil, constants, exceptions
 from elliottlib.bzutil import Bug, JIRABugTracker, BugzillaBugTracker, BugzillaBug, JIRABug, BugTracker
+from elliottlib.errata_async import AdvisoryBugIndex
+from elliottlib.security_data import AsyncSecurityDataAPI
 
 hostname = "bugzilla.redhat.com"
 
@@ -47,7 +55,9 @@ class TestBugTracker(unittest.TestCase):
             }
         )
         brew_api = flexmock()
-        brew_api.should_receive("getPackageID").and_return(True)
+        flexmock(brew).should_receive("get_package_ids").with_args({'component:foo', 'component:bar', 'component:foobar'},
+                                                                   brew_api).and_return(
+            {'component:foo': 1, 'component:bar': 2, 'component:foobar': 3}).once()
         actual = BugTracker.get_corresponding_flaw_bugs(tracker_bugs, BugzillaBugTracker({}), brew_api, strict=False)
         self.assertEqual(expected, actual)
 
@@ -68,12 +78,25 @@ class TestBugTracker(unittest.TestCase):
         flexmock(BugzillaBugTracker).should_receive("get_flaw_bugs").and_return(valid_flaw_bugs)
 
         brew_api = flexmock()
-        brew_api.should_receive("getPackageID").and_return(True)
+        flexmock(brew).should_receive("get_package_ids").and_return(
+            {'component:foo': 1, 'component:bar': 2, 'component:foobar': 3})
         self.assertRaises(
             exceptions.ElliottFatalError,
             BugTracker.get_corresponding_flaw_bugs, tracker_bugs, BugzillaBugTracker({}), brew_api, strict=True)
 
 
+class TestBugMemo(unittest.TestCase):
+    def test_get(self):
+        fetch = mock.Mock(side_effect=lambda ids: [mock.Mock(id=i) for i in ids if i != 2])
+        memo = bzutil.BugMemo(fetch)
+        with self.assertLogs(bzutil.logger, logging.WARNING) as logs:
+            self.assertEqual([b.id for b in memo.get([3, 1, 2, 1])], [3, 1])
+        self.assertIn("[2]", logs.output[0])
+        # bugs looked up before, found or not, are not fetched again
+        self.assertEqual([b.id for b in memo.get([2, 4, 3])], [4, 3])
+        self.assertEqual(fetch.call_args_list, [mock.call([3, 1, 2]), mock.call([4])])
+
+
 class TestJIRABugTracker(unittest.TestCase):
     def test_get_config(self):
         config = {'foo': 1, 'jira_config': {'bar': 2}}
@@ -99,6 +122,68 @@ class TestBugzillaBugTracker(unittest.TestCase):
 
 
 class TestJIRABug(unittest.TestCase):
+    def test_parse_issue(self):
+        issue = Issue({"server": "https://issues.redhat.com", "rest_path": "api", "rest_api_version": "2",
+                       "agile_rest_path": "agile", "headers": {}}, None, raw={
+            "key": "OCPBUGS-43",
+            "fields": {
+                "summary": "CVE-2023-1234 foo: bar [openshift-4.14]",
+                "status": {"name": "New"},
+                "labels": constants.TRACKER_BUG_KEYWORDS + ["pscomponent:foo-container", "flaw:bz#123"],
+                "components": [{"name": "Networking / ovn-kubernetes"}],
+                "project": {"key": "OCPBUGS"},
+                "security": {"name": "Red Hat Employee"},
+                "created": "2023-04-05T12:01:44.000+0000",
+                "issuelinks": [{"type": {"name": "Blocks"}, "inwardIssue": {"key": "OCPBUGS-42"}},
+                               {"type": {"name": "Blocks"}, "outwardIssue": {"key": "OCPBUGS-44"}},
+                               {"type": {"name": "Cloners"}, "outwardIssue": {"key": "OCPBUGS-45"}}],
+                JIRABugTracker.FIELD_TARGET_VERSION: [{"name": "4.14.z"}],
+                JIRABugTracker.FIELD_BLOCKED_BY_BZ: "https://bugzilla.redhat.com/show_bug.cgi?id=456",
+                JIRABugTracker.FIELD_RELEASE_BLOCKER: {"value": "Approved"},
+                JIRABugTracker.FIELD_SEVERITY: {"value": "<img src=\"/images/icons/priorities/high.svg\"> High"},
+            },
+        })
+        load_issue = mock.Mock(return_value=issue)
+        bug = JIRABug(issue, load_issue)
+
+        self.assertEqual((bug.id, bug.status, bug.product), ("OCPBUGS-43", "New", "OCPBUGS"))
+        self.assertEqual(bug.weburl, "https://issues.redhat.com/browse/OCPBUGS-43")
+        self.assertEqual((bug.component, bug.sub_component), ("Networking", "ovn-kubernetes"))
+        self.assertEqual(bug.target_release, ["4.14.z"])
+        self.assertEqual(bug.depends_on, ["OCPBUGS-42", 456])
+        self.assertEqual(bug.blocks, ["OCPBUGS-44"])
+        self.assertEqual((bug.release_blocker, bug.severity, bug.security_level), (True, "High", "Red Hat Employee"))
+        self.assertEqual(bug.creation_time_parsed(), datetime(2023, 4, 5, 12, 1, 44, tzinfo=timezone.utc))
+        self.assertEqual(bug.corresponding_flaw_bug_ids, [123])
+        self.assertTrue(bug.is_tracker_bug())
+
+        # compact and immutable; the issue itself is loaded again when asked for
+        self.assertFalse(hasattr(bug, "__dict__"))
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            bug._key = "OCPBUGS-1"
+        load_issue.assert_not_called()
+        self.assertIs(bug.bug, issue)
+        self.assertIs(bug.bug, issue)
+        load_issue.assert_called_once_with("OCPBUGS-43")
+
+        # lists handed out are copies
+        bug.keywords.append("foo")
+        bug.corresponding_flaw_bug_ids.append(1)
+        bug.depends_on.append(2)
+        self.assertNotIn("foo", bug.keywords)
+        self.assertEqual(bug.corresponding_flaw_bug_ids, [123])
+        self.assertEqual(bug.depends_on, ["OCPBUGS-42", 456])
+
+    def test_all_advisory_ids(self):
+        bug = JIRABug(flexmock(key="OCPBUGS-1", fields=flexmock()))
+        flexmock(bzutil).should_receive("ErrataJira").never()
+        self.assertEqual(bug.all_advisory_ids(AdvisoryBugIndex({2: ["OCPBUGS-1"], 1: ["OCPBUGS-1"]})), [1, 2])
+        self.assertEqual(bug.all_advisory_ids(AdvisoryBugIndex({1: ["OCPBUGS-2"]}, complete=True)), [])
+
+        flexmock(bzutil).should_receive("ErrataJira").with_args("OCPBUGS-1").and_return(
+            flexmock(all_advisory_ids=[3])).once()
+        self.assertEqual(bug.all_advisory_ids(AdvisoryBugIndex({1: ["OCPBUGS-2"]})), [3])
+
     def test_blocked_by_bz(self):
         bug_id = 123456
         bug = flexmock(key='OCPBUGS-1',
@@ -419,6 +504,58 @@ class TestBZUtil(unittest.IsolatedAsyncioTestCase):
     def tearDown(self):
         logging.disable(logging.NOTSET)
 
+    @mock.patch("elliottlib.bzutil.AsyncErrataAPI")
+    async def test_filter_attached_bugs_with_index(self, AsyncErrataAPI: mock.MagicMock):
+        api = AsyncErrataAPI.return_value
+        api.get_advisories_for_bug = mock.AsyncMock(side_effect=lambda bug_id: [{"id": 3}] if bug_id == 3 else [])
+        api.close = mock.AsyncMock()
+        with mock.patch("elliottlib.bzutil.BugzillaBugTracker.login"):
+            bug_tracker = BugzillaBugTracker({})
+        bugs = [flexmock(id=i) for i in range(1, 5)]
+        index = AdvisoryBugIndex({1: [1], 2: [2, 1]})
+
+        actual = await bug_tracker.filter_attached_bugs(bugs, advisory_bug_index=index)
+        self.assertEqual([1, 2, 3], [b.id for b in actual])
+        # only bugs missing from the index are looked up in Errata
+        self.assertEqual([mock.call(3), mock.call(4)], api.get_advisories_for_bug.await_args_list)
+
+    @mock.patch("elliottlib.bzutil.AsyncErrataAPI")
+    async def test_filter_attached_bugs_with_complete_index(self, AsyncErrataAPI: mock.MagicMock):
+        with mock.patch("elliottlib.bzutil.BugzillaBugTracker.login"):
+            bug_tracker = BugzillaBugTracker({})
+        bugs = [flexmock(id=i) for i in range(1, 5)]
+        index = AdvisoryBugIndex({1: [1], 2: [2, 1]}, complete=True)
+
+        actual = await bug_tracker.filter_attached_bugs(bugs, advisory_bug_index=index)
+        self.assertEqual([1, 2], [b.id for b in actual])
+        # bugs missing from a complete index aren't attached; Errata isn't asked about them
+        AsyncErrataAPI.assert_not_called()
+
+    @mock.patch("elliottlib.bzutil.AsyncErrataAPI")
+    async def test_filter_attached_bugs_concurrency(self, AsyncErrataAPI: mock.MagicMock):
+        running = []
+        max_running = 0
+
+        async def get_advisories_for_bug(bug_id):
+            nonlocal max_running
+            running.append(bug_id)
+            max_running = max(max_running, len(running))
+            await asyncio.sleep(0)
+            running.remove(bug_id)
+            return [{"id": 1}] if bug_id % 3 == 0 else []
+
+        api = AsyncErrataAPI.return_value
+        api.get_advisories_for_bug = get_advisories_for_bug
+        api.close = mock.AsyncMock()
+        with mock.patch("elliottlib.bzutil.BugzillaBugTracker.login"):
+            bug_tracker = BugzillaBugTracker({})
+        bug_tracker.ERRATA_LOOKUP_CONCURRENCY = 2
+        bugs = [flexmock(id=i) for i in range(1, 11)]
+
+        actual = await bug_tracker.filter_attached_bugs(bugs)
+        self.assertEqual([3, 6, 9], [b.id for b in actual])
+        self.assertEqual(max_running, 2)
+
     def test_is_viable_bug(self):
         bug = mock.MagicMock()
         bug.status = "MODIFIED"
@@ -469,27 +606,46 @@ class TestBZUtil(unittest.IsolatedAsyncioTestCase):
         self.assertEqual('CVE-2021-789', sort_list[3])
         self.assertEqual('CVE-2022-123', sort_list[4])
 
-    def test_is_first_fix_any_validate(self):
+    async def _security_data_api(self, hydra_data, pyxis_data=None):
+        """ Start a local stand-in for Hydra and Pyxis, and return an API client pointed at it """
+        async def get_cve(request: web.Request):
+            return web.json_response(hydra_data)
+
+        async def get_images(request: web.Request):
+            return web.json_response(pyxis_data)
+
+        app = web.Application()
+        app.router.add_get("/hydra/cve/{alias}.json", get_cve)
+        app.router.add_get("/pyxis/repositories/registry/registry.access.redhat.com/repository/{repo:.+}/images",
+                           get_images)
+        server = TestServer(app)
+        await server.start_server()
+        self.addAsyncCleanup(server.close)
+        patcher = patch("elliottlib.security_data.AsyncSecurityDataAPI._pyxis_auth_header",
+                        return_value="Negotiate abcdef")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        api = AsyncSecurityDataAPI(str(server.make_url("/hydra")), str(server.make_url("/pyxis")))
+        self.addAsyncCleanup(api.close)
+        return api
+
+    async def test_is_first_fix_any_validate(self):
         tr = '4.8.z'
         expected = True
-        actual = bzutil.is_first_fix_any(None, [], tr)
+        actual = await bzutil.is_first_fix_any(None, None, [], tr)
         self.assertEqual(expected, actual)
 
         # should raise error when no tracker bugs are found
         tr = '4.8.0'
-        self.assertRaisesRegex(
-            ValueError,
-            r'does not seem to have trackers',
-            bzutil.is_first_fix_any, BugzillaBug(flexmock(id=1)), [], tr)
+        with self.assertRaisesRegex(ValueError, r'does not seem to have trackers'):
+            await bzutil.is_first_fix_any(None, BugzillaBug(flexmock(id=1)), [], tr)
 
         # should raise error when flaw alias isn't present
         tr = '4.8.0'
-        self.assertRaisesRegex(
-            ValueError,
-            r'does not have an alias',
-            bzutil.is_first_fix_any, BugzillaBug(flexmock(id=1)), ['foobar'], tr)
+        with self.assertRaisesRegex(ValueError, r'does not have an alias'):
+            await bzutil.is_first_fix_any(None, BugzillaBug(flexmock(id=1)), ['foobar'], tr)
 
-    def test_is_first_fix_any(self):
+    async def test_is_first_fix_any(self):
         hydra_data = {
             'package_state': [
                 {
@@ -514,35 +670,33 @@ class TestBZUtil(unittest.IsolatedAsyncioTestCase):
                 }
             ]
         }
-        flexmock(requests).should_receive('get')\
-            .and_return(flexmock(json=lambda: hydra_data, raise_for_status=lambda: None))\
-            .ordered()
-
         pyxis_data = {'data': [{'brew': {'package': 'some-image'}}]}
-        flexmock(requests).should_receive('get')\
-            .and_return(flexmock(status_code=200, json=lambda: pyxis_data))\
-            .ordered()
+        api = await self._security_data_api(hydra_data, pyxis_data)
 
         tr = '4.8.0'
         flaw_bug = BugzillaBug(flexmock(id=1, alias=['CVE-123']))
         tracker_bugs = [flexmock(id=2, whiteboard_component='openshift-clients')]
         expected = True
-        actual = bzutil.is_first_fix_any(flaw_bug, tracker_bugs, tr)
+        actual = await bzutil.is_first_fix_any(api, flaw_bug, tracker_bugs, tr)
+        self.assertEqual(expected, actual)
+
+        # an image is matched by the brew package of its repository
+        tracker_bugs = [flexmock(id=3, whiteboard_component='some-image')]
+        actual = await bzutil.is_first_fix_any(api, flaw_bug, tracker_bugs, tr)
         self.assertEqual(expected, actual)
 
-    def test_is_first_fix_any_missing_package_state(self):
+    async def test_is_first_fix_any_missing_package_state(self):
         hydra_data = {}
-        flexmock(requests).should_receive('get')\
-            .and_return(flexmock(json=lambda: hydra_data, raise_for_status=lambda: None))\
+        api = await self._security_data_api(hydra_data)
 
         tr = '4.8.0'
         flaw_bug = BugzillaBug(flexmock(id=1, alias=['CVE-123']))
         tracker_bugs = [flexmock(id=2, whiteboard_component='openshift-clients')]
         expected = False
-        actual = bzutil.is_first_fix_any(flaw_bug, tracker_bugs, tr)
+        actual = await bzutil.is_first_fix_any(api, flaw_bug, tracker_bugs, tr)
         self.assertEqual(expected, actual)
 
-    def test_is_first_fix_any_fail(self):
+    async def test_is_first_fix_any_fail(self):
         hydra_data = {
             'package_state': [
                 {
@@ -567,23 +721,43 @@ class TestBZUtil(unittest.IsolatedAsyncioTestCase):
                 }
             ]
         }
-        flexmock(requests).should_receive('get')\
-            .and_return(flexmock(json=lambda: hydra_data, raise_for_status=lambda: None))\
-            .ordered()
-
         pyxis_data = {'data': [{'brew': {'package': 'some-image'}}]}
-        flexmock(requests).should_receive('get')\
-            .and_return(flexmock(status_code=200, json=lambda: pyxis_data))\
-            .ordered()
+        api = await self._security_data_api(hydra_data, pyxis_data)
 
         tr = '4.8.0'
         flaw_bug = BugzillaBug(flexmock(id=1, alias=['CVE-123']))
         tracker_bugs = [flexmock(id=2, whiteboard_component='openshift')]
         expected = False
-        actual = bzutil.is_first_fix_any(flaw_bug, tracker_bugs, tr)
+        actual = await bzutil.is_first_fix_any(api, flaw_bug, tracker_bugs, tr)
         self.assertEqual(expected, actual)
 
 
+class TestPerformQuery(unittest.TestCase):
+    def _bzapi(self, bug_ids):
+        offsets = []
+
+        def query(q):
+            offsets.append(q["offset"])
+            return [flexmock(id=i) for i in bug_ids[q["offset"]:q["offset"] + q["limit"]]]
+
+        bzapi = flexmock(url_to_query=lambda url: {"product": "OpenShift Container Platform"}, query=query)
+        return bzapi, offsets
+
+    def test_single_page(self):
+        bzapi, offsets = self._bzapi(list(range(10)))
+        actual = bzutil._perform_query(bzapi, flexmock(fields=None))
+        self.assertEqual([b.id for b in actual], list(range(10)))
+        self.assertEqual(offsets, [0])
+
+    def test_concurrent_pages(self):
+        # bug 999 shows up again on the 2nd page
+        bug_ids = list(range(1000)) + [999] + list(range(1000, 5500))
+        bzapi, offsets = self._bzapi(bug_ids)
+        actual = bzutil._perform_query(bzapi, flexmock(fields=["id", "status"]), concurrency=2)
+        self.assertEqual([b.id for b in actual], list(range(5500)))
+        self.assertEqual(sorted(offsets), [0, 1000, 2000, 3000, 4000, 5000, 6000])
+
+
 class TestSearchFilter(unittest.TestCase):
     def test_search_filter(self):
         """Verify the bugzilla SearchFilter works as expected"""
@@ -38,6 +38,31 @@ class BugzillaBugTrackerUpdateBugStatus(unittest.TestCase):
         bz._client = client
         bz.update_bug_status(bug, target_status='status2', comment='comment')
 
+    def test_update_bugs_status(self):
+        bugs = [flexmock(id=1, status="MODIFIED"), flexmock(id=2, status="ON_QA"), flexmock(id=3, status="MODIFIED"),
+                flexmock(id=4, status="POST")]
+        flexmock(BugzillaBugTracker).should_receive("login").and_return(None)
+        client = flexmock()
+        client.should_receive("build_update").with_args(
+            status='ON_QA', comment='Elliott changed bug status from MODIFIED to ON_QA.\ncomment',
+            comment_private=True).and_return("modified")
+        client.should_receive("build_update").with_args(
+            status='ON_QA', comment='Elliott changed bug status from POST to ON_QA.\ncomment',
+            comment_private=True).and_return("post")
+        # bugs with the same status are updated together
+        client.should_receive("update_bugs").with_args([1, 3], "modified").once()
+        client.should_receive("update_bugs").with_args([4], "post").and_raise(ValueError("no")).once()
+
+        bz = BugzillaBugTracker({})
+        bz._client = client
+        actual = bz.update_bugs_status(bugs, target_status='ON_QA', comment='comment')
+        self.assertEqual({k: v for k, v in actual.items() if k != 4}, {1: True, 2: False, 3: True})
+        self.assertIsInstance(actual[4], ValueError)
+
+        # nothing is changed with noop
+        actual = bz.update_bugs_status(bugs, target_status='ON_QA', noop=True)
+        self.assertEqual(actual, {1: True, 2: False, 3: True, 4: True})
+
 
 class BugzillaBugTrackerUpdateAddComment(unittest.TestCase):
     def test_add_comment(self):
@@ -53,6 +78,18 @@ class BugzillaBugTrackerUpdateAddComment(unittest.TestCase):
         bz._client = client
         bz.add_comment(bug.id, 'comment', private=True)
 
+    def test_add_comments(self):
+        flexmock(BugzillaBugTracker).should_receive("login").and_return(None)
+        client = flexmock()
+        client.should_receive("build_update").with_args(comment='comment', comment_private=False).and_return(1)
+        client.should_receive("update_bugs").with_args([1, 2, 3], 1).once()
+
+        bz = BugzillaBugTracker({})
+        bz._client = client
+        actual = bz.add_comments([1, 2, 3, 2], 'comment', private=False)
+        self.assertEqual(actual, {1: True, 2: True, 3: True})
+        bz.add_comments([1, 2, 3], 'comment', private=False, noop=True)
+
 
 if __name__ == '__main__':
     unittest.main()
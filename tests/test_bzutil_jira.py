@@ -1,5 +1,8 @@
 import unittest
-from elliottlib.bzutil import JIRABugTracker
+from datetime import datetime, timezone
+from jira import Issue
+from jira.client import ResultList
+from elliottlib.bzutil import JIRABug, JIRABugTracker
 from flexmock import flexmock
 
 
@@ -35,6 +38,39 @@ class TestJIRABugTracker(unittest.TestCase):
         jira._client = client
         jira.update_bug_status(bug, target_status='status2', comment='comment')
 
+    def test_update_bugs_status(self):
+        options = {"server": "https://issues.example.com", "rest_path": "api", "rest_api_version": "2",
+                   "agile_rest_path": "agile", "headers": {}}
+
+        def bug(key, status, issue_type="Bug"):
+            return JIRABug(Issue(options, None, raw={"key": key, "fields": {
+                "status": {"name": status}, "project": {"key": "OCPBUGS"}, "issuetype": {"name": issue_type}}}))
+
+        bugs = [bug("OCPBUGS-1", "MODIFIED"), bug("OCPBUGS-2", "MODIFIED"), bug("OCPBUGS-3", "ON_QA"),
+                bug("OCPBUGS-4", "MODIFIED", "Vulnerability"), bug("OCPBUGS-5", "POST")]
+        flexmock(JIRABugTracker).should_receive("login").and_return(None)
+        client = flexmock()
+        # transitions are looked up once per workflow
+        client.should_receive("transitions").with_args("OCPBUGS-1").and_return([{"id": "11", "name": "ON_QA"}])\
+            .once()
+        client.should_receive("transitions").with_args("OCPBUGS-4").and_return([{"id": "41", "name": "ON_QA"}])\
+            .once()
+        client.should_receive("transitions").with_args("OCPBUGS-5").and_return([{"id": "51", "name": "POST"}])\
+            .once()
+        client.should_receive("transition_issue").with_args("OCPBUGS-1", "11").once()
+        client.should_receive("transition_issue").with_args("OCPBUGS-2", "11").once()
+        client.should_receive("transition_issue").with_args("OCPBUGS-4", "41").once()
+        client.should_receive("transition_issue").with_args("OCPBUGS-5", "ON_QA").and_raise(ValueError("no"))
+        flexmock(JIRABugTracker).should_receive("add_comment").times(3)
+
+        jira = JIRABugTracker({})
+        jira._client = client
+        jira.BUG_UPDATE_CONCURRENCY = 1
+        actual = jira.update_bugs_status(bugs, target_status='ON_QA')
+        self.assertEqual(list(actual), ["OCPBUGS-1", "OCPBUGS-2", "OCPBUGS-3", "OCPBUGS-4", "OCPBUGS-5"])
+        self.assertEqual([actual[f"OCPBUGS-{i}"] for i in range(1, 5)], [True, True, False, True])
+        self.assertIsInstance(actual["OCPBUGS-5"], ValueError)
+
     def test_add_comment_private(self):
         bug = flexmock(id=123)
         flexmock(JIRABugTracker).should_receive("login").and_return(None)
@@ -47,6 +83,128 @@ class TestJIRABugTracker(unittest.TestCase):
         jira._client = client
         jira.add_comment(bug.id, 'comment', private=True)
 
+    def test_search_pages(self):
+        flexmock(JIRABugTracker).should_receive("login").and_return(None)
+        issues = [flexmock(key=f"OCPBUGS-{i}") for i in range(7)]
+        requests = []
+
+        def search_issues(query, startAt, maxResults, fields):
+            requests.append(startAt)
+            self.assertEqual(query, "project=OCPBUGS")
+            self.assertEqual(fields, JIRABugTracker.JIRA_BUG_FIELDS)
+            # server caps page size at 3
+            return ResultList(issues[startAt:startAt + 3], _startAt=startAt, _maxResults=3, _total=len(issues))
+
+        jira = JIRABugTracker({})
+        jira._client = flexmock(search_issues=search_issues)
+        actual = jira._search("project=OCPBUGS")
+        self.assertEqual([b.id for b in actual], [f"OCPBUGS-{i}" for i in range(7)])
+        self.assertEqual(sorted(requests), [0, 3, 6])
+
+    def test_search_single_page(self):
+        flexmock(JIRABugTracker).should_receive("login").and_return(None)
+        client = flexmock()
+        client.should_receive("search_issues").with_args(
+            "project=OCPBUGS", startAt=0, maxResults=JIRABugTracker.JIRA_SEARCH_PAGE_SIZE, fields=["summary"]
+        ).and_return(ResultList([flexmock(key="OCPBUGS-1")], _maxResults=JIRABugTracker.JIRA_SEARCH_PAGE_SIZE, _total=1)).once()
+
+        jira = JIRABugTracker({})
+        jira._client = client
+        actual = jira._search("project=OCPBUGS", fields=["summary"])
+        self.assertEqual([b.id for b in actual], ["OCPBUGS-1"])
+
+    def test_get_bugs(self):
+        flexmock(JIRABugTracker).should_receive("login").and_return(None)
+        jira = JIRABugTracker({'project': 'OCPBUGS'})
+        jira.JIRA_BUG_BATCH_SIZE = 2
+        bug_ids = ["OCPBUGS-5", "OCPBUGS-1", "OCPBUGS-4", "OCPBUGS-2", "OCPBUGS-3", "OCPBUGS-1"]
+        queries = []
+
+        def _search_issues(query, verbose=False, fields=None):
+            queries.append(query)
+            keys = query.split("issue in (")[1].rstrip(")").split(",")
+            # return in a different order, without OCPBUGS-4 and OCPBUGS-3
+            return [flexmock(key=key) for key in sorted(keys) if key not in ("OCPBUGS-4", "OCPBUGS-3")]
+
+        jira._search_issues = _search_issues
+        with self.assertRaisesRegex(ValueError, r"\(2\): \['OCPBUGS-4', 'OCPBUGS-3'\]"):
+            jira.get_bugs(bug_ids)
+        self.assertEqual(len(queries), 3)
+
+        actual = jira.get_bugs(bug_ids, permissive=True, concurrency=2)
+        self.assertEqual([b.id for b in actual], ["OCPBUGS-5", "OCPBUGS-1", "OCPBUGS-2"])
+
+    def test_filter_bugs_by_cutoff_event_chunks(self):
+        flexmock(JIRABugTracker).should_receive("login").and_return(None)
+        jira = JIRABugTracker({"project": "OCPBUGS"})
+        queries = []
+
+        def _search(query, verbose=False):
+            queries.append(query)
+            keys = query.split("issue in (")[1].split(")")[0].split(",")
+            return [flexmock(id=key) for key in keys if int(key.split("-")[1]) % 2]
+
+        jira._search = _search
+        bugs = [flexmock(id=f"OCPBUGS-{i}") for i in range(1, 121)]
+        cutoff = datetime(2023, 3, 4, tzinfo=timezone.utc).timestamp()
+        actual = jira.filter_bugs_by_cutoff_event(bugs, ["ON_QA"], cutoff)
+        self.assertEqual([b.id for b in actual], [f"OCPBUGS-{i}" for i in range(1, 121, 2)])
+        self.assertEqual(len(queries), 3)
+        self.assertIn('status was in ("ON_QA") before("2023/03/04 00:00")', queries[0])
+
+    def test_filter_bugs_by_cutoff_event_changelog(self):
+        flexmock(JIRABugTracker).should_receive("login").and_return(None)
+
+        def _bug(key, status, created):
+            return flexmock(id=key, status=status, creation_time_parsed=lambda: created)
+
+        def _history(created, *changes):
+            items = [{"field": "status", "fromString": old, "toString": new} for old, new in changes]
+            return {"created": created, "items": items + [{"field": "labels", "fromString": "", "toString": "x"}]}
+
+        created = datetime(2023, 3, 1, tzinfo=timezone.utc)
+        bugs = [
+            # became ON_QA before the cutoff
+            _bug("OCPBUGS-1", "Verified", created),
+            # became ON_QA after the cutoff
+            _bug("OCPBUGS-2", "ON_QA", created),
+            # was created ON_QA and never changed
+            _bug("OCPBUGS-3", "ON_QA", created),
+            # was created after the cutoff
+            _bug("OCPBUGS-4", "ON_QA", datetime(2023, 3, 5, tzinfo=timezone.utc)),
+            # was ON_QA before the cutoff, then went back to ASSIGNED
+            _bug("OCPBUGS-5", "ASSIGNED", created),
+        ]
+        changelogs = {
+            "OCPBUGS-1": [_history("2023-03-03T00:00:00.000+0000", ("ON_QA", "Verified")),
+                          _history("2023-03-02T00:00:00.000+0000", ("MODIFIED", "ON_QA"))],
+            "OCPBUGS-2": [_history("2023-03-04T12:00:00.000+0000", ("MODIFIED", "ON_QA"))],
+            "OCPBUGS-3": [],
+            "OCPBUGS-4": [],
+            "OCPBUGS-5": [_history("2023-03-02T00:00:00.000-0500", ("MODIFIED", "ON_QA")),
+                          _history("2023-03-03T00:00:00.000+0000", ("ON_QA", "ASSIGNED"))],
+        }
+        client = flexmock()
+        client.should_receive("search_issues").with_args(
+            "project=OCPBUGS and issue in (OCPBUGS-1,OCPBUGS-2,OCPBUGS-3,OCPBUGS-4,OCPBUGS-5)", startAt=0,
+            maxResults=JIRABugTracker.JIRA_SEARCH_PAGE_SIZE, fields=["status"], expand="changelog",
+        ).replace_with(lambda *args, **kwargs: ResultList(
+            [flexmock(key=key, raw={"changelog": {"histories": histories[:1], "total": len(histories)}})
+             for key, histories in changelogs.items()],
+            _maxResults=JIRABugTracker.JIRA_SEARCH_PAGE_SIZE, _total=len(changelogs))).once()
+        # the search only returns the first page of each changelog
+        for key in ("OCPBUGS-1", "OCPBUGS-5"):
+            client.should_receive("_get_json").with_args(
+                f"issue/{key}/changelog", params={"startAt": 1, "maxResults": JIRABugTracker.JIRA_SEARCH_PAGE_SIZE},
+            ).and_return({"startAt": 1, "total": 2, "values": changelogs[key][1:]}).once()
+
+        jira = JIRABugTracker({"project": "OCPBUGS"})
+        jira._client = client
+        jira.cutoff_mode = "changelog"
+        cutoff = datetime(2023, 3, 4, 12, 0, 30, tzinfo=timezone.utc).timestamp()
+        actual = jira.filter_bugs_by_cutoff_event(bugs, ["ON_QA", "VERIFIED"], cutoff)
+        self.assertEqual([b.id for b in actual], ["OCPBUGS-1", "OCPBUGS-3", "OCPBUGS-5"])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import time
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from elliottlib.lookup_cache import LookupCache
+from elliottlib.cvp import CVPInspector
+
+
+class TestCVPInspector(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+        # nvr -> outcome of its latest sanity test
+        self.outcomes = {"a-1-1": "PASSED", "b-1-1": "FAILED"}
+
+        async def get_latest(request: web.Request):
+            self.requests.append(request.path)
+            items = request.query["item"].split(",")
+            return web.json_response({"data": [
+                {"data": {"item": [nvr]}, "outcome": self.outcomes[nvr],
+                 "ref_url": str(self.server.make_url(f"/cvp/{nvr}/"))}
+                for nvr in items if nvr in self.outcomes]})
+
+        async def get_optional_results(request: web.Request):
+            self.requests.append(request.path)
+            if request.match_info["nvr"] == "b-1-1":
+                raise web.HTTPNotFound()
+            # served as text/plain, like the real storage
+            return web.Response(text='{"checks": []}')
+
+        app = web.Application()
+        app.router.add_get("/api/v2.0/results/latest", get_latest)
+        app.router.add_get("/cvp/{nvr}/sanity-tests-optional-results.json", get_optional_results)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        patcher = patch("elliottlib.constants.RESULTSDB_API_URL", str(self.server.make_url("")))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.lookup_cache = LookupCache(os.path.join(self.tmp_dir.name, "lookups.db"))
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        self.lookup_cache.close()
+        self.tmp_dir.cleanup()
+
+    async def _inspect(self, nvrs):
+        inspector = CVPInspector({}, [], lookup_cache=self.lookup_cache)
+        try:
+            nvr_results = await inspector.latest_sanity_test_results(nvrs)
+            completed = sorted(nvr for nvr, r in nvr_results.items() if r)
+            optional_results = await inspector.get_sanity_test_optional_results([nvr_results[n] for n in completed])
+        finally:
+            await inspector.close()
+        return nvr_results, dict(zip(completed, optional_results))
+
+    async def test_results_are_cached(self):
+        nvr_results, optional_results = await self._inspect(["a-1-1", "b-1-1", "c-1-1"])
+        self.assertEqual({nvr: r and r["outcome"] for nvr, r in nvr_results.items()},
+                         {"a-1-1": "PASSED", "b-1-1": "FAILED", "c-1-1": None})
+        self.assertEqual(optional_results, {"a-1-1": {"checks": []}, "b-1-1": None})
+        self.assertEqual(len(self.requests), 3)
+
+        # a later run only asks for what can still change: results not passed, and optional results not found
+        self.requests.clear()
+        self.outcomes["c-1-1"] = "PASSED"
+        nvr_results, optional_results = await self._inspect(["a-1-1", "b-1-1", "c-1-1"])
+        self.assertEqual({nvr: r["outcome"] for nvr, r in nvr_results.items()},
+                         {"a-1-1": "PASSED", "b-1-1": "FAILED", "c-1-1": "PASSED"})
+        self.assertEqual(optional_results, {"a-1-1": {"checks": []}, "b-1-1": None, "c-1-1": {"checks": []}})
+        self.assertEqual(sorted(self.requests), ["/api/v2.0/results/latest", "/cvp/b-1-1/sanity-tests-optional-results.json",
+                                                 "/cvp/c-1-1/sanity-tests-optional-results.json"])
+
+        # a build can be tested again; its passed result is looked up again once it expires
+        self.requests.clear()
+        self.outcomes["a-1-1"] = "FAILED"
+        with patch("time.time", return_value=time.time() + CVPInspector.SANITY_RESULT_TTL + 1):
+            nvr_results, optional_results = await self._inspect(["a-1-1"])
+        self.assertEqual(nvr_results["a-1-1"]["outcome"], "FAILED")
+        # optional results are kept by ref_url, which this fake server reuses for the new run
+        self.assertEqual(optional_results, {"a-1-1": {"checks": []}})
+        self.assertEqual(self.requests, ["/api/v2.0/results/latest"])
@@ -69,6 +69,58 @@ class TestAdvisory(unittest.TestCase):
         addBuilds.assert_any_call(buildlist=['image3-container-789'], file_types={'image3-container-789': ['tar']}, release='ANOTHER_PV')
 
 
+class TestAdvisoryInfo(unittest.TestCase):
+    def test_fields(self):
+        advisory = errata.AdvisoryInfo(test_structures.example_erratum)
+        self.assertEqual(advisory.errata_id, 32916)
+        self.assertEqual(advisory.errata_type, "RHBA")
+        self.assertEqual(advisory.errata_state, "NEW_FILES")
+        self.assertEqual(advisory.errata_name, "RHBA-2018:32916-01")
+        self.assertEqual(advisory.publish_date_override, "2019-Jan-01")
+        self.assertIsNone(advisory.publish_date)
+        self.assertIsNone(advisory.cve_names)
+        self.assertEqual(advisory.errata_bugs, ())
+        self.assertEqual(advisory.jira_issues, ())
+        self.assertEqual(advisory.manager_id, 3001032)
+
+    def test_attached_bugs(self):
+        raw = json.loads(json.dumps(test_structures.example_erratum))
+        raw["bugs"]["bugs"] = [{"bug": {"id": "1"}}, {"bug": {"id": 2}}]
+        raw["jira_issues"]["jira_issues"] = [{"jira_issue": {"key": "OCPBUGS-1"}}]
+        advisory = errata.AdvisoryInfo(raw)
+        self.assertEqual(advisory.errata_bugs, (1, 2))
+        self.assertEqual(advisory.jira_issues, ("OCPBUGS-1",))
+
+    def test_immutable(self):
+        advisory = errata.AdvisoryInfo(test_structures.example_erratum)
+        with self.assertRaises(AttributeError):
+            advisory.errata_state = "QE"
+
+    @patch("elliottlib.errata._errata_get")
+    def test_errata_builds_loaded_once(self, errata_get):
+        errata_get.return_value = {
+            "RHEL-8-OSE-4.7": {"builds": [{"a-1.0-1": {}}, {"b-1.0-1": {}}]},
+        }
+        advisory = errata.AdvisoryInfo(test_structures.example_erratum)
+        self.assertEqual(advisory.errata_builds, {"RHEL-8-OSE-4.7": ["a-1.0-1", "b-1.0-1"]})
+        self.assertEqual(advisory.errata_builds, {"RHEL-8-OSE-4.7": ["a-1.0-1", "b-1.0-1"]})
+        errata_get.assert_called_once_with("/api/v1/erratum/32916/builds")
+
+    @patch("elliottlib.errata._errata_get")
+    def test_product(self, errata_get):
+        errata_get.return_value = {
+            "product": {"short_name": "RHOSE"},
+            "release": {"name": "RHOSE ASYNC"},
+            "people": {"package_owner": "a@redhat.com", "assigned_to": "b@redhat.com", "qe_group": "OpenShift QE"},
+        }
+        advisory = errata.AdvisoryInfo(test_structures.example_erratum)
+        self.assertEqual(advisory.product, "RHOSE")
+        self.assertEqual(advisory.qe_group, "OpenShift QE")
+        self.assertEqual(advisory.package_owner_email, "a@redhat.com")
+        self.assertIsNone(advisory.manager_email)
+        errata_get.assert_called_once_with("/advisory/32916.json")
+
+
 class TestErrata(unittest.TestCase):
 
     def test_parse_date(self):
@@ -109,13 +161,42 @@ class TestErrata(unittest.TestCase):
 
         self.assertRaises(exceptions.ErrataToolError, errata.get_filtered_list)
 
-    def test_parse_exception_error_message(self):
-        self.assertEqual([1685398], errata.parse_exception_error_message('Bug #1685398 The bug is filed already in RHBA-2019:1589.'))
-
-        self.assertEqual([], errata.parse_exception_error_message('invalid format'))
-
-        self.assertEqual([1685398, 1685399], errata.parse_exception_error_message('''Bug #1685398 The bug is filed already in RHBA-2019:1589.
-        Bug #1685399 The bug is filed already in RHBA-2019:1589.'''))
+    def test_iter_filtered_list_stops_at_limit(self):
+        """Ensure no more pages are fetched once the limit is reached"""
+        pages = {
+            1: [{"id": 1}, {"id": 2}],
+            2: [{"id": 3}, {"id": 4}],
+            3: [{"id": 5}],
+        }
+        requested = []
+
+        def fake_get(url, params, **kwargs):
+            requested.append(params["page"])
+            return flexmock(status_code=200, json=lambda: pages.get(params["page"], []))
+
+        flexmock(errata.requests).should_receive("get").replace_with(fake_get)
+        flexmock(errata).should_receive("Advisory").never()
+
+        res = list(errata.iter_filtered_list(limit=3))
+        self.assertEqual([1, 2, 3], [advisory.errata_id for advisory in res])
+        self.assertEqual([1, 2], requested)
+
+        requested.clear()
+        res = list(errata.iter_filtered_list())
+        self.assertEqual([1, 2, 3, 4, 5], [advisory.errata_id for advisory in res])
+        self.assertEqual([1, 2, 3, 4], requested)
+
+    def test_filtered_advisory_is_lazy(self):
+        """Ensure the full Advisory is only constructed when needed, and only once"""
+        advisory = errata.FilteredAdvisory(test_structures.example_erratum_filtered_list[0])
+        flexmock(errata).should_receive("Advisory").with_args(errata_id=32964).and_return(
+            flexmock(publish_date_override="2018-Mar-12")).once()
+        self.assertEqual(32964, advisory.errata_id)
+        self.assertEqual("IN_PUSH", advisory.errata_state)
+        self.assertEqual("RHBA-2018:0476", advisory.errata_name)
+        self.assertEqual("https://errata.devel.redhat.com/advisory/32964", advisory.url())
+        self.assertEqual("2018-Mar-12", advisory.publish_date_override)
+        self.assertEqual("2018-Mar-12", advisory.publish_date_override)
 
     def test_get_advisories_for_bug(self):
         bug = 123456
@@ -1,8 +1,13 @@
 import base64
 from unittest import IsolatedAsyncioTestCase
 from unittest.mock import ANY, AsyncMock, Mock, patch
+
+from aiohttp import ClientResponseError, web
+from aiohttp.test_utils import TestServer
+
 from elliottlib.rpm_utils import parse_nvr
-from elliottlib.errata_async import AsyncErrataAPI, AsyncErrataUtils
+from elliottlib.errata_async import AdvisoryBugIndex, AsyncErrataAPI, AsyncErrataUtils
+from elliottlib.exceptions import BuildSigningTimeoutError
 from elliottlib import constants
 
 
@@ -130,6 +135,67 @@ class TestAsyncErrataAPI(IsolatedAsyncioTestCase):
         _make_request.assert_awaited_with(ANY, 'GET', '/api/v1/cve_package_exclusion', params={'filter[errata_id]': '1', 'page[number]': 3, 'page[size]': 1000})
         self.assertEqual(actual, [{'id': 1}, {'id': 2}, {'id': 3}, {'id': 4}, {'id': 5}])
 
+    @patch("aiohttp.ClientSession", autospec=True)
+    @patch("elliottlib.errata_async.AsyncErrataAPI._make_request", autospec=True)
+    async def test_get_build(self, _make_request: Mock, ClientSession: Mock):
+        api = AsyncErrataAPI("https://errata.example.com")
+        _make_request.return_value = {"rpms_signed": True}
+        actual = await api.get_build("a-1.0.0-1")
+        _make_request.assert_awaited_once_with(ANY, "GET", "/api/v1/build/a-1.0.0-1")
+        self.assertEqual(actual, {"rpms_signed": True})
+
+    @patch("aiohttp.ClientSession", autospec=True)
+    @patch("elliottlib.errata_async.AsyncErrataAPI._make_request", autospec=True)
+    async def test_get_advisories_for_release(self, _make_request: Mock, ClientSession: Mock):
+        api = AsyncErrataAPI("https://errata.example.com")
+        _make_request.side_effect = [{"data": [{"id": 42, "attributes": {"name": "RHOSE ASYNC - AUTO"}}]},
+                                     [{"id": 1, "status": "QE"}]]
+        actual = await api.get_advisories_for_release("RHOSE ASYNC - AUTO")
+        self.assertEqual(_make_request.await_args_list[0].args[1:], ("GET", "/api/v1/releases"))
+        self.assertEqual(_make_request.await_args_list[0].kwargs, {"params": {"filter[name]": "RHOSE ASYNC - AUTO"}})
+        _make_request.assert_awaited_with(ANY, "GET", "/release/42/advisories.json")
+        self.assertEqual(actual, [{"id": 1, "status": "QE"}])
+
+        _make_request.side_effect = [{"data": []}]
+        with self.assertRaises(ValueError):
+            await api.get_advisories_for_release("no such release")
+
+
+class TestAdvisoryBugIndex(IsolatedAsyncioTestCase):
+    async def test_build(self):
+        api = AsyncMock()
+        advisories = {
+            1: {"bugs": {"bugs": [{"bug": {"id": 11}}, {"bug": {"id": 12}}]},
+                "jira_issues": {"jira_issues": [{"jira_issue": {"key": "OCPBUGS-1"}}]}},
+            2: {"bugs": {"bugs": [{"bug": {"id": 12}}]},
+                "jira_issues": {"jira_issues": []}},
+        }
+        api.get_advisory.side_effect = lambda advisory_id: advisories[advisory_id]
+        index = await AdvisoryBugIndex.build(api, [2, 1, 2])
+        self.assertEqual(api.get_advisory.await_count, 2)
+        self.assertEqual(index.advisory_ids, {1, 2})
+        self.assertEqual(len(index), 3)
+        self.assertIn(11, index)
+        self.assertIn("OCPBUGS-1", index)
+        self.assertNotIn(13, index)
+        self.assertEqual(index.advisories_for(12), {1, 2})
+        self.assertEqual(index.advisories_for("OCPBUGS-2"), set())
+        self.assertFalse(index.complete)
+
+    async def test_build_for_release(self):
+        api = AsyncMock()
+        api.get_advisories_for_release.return_value = [
+            {"id": 1, "status": "NEW_FILES"},
+            {"id": 2, "status": "SHIPPED_LIVE"},
+            {"id": 3, "status": "DROPPED_NO_SHIP"},
+            {"id": 4, "status": "REL_PREP"},
+        ]
+        api.get_advisory.return_value = {"bugs": {"bugs": []}, "jira_issues": {"jira_issues": []}}
+        index = await AdvisoryBugIndex.build_for_release(api, "RHOSE ASYNC - AUTO", [5])
+        api.get_advisories_for_release.assert_awaited_once_with("RHOSE ASYNC - AUTO")
+        self.assertEqual(index.advisory_ids, {1, 4, 5})
+        self.assertTrue(index.complete)
+
 
 class TestAsyncErrataUtils(IsolatedAsyncioTestCase):
     @patch("elliottlib.errata_async.AsyncErrataAPI", autospec=True)
@@ -241,3 +307,149 @@ class TestAsyncErrataUtils(IsolatedAsyncioTestCase):
         api.create_cve_package_exclusion.assert_any_await(1, "CVE-2099-1", "e")
         api.create_cve_package_exclusion.assert_any_await(1, "CVE-2099-3", "e")
         self.assertEqual(actual, None)
+
+
+class TestWaitForBuildsSigned(IsolatedAsyncioTestCase):
+    """ Polls a fake Errata endpoint on which each build becomes signed after a number of requests """
+
+    async def asyncSetUp(self):
+        self.requests = {}
+        self.signed_after = {}
+
+        async def get_build(request: web.Request):
+            build = request.match_info["build"]
+            if build not in self.signed_after:
+                raise web.HTTPNotFound()
+            self.requests[build] = self.requests.get(build, 0) + 1
+            return web.json_response({"rpms_signed": self.requests[build] >= self.signed_after[build]})
+
+        app = web.Application()
+        app.router.add_get("/api/v1/build/{build}", get_build)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        patcher = patch("elliottlib.errata_async.AsyncErrataAPI._generate_auth_header", return_value="Negotiate abcdef")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.api = AsyncErrataAPI(str(self.server.make_url("")))
+
+    async def asyncTearDown(self):
+        await self.api.close()
+        await self.server.close()
+
+    async def test_only_unsigned_builds_are_polled_again(self):
+        self.signed_after = {"a-1.0.0-1": 1, "b-1.0.0-1": 2, "c-1.0.0-1": 4}
+        signed = []
+        await AsyncErrataUtils.wait_for_builds_signed(self.api, ["c-1.0.0-1", "b-1.0.0-1", "a-1.0.0-1", "a-1.0.0-1"], 10,
+                                                      initial_delay=0.01, max_delay=0.02, on_signed=signed.append)
+        self.assertEqual(signed, ["a-1.0.0-1", "b-1.0.0-1", "c-1.0.0-1"])
+        self.assertEqual(self.requests, self.signed_after)
+
+    @patch("elliottlib.errata_async.asyncio.sleep", autospec=True)
+    async def test_backoff(self, sleep: AsyncMock):
+        self.signed_after = {"a-1.0.0-1": 5}
+        with patch("elliottlib.errata_async.random.uniform", side_effect=lambda a, b: b):
+            await AsyncErrataUtils.wait_for_builds_signed(self.api, ["a-1.0.0-1"], 3600, initial_delay=10, max_delay=30)
+        self.assertEqual([c.args[0] for c in sleep.await_args_list], [10, 20, 30, 30])
+
+    async def test_timeout(self):
+        self.signed_after = {"a-1.0.0-1": 1, "b-1.0.0-1": 1000}
+        signed = []
+        with self.assertRaises(BuildSigningTimeoutError) as cm:
+            await AsyncErrataUtils.wait_for_builds_signed(self.api, ["a-1.0.0-1", "b-1.0.0-1"], 0.05,
+                                                          initial_delay=0.01, max_delay=0.02, on_signed=signed.append)
+        self.assertEqual(cm.exception.unsigned_builds, ["b-1.0.0-1"])
+        self.assertIn("b-1.0.0-1", str(cm.exception))
+        self.assertEqual(signed, ["a-1.0.0-1"])
+        self.assertEqual(self.requests["a-1.0.0-1"], 1)
+        self.assertGreater(self.requests["b-1.0.0-1"], 1)
+
+    async def test_check_once(self):
+        self.signed_after = {"a-1.0.0-1": 2}
+        with self.assertRaises(BuildSigningTimeoutError):
+            await AsyncErrataUtils.wait_for_builds_signed(self.api, ["a-1.0.0-1"], 0)
+        self.assertEqual(self.requests, {"a-1.0.0-1": 1})
+
+
+class TestAttachBugs(IsolatedAsyncioTestCase):
+    """ Attaches bugs through a fake Errata endpoint which refuses bugs filed in other advisories """
+
+    async def asyncSetUp(self):
+        self.attached = {1: [11, "OCPBUGS-1"]}
+        self.filed_elsewhere = set()
+        self.updates = []
+        self.server_error = False
+        self.forbidden = False
+
+        async def get_advisory(request: web.Request):
+            bug_ids = self.attached[int(request.match_info["id"])]
+            return web.json_response({
+                "bugs": {"bugs": [{"bug": {"id": b}} for b in bug_ids if isinstance(b, int)]},
+                "jira_issues": {"jira_issues": [{"jira_issue": {"key": b}} for b in bug_ids if isinstance(b, str)]},
+            })
+
+        async def put_advisory(request: web.Request):
+            ids = (await request.json())["advisory"]["idsfixed"].split()
+            self.updates.append(ids)
+            if self.server_error:
+                raise web.HTTPServiceUnavailable()
+            if self.forbidden:
+                return web.json_response({"error": "You do not have permission to update this advisory"}, status=403)
+            refused = [b for b in ids if b in self.filed_elsewhere]
+            if refused:
+                error = " ".join(f"Bug #{b} The bug is filed already in RHBA-2019:1589." for b in refused)
+                return web.json_response({"error": error}, status=422)
+            self.attached[int(request.match_info["id"])] = [int(b) if b.isdigit() else b for b in ids]
+            return web.json_response({})
+
+        app = web.Application()
+        app.router.add_get("/api/v1/erratum/{id}", get_advisory)
+        app.router.add_put("/api/v1/erratum/{id}", put_advisory)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        patcher = patch("elliottlib.errata_async.AsyncErrataAPI._generate_auth_header", return_value="Negotiate abcdef")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.api = AsyncErrataAPI(str(self.server.make_url("")))
+
+    async def asyncTearDown(self):
+        await self.api.close()
+        await self.server.close()
+
+    async def test_attach_bugs(self):
+        bug_ids = [11, "OCPBUGS-2"] + list(range(101, 109)) + [109]
+        actual = await AsyncErrataUtils.attach_bugs(self.api, 1, bug_ids, chunk_size=8)
+        self.assertEqual(actual.already_attached, [11])
+        self.assertEqual(actual.attached, ["OCPBUGS-2"] + list(range(101, 109)) + [109])
+        self.assertEqual(actual.rejected, [])
+        self.assertEqual(self.attached[1], [11, "OCPBUGS-1", "OCPBUGS-2"] + list(range(101, 110)))
+        self.assertEqual(len(self.updates), 2)
+
+    async def test_attach_bugs_bisect(self):
+        # 1 refused bug in a chunk of 8 is found by splitting the chunk 3 times
+        self.filed_elsewhere = {"106"}
+        actual = await AsyncErrataUtils.attach_bugs(self.api, 1, list(range(101, 109)), chunk_size=8)
+        self.assertEqual(actual.attached, [101, 102, 103, 104, 105, 107, 108])
+        self.assertEqual(actual.rejected, [106])
+        self.assertEqual(self.attached[1], [11, "OCPBUGS-1", 101, 102, 103, 104, 105, 107, 108])
+        self.assertEqual(len(self.updates), 7)
+
+    async def test_attach_bugs_dry_run(self):
+        actual = await AsyncErrataUtils.attach_bugs(self.api, 1, [11, 12], dry_run=True)
+        self.assertEqual(actual.already_attached, [11])
+        self.assertEqual(actual.attached, [])
+        self.assertEqual(self.updates, [])
+
+    async def test_attach_bugs_server_error(self):
+        self.server_error = True
+        with self.assertRaises(ClientResponseError):
+            await AsyncErrataUtils.attach_bugs(self.api, 1, list(range(101, 109)))
+        self.assertEqual(len(self.updates), 1)
+
+    async def test_attach_bugs_client_error(self):
+        # a client error that doesn't name refused bugs isn't about the bugs; the chunk isn't split
+        self.forbidden = True
+        with self.assertRaises(ClientResponseError) as cm:
+            await AsyncErrataUtils.attach_bugs(self.api, 1, list(range(101, 109)))
+        self.assertEqual(cm.exception.status, 403)
+        self.assertIn("permission", cm.exception.message)
+        self.assertEqual(len(self.updates), 1)
@@ -1,3 +1,4 @@
+import threading
 import unittest
 import traceback
 from click.testing import CliRunner
@@ -43,6 +44,33 @@ class FindBugsBlockerTestCase(unittest.TestCase):
         self.assertIn(bz_output, result.output)
         self.assertIn(jira_output, result.output)
 
+    def test_find_bugs_blocker_concurrent(self):
+        runner = CliRunner()
+        flexmock(Runtime).should_receive("initialize").and_return(None)
+        flexmock(BugzillaBugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
+        flexmock(BugzillaBugTracker).should_receive("login").and_return(None)
+        flexmock(JIRABugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
+        flexmock(JIRABugTracker).should_receive("login").and_return(None)
+
+        # each search only returns once both are in flight
+        barrier = threading.Barrier(2, timeout=10)
+
+        def search(bug_id):
+            def _search(*args, **kwargs):
+                barrier.wait()
+                return [flexmock(id=bug_id, created_days_ago=lambda: 1, cf_pm_score='score', component='OLM',
+                                 status='ON_QA', summary='summary')]
+            return _search
+
+        flexmock(JIRABugTracker).should_receive("blocker_search").replace_with(search('OCPBUGS-1'))
+        flexmock(BugzillaBugTracker).should_receive("blocker_search").replace_with(search(1))
+        result = runner.invoke(cli, ['-g', 'openshift-4.6', 'find-bugs:blocker'])
+
+        self.assertEqual(result.exit_code, 0)
+        # JIRA results are always printed first
+        self.assertLess(result.output.index("Searching jira"), result.output.index("Searching bugzilla"))
+        self.assertLess(result.output.index("OCPBUGS-1 "), result.output.index("Searching bugzilla"))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,7 +8,7 @@ from bugzilla.bug import Bug
 from jira import JIRA, Issue
 
 from elliottlib.assembly import AssemblyTypes
-from elliottlib.cli.find_bugs_kernel_cli import FindBugsKernelCli
+from elliottlib.cli.find_bugs_kernel_cli import FindBugsKernelCli, get_issues_by_keys
 from elliottlib.config_model import KernelBugSweepConfig
 from elliottlib.runtime import Runtime
 from elliottlib.bzutil import JIRABugTracker
@@ -47,26 +47,57 @@ class TestFindBugsKernelCli(IsolatedAsyncioTestCase):
         cli = FindBugsKernelCli(
             runtime=runtime, trackers=[], clone=True, reconcile=True, comment=True, dry_run=False)
         bz_client = MagicMock(spec=Bugzilla)
-        tracker = MagicMock(spec=Issue, key="TRACKER-1", fields=MagicMock(
-            summary="foo-1.0.1-1.el8_6 and bar-1.0.1-1.el8_6 early delivery via OCP",
-            description="Fixes bugzilla.redhat.com/show_bug.cgi?id=5 and bz6.",
-        ))
-        jira_client = MagicMock(spec=JIRA)
-        jira_client.remote_links.return_value = [
-            MagicMock(object=MagicMock(title="bz1", url="http://bugzilla.redhat.com/1")),
-            MagicMock(object=MagicMock(title="fake2", url="https://bugzilla.redhat.com/2")),
-            MagicMock(object=MagicMock(title="fake3", url="https://bugzilla.redhat.com/show_bug.cgi?id=3")),
-            MagicMock(object=MagicMock(title="fake4", url="https://example.com/show_bug.cgi?id=4")),
+        trackers = [
+            MagicMock(spec=Issue, key="TRACKER-1", fields=MagicMock(
+                summary="foo-1.0.1-1.el8_6 and bar-1.0.1-1.el8_6 early delivery via OCP",
+                description="Fixes bugzilla.redhat.com/show_bug.cgi?id=5 and bz6.",
+            )),
+            MagicMock(spec=Issue, key="TRACKER-2", fields=MagicMock(
+                summary="foo-1.0.2-1.el8_6 early delivery via OCP",
+                description="Fixes bz7.",
+            )),
+            MagicMock(spec=Issue, key="TRACKER-3", fields=MagicMock(
+                summary="foo-1.0.3-1.el8_6 early delivery via OCP",
+                description="Nothing to fix.",
+            )),
         ]
-        expected_bug_ids = [1, 2, 3, 5, 6]
+        jira_client = MagicMock(spec=JIRA)
+        remote_links = {
+            "TRACKER-1": [
+                MagicMock(object=MagicMock(title="bz1", url="http://bugzilla.redhat.com/1")),
+                MagicMock(object=MagicMock(title="fake2", url="https://bugzilla.redhat.com/2")),
+                MagicMock(object=MagicMock(title="fake3", url="https://bugzilla.redhat.com/show_bug.cgi?id=3")),
+                MagicMock(object=MagicMock(title="fake4", url="https://example.com/show_bug.cgi?id=4")),
+            ],
+            "TRACKER-2": [
+                MagicMock(object=MagicMock(title="fake8", url="https://bugzilla.redhat.com/8")),
+            ],
+            "TRACKER-3": [],
+        }
+        jira_client.remote_links.side_effect = lambda key: remote_links[key]
+        expected_bug_ids = [1, 2, 3, 5, 6, 7, 8]
+        # bug 8 doesn't match the target release
         _get_and_filter_bugs.return_value = [
             MagicMock(spec=Bug, id=bug_id, cf_zstream_target_release="8.6.0")
-            for bug_id in expected_bug_ids
+            for bug_id in expected_bug_ids[:-1]
         ]
         bz_target_releases = ["8.6.0"]
-        actual = cli._find_bugs(jira_client, tracker, bz_client, bz_target_releases)
-        self.assertEqual([b.id for b in actual], expected_bug_ids)
+        actual = cli._find_bugs(jira_client, trackers, bz_client, bz_target_releases)
+        self.assertEqual([[b.id for b in bugs] for bugs in actual], [[1, 2, 3, 5, 6], [7], []])
+        # all linked bugs are got from Bugzilla at once
         _get_and_filter_bugs.assert_called_once_with(bz_client, expected_bug_ids, bz_target_releases)
+        self.assertEqual(jira_client.remote_links.call_count, 3)
+
+    def test_get_issues_by_keys(self):
+        jira_client = MagicMock(spec=JIRA)
+        jira_client.search_issues.return_value = [MagicMock(key="FOO-2"), MagicMock(key="FOO-1")]
+        actual = get_issues_by_keys(jira_client, ["FOO-1", "FOO-2", "FOO-1"])
+        self.assertEqual(sorted(actual), ["FOO-1", "FOO-2"])
+        jira_client.search_issues.assert_called_once_with("key in (FOO-1,FOO-2)", maxResults=False)
+
+        jira_client.search_issues.return_value = [MagicMock(key="FOO-1")]
+        with self.assertRaisesRegex(ValueError, "FOO-2"):
+            get_issues_by_keys(jira_client, ["FOO-1", "FOO-2"])
 
     def test_clone_bugs1(self):
         # Test cloning a bug that has not already been cloned
@@ -125,7 +156,8 @@ class TestFindBugsKernelCli(IsolatedAsyncioTestCase):
             version="4.14", target_release="4.14.z",
             candidate_brew_tag="fake-candidate", prod_brew_tag="fake-prod")
         found_issues = [
-            MagicMock(spec=Issue, **{"key": "BUG-1", "fields": MagicMock(), "fields.status.name": "New"}),
+            MagicMock(spec=Issue, **{"key": "BUG-1", "fields": MagicMock(), "fields.status.name": "New",
+                                     "fields.labels": ["art:cloned-kernel-bug", "art:bz#1"]}),
         ]
         jira_client.search_issues.return_value = found_issues
         tracker = MagicMock(spec=Issue, key="TRACKER-1", fields=MagicMock(
@@ -149,6 +181,9 @@ class TestFindBugsKernelCli(IsolatedAsyncioTestCase):
             "labels": ["art:cloned-kernel-bug", "art:bz#1", "art:kmaint:TRACKER-1"]
         }
         found_issues[0].update.assert_called_once_with(expected_fields)
+        jira_client.search_issues.assert_called_once_with(
+            jql_str='project = TARGET-PROJECT and component = Target Component and labels = art:cloned-kernel-bug and labels in ("art:bz#1") and "Target Version" = "4.14.z" order by created DESC',
+            maxResults=False)
         self.assertEqual([b for b in actual], [1])
 
     def test_print_report(self):
@@ -277,7 +312,7 @@ TRACKER-1	2	N/A	Verified	test bug 2
                 description="Fixes bugzilla.redhat.com/show_bug.cgi?id=5 and bz6.",
             ))
         ]
-        _find_bugs.return_value = [
+        _find_bugs.return_value = [[
             MagicMock(spec=Bug, id=10001, cf_zstream_target_release="9.2.0", status="on_qa",
                       weburl="https://example.com/10001",
                       groups=[], priority="high",
@@ -290,12 +325,12 @@ TRACKER-1	2	N/A	Verified	test bug 2
                       weburl="https://example.com/10003",
                       groups=["private"], priority="high",
                       summary="fake summary 10003", description="fake description 10003"),
-        ]
+        ]]
         cli = FindBugsKernelCli(
             runtime=runtime, trackers=[], clone=True, reconcile=True, comment=True, dry_run=False)
         await cli.run()
         _comment_on_tracker.assert_called_once_with(ANY, _find_kmaint_trackers.return_value[0], ANY, ANY)
-        _clone_bugs.assert_called_once_with(ANY, _find_bugs.return_value, ANY)
+        _clone_bugs.assert_called_once_with(ANY, _find_bugs.return_value[0], ANY)
 
     @patch("elliottlib.cli.find_bugs_kernel_cli.FindBugsKernelCli._print_report")
     @patch("elliottlib.cli.find_bugs_kernel_cli.FindBugsKernelCli._clone_bugs")
@@ -328,13 +363,14 @@ TRACKER-1	2	N/A	Verified	test bug 2
                 },
             }
         )
-        jira_client = runtime.bug_trackers.return_value._client
-        jira_client.issue.return_value = \
+        jira_client = runtime.get_bug_tracker.return_value._client
+        jira_client.search_issues.return_value = [
             MagicMock(spec=Issue, key="TRACKER-999", fields=MagicMock(
                 summary="kernel-1.0.1-1.fake and kernel-rt-1.0.1-1.fake early delivery via OCP",
                 description="Fixes bugzilla.redhat.com/show_bug.cgi?id=5 and bz6.",
             ))
-        _find_bugs.return_value = [
+        ]
+        _find_bugs.return_value = [[
             MagicMock(spec=Bug, id=10001, cf_zstream_target_release="9.2.0", status="on_qa",
                       weburl="https://example.com/10001",
                       groups=[], priority="high",
@@ -347,10 +383,10 @@ TRACKER-1	2	N/A	Verified	test bug 2
                       weburl="https://example.com/10003",
                       groups=["private"], priority="high",
                       summary="fake summary 10003", description="fake description 10003"),
-        ]
+        ]]
         cli = FindBugsKernelCli(
             runtime=runtime, trackers=["TRACKER-999"], clone=True, reconcile=True, comment=True, dry_run=False)
         await cli.run()
         _comment_on_tracker.assert_called_once()
-        _clone_bugs.assert_called_once_with(ANY, _find_bugs.return_value, ANY)
+        _clone_bugs.assert_called_once_with(ANY, _find_bugs.return_value[0], ANY)
         _find_kmaint_trackers.assert_not_called()
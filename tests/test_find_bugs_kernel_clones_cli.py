@@ -40,16 +40,17 @@ class TestFindBugsKernelClonesCli(IsolatedAsyncioTestCase):
         component.configure_mock(name="RHCOS")
         target_release = MagicMock()
         target_release.configure_mock(name="4.14.0")
-        jira_client.issue.side_effect = lambda key: MagicMock(spec=Issue, **{
+        jira_client.search_issues.return_value = [MagicMock(spec=Issue, **{
             "key": key,
             "fields": MagicMock(),
             "fields.labels": ["art:cloned-kernel-bug"],
             "fields.project.key": "OCPBUGS",
             "fields.components": [component],
             f"fields.{JIRABugTracker.FIELD_TARGET_VERSION}": [target_release],
-        })
+        }) for key in ["FOO-3", "FOO-1", "FOO-2"]]
         actual = cli._get_jira_issues(jira_client, ["FOO-1", "FOO-2", "FOO-3"], self._config)
         self.assertEqual([issue.key for issue in actual], ["FOO-1", "FOO-2", "FOO-3"])
+        jira_client.search_issues.assert_called_once_with("key in (FOO-1,FOO-2,FOO-3)", maxResults=False)
 
     def test_search_for_jira_issues(self):
         jira_client = MagicMock(spec=JIRA)
@@ -69,14 +70,14 @@ class TestFindBugsKernelClonesCli(IsolatedAsyncioTestCase):
     def test_update_jira_issues(self, get_builds_tags: Mock, _move_jira: Mock):
         runtime = MagicMock()
         jira_client = MagicMock(spec=JIRA)
-        jira_client.issue.return_value = MagicMock(spec=Issue, ** {
+        jira_client.search_issues.return_value = [MagicMock(spec=Issue, ** {
             "key": "KMAINT-1",
             "fields": MagicMock(),
             "fields.project.key": "KMAINT",
             "fields.labels": ['early-kernel-track'],
             "fields.summary": "kernel-1.0.1-1.fake and kernel-rt-1.0.1-1.fake early delivery via OCP",
             "fields.description": "Fixes bugzilla.redhat.com/show_bug.cgi?id=5 and bz6.",
-        })
+        })]
         cli = FindBugsKernelClonesCli(
             runtime=runtime, trackers=[], issues=[], move=True, comment=True, dry_run=False)
         issues = [
@@ -23,17 +23,17 @@ class FindBugsQETestCase(unittest.TestCase):
             "An ART build cycle completed after this fix was made, which usually means it can be"
             " expected in the next created 4.6 nightly and release.")
         flexmock(JIRABugTracker).should_receive("update_bug_status").with_args(
-            jira_bug, 'ON_QA', comment=expected_comment, noop=True
-        )
+            jira_bug, 'ON_QA', comment=expected_comment, log_comment=True, noop=True
+        ).once()
 
         flexmock(BugzillaBugTracker).should_receive("get_config").and_return({
             'target_release': ['4.6.z'], 'server': "bugzilla.redhat.com"
         })
         flexmock(BugzillaBugTracker).should_receive("login").and_return(None)
         flexmock(BugzillaBugTracker).should_receive("search").and_return([bz_bug])
-        flexmock(BugzillaBugTracker).should_receive("update_bug_status").with_args(
-            bz_bug, 'ON_QA', comment=expected_comment, noop=True
-        )
+        flexmock(BugzillaBugTracker).should_receive("update_bugs_status").with_args(
+            [bz_bug], 'ON_QA', comment=expected_comment, noop=True
+        ).and_return({bz_bug.id: False}).once()
         result = runner.invoke(cli, ['-g', 'openshift-4.6', 'find-bugs:qe', '--noop'])
         self.assertEqual(result.exit_code, 0)
 
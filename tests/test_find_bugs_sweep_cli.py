@@ -1,12 +1,24 @@
+import copy
+import io
+import json
+import os
+import tempfile
+import time
 import traceback
 import unittest
+import xmlrpc.client
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
 
+import bugzilla
+from bugzilla.bug import Bug as BugzillaBugObject
 from click.testing import CliRunner
 from flexmock import flexmock
-from unittest.mock import patch, MagicMock, Mock
+from unittest.mock import patch, AsyncMock, MagicMock, Mock
 
 import elliottlib.cli.find_bugs_sweep_cli as sweep_cli
 from elliottlib import errata
+from elliottlib.bug_cache import BugCache
 from elliottlib.exceptions import ElliottFatalError
 from elliottlib.bzutil import BugzillaBugTracker, JIRABugTracker
 from elliottlib.cli.common import cli, Runtime
@@ -44,6 +56,7 @@ class FindBugsSweepTestCase(unittest.IsolatedAsyncioTestCase):
         flexmock(Runtime).should_receive("get_major_minor").and_return(4, 6)
         flexmock(sweep_cli).should_receive("get_assembly_bug_ids").and_return(set(), set())
         flexmock(Runtime).should_receive("get_default_advisories").and_return({})
+        flexmock(Runtime).should_receive("get_errata_config").and_return({})
         flexmock(sweep_cli).should_receive("categorize_bugs_by_type").and_return({})
 
         # jira mocks
@@ -82,6 +95,7 @@ class FindBugsSweepTestCase(unittest.IsolatedAsyncioTestCase):
         flexmock(Runtime).should_receive("get_major_minor").and_return(4, 6)
         flexmock(sweep_cli).should_receive("get_assembly_bug_ids").and_return(set(), set())
         flexmock(Runtime).should_receive("get_default_advisories").and_return({})
+        flexmock(Runtime).should_receive("get_errata_config").and_return({})
         flexmock(sweep_cli).should_receive("categorize_bugs_by_type").and_return({})
 
         # jira mocks
@@ -129,6 +143,7 @@ class FindBugsSweepTestCase(unittest.IsolatedAsyncioTestCase):
         # common mocks
         flexmock(sweep_cli).should_receive("get_assembly_bug_ids").and_return(set(), set())
         flexmock(Runtime).should_receive("get_default_advisories").and_return({})
+        flexmock(Runtime).should_receive("get_errata_config").and_return({})
 
         # bz mocks
         flexmock(BugzillaBugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
@@ -142,9 +157,10 @@ class FindBugsSweepTestCase(unittest.IsolatedAsyncioTestCase):
             t = "\n".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
             self.fail(t)
 
+    @patch('elliottlib.cli.find_bugs_sweep_cli.get_advisory_bug_index', return_value=None)
     @patch('elliottlib.bzutil.JIRABugTracker.filter_attached_bugs')
     @patch('elliottlib.bzutil.BugzillaBugTracker.filter_attached_bugs')
-    def test_find_bugs_sweep_advisory_jira(self, bugzilla_filter_mock, jira_filter_mock):
+    def test_find_bugs_sweep_advisory_jira(self, bugzilla_filter_mock, jira_filter_mock, *_):
         runner = CliRunner()
         bugs = [flexmock(
             id='BZ1',
@@ -182,9 +198,10 @@ class FindBugsSweepTestCase(unittest.IsolatedAsyncioTestCase):
             t = "\n".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
             self.fail(t)
 
+    @patch('elliottlib.cli.find_bugs_sweep_cli.get_advisory_bug_index', return_value=None)
     @patch('elliottlib.bzutil.JIRABugTracker.filter_attached_bugs')
     @patch('elliottlib.bzutil.BugzillaBugTracker.filter_attached_bugs')
-    def test_find_bugs_sweep_advisory_type(self, bugzilla_filter_mock, jira_filter_mock):
+    def test_find_bugs_sweep_advisory_type(self, bugzilla_filter_mock, jira_filter_mock, *_):
         runner = CliRunner()
         bugs = [flexmock(id='BZ1')]
 
@@ -217,9 +234,10 @@ class FindBugsSweepTestCase(unittest.IsolatedAsyncioTestCase):
             t = "\n".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
             self.fail(t)
 
+    @patch('elliottlib.cli.find_bugs_sweep_cli.get_advisory_bug_index', return_value=None)
     @patch('elliottlib.bzutil.JIRABugTracker.filter_attached_bugs')
     @patch('elliottlib.bzutil.BugzillaBugTracker.filter_attached_bugs')
-    def test_find_bugs_sweep_default_advisories(self, bugzilla_filter_mock, jira_filter_mock):
+    def test_find_bugs_sweep_default_advisories(self, bugzilla_filter_mock, jira_filter_mock, *_):
         runner = CliRunner()
         image_bugs = [flexmock(id=1), flexmock(id=2)]
         rpm_bugs = [flexmock(id=3), flexmock(id=4)]
@@ -257,6 +275,27 @@ class FindBugsSweepTestCase(unittest.IsolatedAsyncioTestCase):
             t = "\n".join(traceback.format_exception(exc_type, exc_value, exc_traceback))
             self.fail(t)
 
+    @patch("elliottlib.cli.find_bugs_sweep_cli.AsyncErrataAPI")
+    @patch("elliottlib.cli.find_bugs_sweep_cli.AdvisoryBugIndex")
+    async def test_get_advisory_bug_index(self, AdvisoryBugIndex: MagicMock, AsyncErrataAPI: MagicMock):
+        api = AsyncErrataAPI.return_value
+        api.close = AsyncMock()
+        AdvisoryBugIndex.build_for_release = AsyncMock(return_value="complete index")
+        AdvisoryBugIndex.build = AsyncMock(return_value="partial index")
+        runtime = flexmock(get_default_advisories=lambda: {'image': 1, 'rpm': 2},
+                           get_errata_config=lambda: {'release': 'RHOSE ASYNC - AUTO'})
+
+        # the group's Errata release gives a complete index
+        actual = await sweep_cli.get_advisory_bug_index(runtime, 3)
+        self.assertEqual(actual, "complete index")
+        AdvisoryBugIndex.build_for_release.assert_awaited_once_with(api, 'RHOSE ASYNC - AUTO', {1, 2, 3})
+
+        # otherwise only the default advisories are indexed
+        runtime.get_errata_config = lambda: {}
+        actual = await sweep_cli.get_advisory_bug_index(runtime)
+        self.assertEqual(actual, "partial index")
+        AdvisoryBugIndex.build.assert_awaited_once_with(api, {1, 2})
+
 
 class TestCategorizeBugsByType(unittest.TestCase):
     def test_categorize_bugs_by_type(self):
@@ -322,6 +361,124 @@ class TestGenAssemblyBugIDs(unittest.TestCase):
         self.assertEqual(actual, expected)
 
 
+class TestSweepState(unittest.IsolatedAsyncioTestCase):
+    """ Sweeps with a state file against a fake Bugzilla serving recorded bugs """
+
+    # 2023-03-01T00:00:00Z
+    CUTOFF = 1677628800
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.tmp_dir.name, "sweep.db")
+        with open(os.path.join(os.path.dirname(__file__), "resources", "test_find_bugs_sweep",
+                               "bugzilla_bugs.json")) as f:
+            recorded = json.load(f)
+        self.bugs = {b["id"]: b for b in recorded["bugs"]}
+        self.history = {int(bug_id): h for bug_id, h in recorded["history"].items()}
+        # bug id -> time the bug last changed on the fake server
+        self.changed_at = {bug_id: time.time() - 86400 for bug_id in self.bugs}
+        self.history_requests = []
+        self.full_searches = 0
+
+        for patcher in [patch.object(BugzillaBugTracker, "filter_attached_bugs", return_value=[]),
+                        patch("elliottlib.cli.find_bugs_sweep_cli.get_sweep_cutoff_timestamp",
+                              return_value=self.CUTOFF)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        flexmock(sweep_cli).should_receive("get_assembly_bug_ids").and_return(set(), set())
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _bug_tracker(self):
+        """ A tracker talking to the fake Bugzilla; each sweep gets its own, as separate runs would """
+        client = bugzilla.Bugzilla(url=None)
+        flexmock(client).should_receive("url_to_query").replace_with(
+            lambda url: {"bug_status": ["MODIFIED", "ON_QA", "VERIFIED"]})
+        flexmock(client).should_receive("query").replace_with(lambda query: self._query(client, query))
+        flexmock(client).should_receive("bugs_history_raw").replace_with(self._bugs_history_raw)
+        flexmock(BugzillaBugTracker).should_receive("login").and_return(client)
+        return BugzillaBugTracker({"server": "bugzilla.example.com", "product": "OpenShift Container Platform",
+                                   "target_release": ["4.14.z"], "filters": {"default": []}})
+
+    def _query(self, client, query):
+        if "id" not in query and "last_change_time" not in query:
+            self.full_searches += 1
+        bug_ids = [b for b in self.bugs if self.bugs[b]["status"] in query.get("bug_status", [self.bugs[b]["status"]])]
+        if "id" in query:
+            bug_ids = [b for b in bug_ids if b in query["id"]]
+        if "last_change_time" in query:
+            since = datetime.strptime(query["last_change_time"], "%Y-%m-%dT%H:%M:%SZ") \
+                .replace(tzinfo=timezone.utc).timestamp()
+            bug_ids = [b for b in bug_ids if self.changed_at[b] >= since]
+        offset = query.get("offset", 0)
+        bug_ids = bug_ids[offset:offset + query["limit"]] if "limit" in query else bug_ids
+        # XML-RPC gives dates as DateTime objects
+        return [BugzillaBugObject(client, dict={
+            **copy.deepcopy(self.bugs[b]),
+            "creation_time": xmlrpc.client.DateTime(self.bugs[b]["creation_time"]),
+        }) for b in bug_ids]
+
+    def _bugs_history_raw(self, bug_ids):
+        self.history_requests.extend(bug_ids)
+        return {"bugs": [{"id": b, "history": [{**h, "when": xmlrpc.client.DateTime(h["when"])} for h in self.history[b]]}
+                         for b in bug_ids]}
+
+    def _change(self, bug_id, status, when):
+        self.history[bug_id].append({"when": when, "who": "dev@example.com", "changes": [
+            {"field_name": "status", "removed": self.bugs[bug_id]["status"], "added": status}]})
+        self.bugs[bug_id]["status"] = status
+        self.changed_at[bug_id] = time.time()
+
+    async def _sweep(self, state_file=None, full_refresh=False):
+        runtime = flexmock(debug=False)
+        sweep_state = BugCache(state_file) if state_file else None
+        try:
+            bugs = await sweep_cli.get_bugs_sweep(runtime, sweep_cli.FindBugsSweep(cve_only=False), None,
+                                                  self._bug_tracker(),
+                                                  sweep_state=sweep_state, full_refresh=full_refresh)
+        finally:
+            if sweep_state:
+                sweep_state.close()
+        out = io.StringIO()
+        with redirect_stdout(out):
+            sweep_cli.print_report(bugs, "json")
+        return [b.id for b in bugs], out.getvalue()
+
+    async def test_incremental_sweep(self):
+        expected = await self._sweep()
+        self.assertEqual(expected[0], [2000001, 2000002, 2000006])
+        self.assertEqual(await self._sweep(self.state_path), expected)
+
+        # nothing changed; no bug history is looked up again
+        self.history_requests.clear()
+        self.assertEqual(await self._sweep(self.state_path), expected)
+        self.assertEqual(self.history_requests, [])
+
+        # 2000001 is closed, 2000006 went back to ASSIGNED after the cutoff, 2000007 was fixed before the cutoff
+        self._change(2000001, "CLOSED", "20230320T10:00:00")
+        self._change(2000006, "ASSIGNED", "20230320T10:00:00")
+        self._change(2000006, "MODIFIED", "20230321T10:00:00")
+        self.history[2000007].append({"when": "20230120T10:00:00", "who": "dev@example.com", "changes": [
+            {"field_name": "status", "removed": "NEW", "added": "MODIFIED"}]})
+        self.bugs[2000007]["status"] = "MODIFIED"
+        self.changed_at[2000007] = time.time()
+
+        self.history_requests.clear()
+        expected = await self._sweep()
+        self.assertEqual(expected[0], [2000002, 2000007])
+        self.history_requests.clear()
+        self.full_searches = 0
+        self.assertEqual(await self._sweep(self.state_path), expected)
+        # only the changed bugs were searched for and had their history looked up
+        self.assertEqual(self.full_searches, 0)
+        self.assertEqual(sorted(self.history_requests), [2000006, 2000007])
+
+        self.history_requests.clear()
+        self.assertEqual(await self._sweep(self.state_path, full_refresh=True), expected)
+        self.assertEqual(sorted(self.history_requests), [2000002, 2000004, 2000005, 2000006, 2000007])
+
+
 class TestExtrasBugs(unittest.TestCase):
     def test_payload_bug(self):
         bugs = [flexmock(id='123', component='Payload Component', sub_component='Subcomponent')]
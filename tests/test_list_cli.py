@@ -0,0 +1,33 @@
+import unittest
+
+from click.testing import CliRunner
+from flexmock import flexmock
+
+from elliottlib import errata
+from elliottlib.cli.list_cli import list_cli
+from tests import test_structures
+
+
+class TestListCli(unittest.TestCase):
+    def test_list(self):
+        # 32916 has no release date, but a publish date override
+        item = test_structures.example_erratum_filtered_list[1]
+        requests = []
+
+        def _errata_get(path, params=None):
+            requests.append(path)
+            if path.startswith("/filter/"):
+                return [item] if params["page"] == 1 else []
+            return test_structures.example_erratum
+
+        flexmock(errata).should_receive("_errata_get").replace_with(_errata_get)
+        flexmock(errata).should_receive("Advisory").never()
+        result = CliRunner().invoke(list_cli, ["-n", "1"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertTrue(result.output.startswith("2019-Jan-01 NEW_FILES "))
+        self.assertIn("https://errata.devel.redhat.com/advisory/32916", result.output)
+        self.assertEqual(requests, ["/filter/1965.json", "/api/v1/erratum/32916"])
+
+
+if __name__ == "__main__":
+    unittest.main()
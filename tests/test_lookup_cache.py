@@ -0,0 +1,47 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from elliottlib.lookup_cache import LookupCache
+
+
+class TestLookupCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "lookups.db")
+        self.cache = LookupCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp_dir.cleanup()
+
+    def test_get_put(self):
+        self.cache.put("hydra:cve", "CVE-1", {"name": "CVE-1"}, 60)
+        self.cache.put("pyxis:package", "CVE-1", {"package": None}, 60)
+        self.assertEqual(self.cache.get("hydra:cve", "CVE-1"), {"name": "CVE-1"})
+        self.assertEqual(self.cache.get("pyxis:package", "CVE-1"), {"package": None})
+        self.assertIsNone(self.cache.get("hydra:cve", "CVE-2"))
+
+    def test_get_put_many(self):
+        self.cache.put_many("cvp:optional-results", {"url1": {"checks": []}, "url2": None}, 60)
+        self.cache.put_many("cvp:optional-results", {"url3": {"checks": [1]}}, -1)
+        actual = self.cache.get_many("cvp:optional-results", ["url1", "url2", "url3", "url4"])
+        self.assertEqual(actual, {"url1": {"checks": []}, "url2": None})
+
+    def test_expiry(self):
+        self.cache.put("hydra:cve", "CVE-1", {"name": "CVE-1"}, 60)
+        self.cache.put("hydra:cve", "CVE-2", {"name": "CVE-2"}, 3600)
+        with patch("time.time", return_value=time.time() + 120):
+            self.assertIsNone(self.cache.get("hydra:cve", "CVE-1"))
+            self.assertEqual(self.cache.get("hydra:cve", "CVE-2"), {"name": "CVE-2"})
+            # expired entries are dropped on open
+            self.cache.close()
+            self.cache = LookupCache(self.path)
+        rows = self.cache._conn.execute("SELECT key FROM lookups").fetchall()
+        self.assertEqual(rows, [("CVE-2",)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import threading
 import unittest
 from click.testing import CliRunner
 from elliottlib import errata
@@ -17,6 +18,7 @@ class RemoveBugsTestCase(unittest.TestCase):
         flexmock(JIRABugTracker).should_receive("login")
 
         advisory = flexmock(errata_id='999', errata_bugs=[1, 2, 3], jira_issues=['OCPBUGS-3', 'OCPBUGS-4', 'OCPBUGS-5'])
+        flexmock(errata.AdvisoryInfo).should_receive("fetch").and_return(advisory)
         flexmock(errata).should_receive("Advisory").and_return(advisory)
         flexmock(JIRABugTracker).should_receive("remove_bugs").with_args(advisory, {'OCPBUGS-3', 'OCPBUGS-4'}, False)
         flexmock(BugzillaBugTracker).should_receive("remove_bugs").with_args(advisory, {1, 2}, False)
@@ -39,6 +41,7 @@ class RemoveBugsTestCase(unittest.TestCase):
         bz_bug_ids = [1, 2, 3]
         jira_bug_ids = ["OCPBUGS-1", "OCPBUGS-2"]
         advisory = flexmock(errata_id='99999', errata_bugs=bz_bug_ids, jira_issues=jira_bug_ids)
+        flexmock(errata.AdvisoryInfo).should_receive("fetch").and_return(advisory)
         flexmock(errata).should_receive("Advisory").and_return(advisory)
         flexmock(BugzillaBugTracker).should_receive("remove_bugs").with_args(advisory, bz_bug_ids, False)
         flexmock(JIRABugTracker).should_receive("remove_bugs").with_args(advisory, jira_bug_ids, False)
@@ -49,6 +52,69 @@ class RemoveBugsTestCase(unittest.TestCase):
         self.assertIn(f"Removing bugzilla bugs from advisory {advisory.errata_id}", result.output)
         self.assertIn(f"Removing jira bugs from advisory {advisory.errata_id}", result.output)
 
+    def test_remove_all_bugs_multiple_advisories(self):
+        runner = CliRunner()
+        flexmock(Runtime).should_receive("initialize")
+        flexmock(BugzillaBugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
+        flexmock(BugzillaBugTracker).should_receive("login")
+        flexmock(JIRABugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
+        flexmock(JIRABugTracker).should_receive("login")
+
+        advisory1 = flexmock(errata_id=1, errata_bugs=[1, 2], jira_issues=["OCPBUGS-1"])
+        advisory3 = flexmock(errata_id=3, errata_bugs=[], jira_issues=["OCPBUGS-3"])
+        advisories = {1: advisory1, 3: advisory3}
+
+        def fake_advisory(errata_id):
+            if errata_id not in advisories:
+                raise ValueError(f"no advisory {errata_id}")
+            return advisories[errata_id]
+
+        flexmock(errata.AdvisoryInfo).should_receive("fetch").replace_with(fake_advisory)
+        flexmock(errata).should_receive("Advisory").replace_with(lambda errata_id: advisories[errata_id])
+        flexmock(BugzillaBugTracker).should_receive("remove_bugs").with_args(advisory1, [1, 2], False).once()
+        flexmock(JIRABugTracker).should_receive("remove_bugs").with_args(advisory1, ["OCPBUGS-1"], False).once()
+        flexmock(JIRABugTracker).should_receive("remove_bugs").with_args(advisory3, ["OCPBUGS-3"], False).once()
+
+        result = runner.invoke(cli, ['-g', 'openshift-4.6', 'remove-bugs', '--all', '-a', '1', '-a', '2', '-a', '3'])
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("Removing bugzilla bugs from advisory 1", result.output)
+        self.assertIn("Removing jira bugs from advisory 3", result.output)
+        self.assertIn("1: succeeded", result.output)
+        self.assertIn("2: failed: no advisory 2", result.output)
+        self.assertIn("3: succeeded", result.output)
+
+    def test_remove_bugs_multiple_advisories_concurrently(self):
+        runner = CliRunner()
+        flexmock(Runtime).should_receive("initialize")
+        flexmock(BugzillaBugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
+        flexmock(BugzillaBugTracker).should_receive("login")
+        flexmock(JIRABugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
+        flexmock(JIRABugTracker).should_receive("login")
+
+        advisories = {1: flexmock(errata_id=1, errata_bugs=[1], jira_issues=[]),
+                      2: flexmock(errata_id=2, errata_bugs=[2], jira_issues=[])}
+        # both advisories must be looked up at the same time to get past the barrier
+        barrier = threading.Barrier(2, timeout=5)
+        writing = []
+
+        def fake_fetch(errata_id):
+            barrier.wait()
+            return advisories[errata_id]
+
+        def fake_remove_bugs(advisory, bug_ids, noop):
+            writing.append(advisory.errata_id)
+            self.assertEqual(len(writing), 1, "advisories were updated at the same time")
+            writing.remove(advisory.errata_id)
+
+        flexmock(errata.AdvisoryInfo).should_receive("fetch").replace_with(fake_fetch)
+        flexmock(errata).should_receive("Advisory").replace_with(lambda errata_id: advisories[errata_id])
+        flexmock(BugzillaBugTracker).should_receive("remove_bugs").replace_with(fake_remove_bugs).twice()
+
+        result = runner.invoke(cli, ['-g', 'openshift-4.6', 'remove-bugs', '--all', '-a', '1', '-a', '2'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("1: succeeded", result.output)
+        self.assertIn("2: succeeded", result.output)
+
 
 if __name__ == '__main__':
     unittest.main()
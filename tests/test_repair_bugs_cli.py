@@ -17,7 +17,10 @@ class RepairBugsTestCase(unittest.TestCase):
         flexmock(BugzillaBugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
         flexmock(BugzillaBugTracker).should_receive("login")
         flexmock(BugzillaBugTracker).should_receive("get_bug").with_args(1).and_return(bz_bug)
-        flexmock(BugzillaBugTracker).should_receive("update_bug_status").once()
+        flexmock(BugzillaBugTracker).should_receive("update_bugs_status").with_args([], "CLOSED", noop=False)\
+            .and_return({})
+        flexmock(BugzillaBugTracker).should_receive("update_bugs_status").with_args([bz_bug], "ON_QA", noop=False)\
+            .and_return({1: True}).once()
 
         flexmock(JIRABugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
         flexmock(JIRABugTracker).should_receive("login")
@@ -52,8 +55,12 @@ class RepairBugsTestCase(unittest.TestCase):
         flexmock(BugzillaBugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
         flexmock(BugzillaBugTracker).should_receive("login")
         flexmock(BugzillaBugTracker).should_receive("get_bug").with_args(1).and_return(bug)
-        flexmock(BugzillaBugTracker).should_receive("update_bug_status").once()
-        flexmock(BugzillaBugTracker).should_receive("add_comment").once()
+        flexmock(BugzillaBugTracker).should_receive("update_bugs_status").with_args([], "CLOSED", noop=False)\
+            .and_return({})
+        flexmock(BugzillaBugTracker).should_receive("update_bugs_status").with_args([bug], "ON_QA", noop=False)\
+            .and_return({1: True}).once()
+        flexmock(BugzillaBugTracker).should_receive("add_comments").with_args([1], "close bug", private=False, noop=False)\
+            .and_return({1: True}).once()
         result = runner.invoke(cli, ['-g', 'openshift-4.6', 'repair-bugs', '--id', '1', '--to', 'ON_QA', '--comment', 'close bug', '-a', '99999'])
         self.assertIn("1 bugs successfully modified", result.output)
         self.assertEqual(result.exit_code, 0)
@@ -67,8 +74,12 @@ class RepairBugsTestCase(unittest.TestCase):
         flexmock(BugzillaBugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
         flexmock(BugzillaBugTracker).should_receive("login")
         flexmock(BugzillaBugTracker).should_receive("get_bug").with_args(1).and_return(bug)
-        flexmock(BugzillaBugTracker).should_receive("update_bug_status").once()
-        flexmock(BugzillaBugTracker).should_receive("add_comment").once()
+        flexmock(BugzillaBugTracker).should_receive("update_bugs_status").with_args([], "CLOSED", noop=False)\
+            .and_return({})
+        flexmock(BugzillaBugTracker).should_receive("update_bugs_status").with_args([bug], "ON_QA", noop=False)\
+            .and_return({1: True}).once()
+        flexmock(BugzillaBugTracker).should_receive("add_comments").with_args([1], "close bug", private=False, noop=False)\
+            .and_return({1: True}).once()
 
         flexmock(JIRABugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
         flexmock(JIRABugTracker).should_receive("login")
@@ -0,0 +1,63 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from aiohttp import ClientResponseError, web
+from aiohttp.test_utils import TestServer
+from tenacity import wait_none
+
+from elliottlib.resultsdb import ResultsDBAPI
+
+
+class TestResultsDBAPI(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # item -> statuses to respond with before succeeding
+        self.failures = {}
+
+        async def get_latest(request: web.Request):
+            items = request.query["item"].split(",")
+            self.requests.append(items)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                # later batches answer first
+                await asyncio.sleep(0.05 / len(self.requests))
+                statuses = self.failures.get(items[0])
+                if statuses:
+                    return web.Response(status=statuses.pop(0))
+                return web.json_response({"data": [{"data": {"item": [item]}, "outcome": "PASSED"}
+                                                   for item in items]})
+            finally:
+                self.in_flight -= 1
+
+        app = web.Application()
+        app.router.add_get("/api/v2.0/results/latest", get_latest)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        patcher = patch.object(ResultsDBAPI._get_latest_results_batch.retry, "wait", wait_none())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_get_latest_results(self):
+        api = ResultsDBAPI(str(self.server.make_url("")), concurrency=3)
+        items = [f"nvr-{i}" for i in range(10)]
+        self.failures = {"nvr-2": [503, 502]}
+        results = await api.get_latest_results(["cvp.rhproduct.default.sanity"], items, batch_size=2)
+        await api.close()
+        self.assertEqual([r["data"]["item"][0] for r in results], items)
+        self.assertEqual(len(self.requests), 7)
+        self.assertEqual(self.max_in_flight, 3)
+
+    async def test_get_latest_results_client_error(self):
+        api = ResultsDBAPI(str(self.server.make_url("")))
+        self.failures = {"nvr-0": [400]}
+        with self.assertRaises(ClientResponseError):
+            await api.get_latest_results(["cvp.rhproduct.default.sanity"], ["nvr-0", "nvr-1"])
+        await api.close()
+        self.assertEqual(len(self.requests), 1)
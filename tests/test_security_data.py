@@ -0,0 +1,92 @@
+import asyncio
+import os
+import tempfile
+import time
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from elliottlib.lookup_cache import LookupCache
+from elliottlib.security_data import AsyncSecurityDataAPI
+
+
+class TestAsyncSecurityDataAPI(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+        self.pyxis_status = 200
+
+        async def get_cve(request: web.Request):
+            self.requests.append(request.path)
+            await asyncio.sleep(0.01)
+            return web.json_response({"name": request.match_info["alias"], "package_state": []})
+
+        async def get_images(request: web.Request):
+            self.requests.append(request.path)
+            if self.pyxis_status != 200:
+                raise web.HTTPServiceUnavailable()
+            repo = request.match_info["repo"]
+            data = [{"brew": {"package": repo.split("/")[1]}}] if repo.startswith("openshift4/") else []
+            return web.json_response({"data": data})
+
+        app = web.Application()
+        app.router.add_get("/hydra/cve/{alias}.json", get_cve)
+        app.router.add_get("/pyxis/repositories/registry/registry.access.redhat.com/repository/{repo:.+}/images",
+                           get_images)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        patcher = patch("elliottlib.security_data.AsyncSecurityDataAPI._pyxis_auth_header",
+                        return_value="Negotiate abcdef")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.lookup_cache = LookupCache(os.path.join(self.tmp_dir.name, "lookups.db"))
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        self.lookup_cache.close()
+        self.tmp_dir.cleanup()
+
+    def _api(self, lookup_cache=None):
+        return AsyncSecurityDataAPI(str(self.server.make_url("/hydra")), str(self.server.make_url("/pyxis")),
+                                    lookup_cache=lookup_cache)
+
+    async def test_get_cve(self):
+        api = self._api(self.lookup_cache)
+        # concurrent lookups of the same CVE share one request
+        actual = await asyncio.gather(*[api.get_cve(alias) for alias in ["CVE-1", "CVE-2", "CVE-1", "CVE-1"]])
+        self.assertEqual([cve["name"] for cve in actual], ["CVE-1", "CVE-2", "CVE-1", "CVE-1"])
+        self.assertEqual(sorted(self.requests), ["/hydra/cve/CVE-1.json", "/hydra/cve/CVE-2.json"])
+        await api.close()
+
+        # a later run finds them in the lookup cache
+        self.requests.clear()
+        api = self._api(self.lookup_cache)
+        self.assertEqual((await api.get_cve("CVE-1"))["name"], "CVE-1")
+        self.assertEqual(self.requests, [])
+        await api.close()
+
+        # until they expire
+        with patch("time.time", return_value=time.time() + AsyncSecurityDataAPI.CACHE_TTL + 1):
+            api = self._api(self.lookup_cache)
+            self.assertEqual((await api.get_cve("CVE-1"))["name"], "CVE-1")
+            await api.close()
+        self.assertEqual(self.requests, ["/hydra/cve/CVE-1.json"])
+
+    async def test_get_brew_package(self):
+        api = self._api(self.lookup_cache)
+        self.assertEqual(await api.get_brew_package("openshift4/ose-cli"), "ose-cli")
+        self.assertIsNone(await api.get_brew_package("rhacm2/agent-service-rhel8"))
+        await api.close()
+
+        # failed lookups are not cached, but lookups that found nothing are
+        self.requests.clear()
+        self.pyxis_status = 503
+        api = self._api(self.lookup_cache)
+        self.assertEqual(await api.get_brew_package("openshift4/ose-cli"), "ose-cli")
+        self.assertIsNone(await api.get_brew_package("rhacm2/agent-service-rhel8"))
+        self.assertIsNone(await api.get_brew_package("openshift4/ose-tests"))
+        self.assertIsNone(self.lookup_cache.get("pyxis:package", "openshift4/ose-tests"))
+        await api.close()
+        self.assertEqual(len(self.requests), 1)
@@ -1,5 +1,5 @@
+import asyncio
 from click.testing import CliRunner
-from errata_tool import Erratum
 from unittest.mock import patch
 from elliottlib.cli.common import cli, Runtime
 from elliottlib.cli.verify_attached_bugs_cli import BugValidator
@@ -88,8 +88,11 @@ class VerifyAttachedBugs(IsolatedAsyncioTestCase):
         }
 
         advisory_id = 123
+
+        async def get_attached_bugs(advisory_ids):
+            return {123: {bugs[0], bugs[1]}}
         flexmock(BugValidator).should_receive("get_attached_bugs").with_args([advisory_id])\
-            .and_return({123: {bugs[0], bugs[1]}}).ordered()
+            .replace_with(get_attached_bugs).ordered()
         flexmock(BugValidator).should_receive("_get_blocking_bugs_for").and_return(blocking_bugs_map).ordered()
         flexmock(BugValidator).should_receive("verify_bugs_advisory_type")
 
@@ -122,9 +125,10 @@ class VerifyAttachedBugs(IsolatedAsyncioTestCase):
             flexmock(id="OCPBUGS-2", is_ocp_bug=lambda: True),
             flexmock(id="OCPBUGS-3", is_ocp_bug=lambda: True)
         ]
-        flexmock(BugValidator).should_receive("get_attached_bugs").and_return(
-            {1: {bugs[0]}, 2: {bugs[1]}, 3: {bugs[2]}}
-        )
+
+        async def get_attached_bugs(advisory_ids):
+            return {1: {bugs[0]}, 2: {bugs[1]}, 3: {bugs[2]}}
+        flexmock(BugValidator).should_receive("get_attached_bugs").replace_with(get_attached_bugs)
         flexmock(BugValidator).should_receive("validate").and_return()
         flexmock(verify_attached_bugs_cli).should_receive("categorize_bugs_by_type").and_return(
             {'image': {bugs[2]}, 'rpm': {bugs[1]}, 'extras': {bugs[0]}}
@@ -166,9 +170,15 @@ class TestBugValidator(IsolatedAsyncioTestCase):
         flexmock(BugzillaBugTracker).should_receive("login").and_return(None)
         flexmock(AsyncErrataAPI).should_receive("__init__").and_return(None)
 
-        advisory1 = flexmock(errata_id='123', jira_issues=['bug-1', 'bug-2'], errata_bugs=[1])
-        advisory2 = flexmock(errata_id='145', jira_issues=['bug-3'], errata_bugs=[2, 3])
-        flexmock(Erratum).new_instances(advisory1, advisory2)
+        advisories = {
+            '123': flexmock(jira_issues=['bug-1', 'bug-2'], errata_bugs=[1]),
+            '145': flexmock(jira_issues=['bug-3'], errata_bugs=[2, 3]),
+        }
+
+        async def get_advisory(advisory_id):
+            return advisory_id
+        flexmock(AsyncErrataAPI).should_receive("get_advisory").replace_with(get_advisory)
+        flexmock(verify_attached_bugs_cli).should_receive("AdvisoryInfo").replace_with(lambda raw: advisories[raw])
         flexmock(JIRABugTracker).should_receive("get_bugs")\
             .with_args(list(jira_bug_map.keys()), permissive=False)\
             .and_return(jira_bug_map.values())
@@ -177,7 +187,7 @@ class TestBugValidator(IsolatedAsyncioTestCase):
             .and_return(bz_bug_map.values())
 
         validator = BugValidator(runtime, True)
-        actual = validator.get_attached_bugs(['123', '145'])
+        actual = await validator.get_attached_bugs(['123', '145'])
         expected = (
             {
                 '123': {jira_bug_map['bug-1'], jira_bug_map['bug-2'], bz_bug_map[1]},
@@ -226,3 +236,83 @@ class TestBugValidator(IsolatedAsyncioTestCase):
         }
         self.assertEqual(actual, expected)
         await validator.close()
+
+    async def test_get_bugs_memoized(self):
+        runtime = Runtime()
+        flexmock(Runtime).should_receive("get_errata_config").and_return({})
+        flexmock(JIRABugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
+        flexmock(JIRABugTracker).should_receive("login").and_return(None)
+        flexmock(BugzillaBugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
+        flexmock(BugzillaBugTracker).should_receive("login").and_return(None)
+
+        jira_bugs = [flexmock(id="OCPBUGS-3"), flexmock(id="OCPBUGS-4")]
+        bz_bugs = [flexmock(id=1), flexmock(id=4)]
+        flexmock(JIRABugTracker).should_receive("get_bugs").with_args({"OCPBUGS-3", "OCPBUGS-4"}) \
+            .and_return(jira_bugs).once()
+        flexmock(JIRABugTracker).should_receive("get_bugs").with_args({"OCPBUGS-5"}).and_return([]).once()
+        # bug 2 doesn't exist; it is only looked up once
+        flexmock(BugzillaBugTracker).should_receive("get_bugs").with_args({1, 2, 4}).and_return(bz_bugs).once()
+        flexmock(BugzillaBugTracker).should_receive("get_flaw_bugs").with_args([10, 11]) \
+            .and_return([flexmock(id=10), flexmock(id=11)]).once()
+        flexmock(BugzillaBugTracker).should_receive("get_flaw_bugs").with_args([12]) \
+            .and_return([flexmock(id=12)]).once()
+
+        validator = BugValidator(runtime, True)
+        actual = validator._get_bugs(["OCPBUGS-3", "OCPBUGS-4", 1, "2", 4])
+        self.assertEqual({b.id for b in actual}, {"OCPBUGS-3", "OCPBUGS-4", 1, 4})
+        actual = validator._get_bugs(["OCPBUGS-4", "OCPBUGS-5", 2, 4])
+        self.assertEqual({b.id for b in actual}, {"OCPBUGS-4", 4})
+
+        self.assertEqual({b.id for b in validator._get_flaw_bugs([10, 11])}, {10, 11})
+        self.assertEqual({b.id for b in validator._get_flaw_bugs([11, 12])}, {11, 12})
+        await validator.close()
+
+    async def test_verify_bugs_multiple_advisories(self):
+        runtime = Runtime()
+        flexmock(Runtime).should_receive("get_errata_config").and_return({})
+        flexmock(JIRABugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
+        flexmock(JIRABugTracker).should_receive("login").and_return(None)
+        flexmock(BugzillaBugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
+        flexmock(BugzillaBugTracker).should_receive("login").and_return(None)
+        flexmock(AsyncErrataAPI).should_receive("__init__").and_return(None)
+        attached = {"OCPBUGS-1": [{"id": 1}, {"id": 2}], "OCPBUGS-2": [{"id": 1}], 3: [{"id": 2}, {"id": 3}]}
+        # every lookup waits for the others to start, so this only finishes if they run concurrently
+        started = []
+        all_started = asyncio.Event()
+
+        async def get_attached_advisories(api, bug_id):
+            started.append(bug_id)
+            if len(started) == len(attached):
+                all_started.set()
+            await all_started.wait()
+            return attached[bug_id]
+
+        flexmock(JIRABugTracker).should_receive("get_attached_advisories").replace_with(get_attached_advisories)
+        flexmock(BugzillaBugTracker).should_receive("get_attached_advisories").replace_with(get_attached_advisories)
+        bugs = [flexmock(id=bug_id, weburl=f"https://example.com/{bug_id}") for bug_id in attached]
+
+        validator = BugValidator(runtime, "text")
+        await asyncio.wait_for(validator.verify_bugs_multiple_advisories(bugs), timeout=5)
+        self.assertEqual(validator.problems, [
+            "Bug <https://example.com/OCPBUGS-1|OCPBUGS-1> is attached in multiple advisories: [1, 2]",
+            "Bug <https://example.com/3|3> is attached in multiple advisories: [2, 3]",
+        ])
+
+    async def test_run_checks(self):
+        runtime = Runtime()
+        flexmock(Runtime).should_receive("get_errata_config").and_return({})
+        flexmock(JIRABugTracker).should_receive("get_config").and_return({'target_release': ['4.6.z']})
+        flexmock(JIRABugTracker).should_receive("login").and_return(None)
+        flexmock(AsyncErrataAPI).should_receive("__init__").and_return(None)
+        validator = BugValidator(runtime, "text")
+        validator._complain("first")
+
+        async def check(problem, delay):
+            await asyncio.sleep(delay)
+            validator._complain(problem)
+
+        with patch("elliottlib.cli.verify_attached_bugs_cli.red_print") as red_print:
+            await validator.run_checks([check("b", 0.02), check("c", 0), check("a", 0.01)])
+        # problems of concurrent checks come after earlier ones, sorted
+        self.assertEqual(validator.problems, ["first", "a", "b", "c"])
+        self.assertEqual([c.args[0] for c in red_print.call_args_list], ["a", "b", "c"])
@@ -1,88 +1,154 @@
 #!/usr/bin/env python3
+""" List the CVE trackers of a y-stream release, each with the trackers of the same CVEs and component in earlier
+releases, to tell whether the y-stream release is the first fix.
 
+    ./y-stream-trackers.py 4.5.0 [--tracker bugzilla] [--tracker jira] [--bug-cache PATH]
+
+The tracker/flaw graph is walked breadth-first: the y-stream trackers, then their flaws, then the trackers of those
+flaws. Each level is fetched with one batched lookup per bug tracker, and bugs already seen are not fetched again.
+"""
+import argparse
 import os
-import sys
+from typing import Dict, Iterable, List, Optional, Union
 
-import bugzilla
 from packaging import version
 
+from elliottlib.bug_cache import BugCache
+from elliottlib.bzutil import Bug, BugTracker, BugzillaBugTracker, JIRABugTracker
+from elliottlib.util import chunk
+
+BUGZILLA_CONFIG = {"server": "bugzilla.redhat.com", "product": "OpenShift Container Platform"}
+JIRA_CONFIG = {"server": "https://issues.redhat.com", "project": "OCPBUGS"}
+STATUSES = ["MODIFIED", "ON_QA", "VERIFIED"]
+# JIRA trackers of a flaw are found by their flaw:bz#N label, this many flaws per search
+JIRA_LABEL_BATCH_SIZE = 100
+
+
+class BugGraph:
+    """ Bugs fetched so far, by bug tracker; only bugs not seen before are fetched """
 
-api_key = None
-try:
-    api_key = open(os.path.expanduser('~/.bugzilla_apikey')).read().strip()
-except FileNotFoundError:
-    #  api key in ~/.config/python-bugzilla/bugzillarc will be used
-    pass
+    def __init__(self, flaw_bug_tracker: BugzillaBugTracker, tracker_bug_trackers: Dict[str, BugTracker]):
+        self.flaw_bug_tracker = flaw_bug_tracker
+        self.tracker_bug_trackers = tracker_bug_trackers
+        # (tracker type, bug id) -> bug, or None if it wasn't found
+        self._bugs: Dict[tuple, Optional[Bug]] = {}
 
-bz = bugzilla.RHBugzilla(url=None, api_key=api_key)
-bz.connect('https://bugzilla.redhat.com')
+    def add(self, tracker_type: str, bugs: Iterable[Bug]):
+        self._bugs.update({(tracker_type, b.id): b for b in bugs})
 
-PRODUCT_NAME = "OpenShift Container Platform"
-try:
-    TARGET_RELEASE = sys.argv[1]  # e.g. "4.5.0"
-except IndexError:
-    sys.exit("Target Release required, e.g. '4.5.0'")
+    def _get(self, tracker_type: str, bug_ids: Iterable[Union[int, str]], fetch) -> List[Bug]:
+        bug_ids = list(dict.fromkeys(bug_ids))
+        missing = [b for b in bug_ids if (tracker_type, b) not in self._bugs]
+        if missing:
+            found = fetch(missing)
+            self._bugs.update({(tracker_type, b): None for b in missing})
+            self.add(tracker_type, found)
+        return [self._bugs[(tracker_type, b)] for b in bug_ids if self._bugs[(tracker_type, b)]]
 
-query = bz.build_query(
-    product=PRODUCT_NAME,
-    status=["MODIFIED", "ON_QA", "VERIFIED"],
-    target_release=TARGET_RELEASE,
-    keywords=["Security", "SecurityTracking"],
-)
+    def get_trackers(self, tracker_type: str, bug_ids: Iterable[Union[int, str]]) -> List[Bug]:
+        bug_tracker = self.tracker_bug_trackers[tracker_type]
+        return self._get(tracker_type, bug_ids, lambda ids: bug_tracker.get_bugs(ids, permissive=True))
 
+    def get_flaws(self, bug_ids: Iterable[int]) -> List[Bug]:
+        return self._get("bugzilla", bug_ids, lambda ids: self.flaw_bug_tracker.get_flaw_bugs(ids, strict=False))
 
-def _get_flaw_cve(flaw):
-    # python has no .get() for lists
+
+def _target_version(tracker: Bug):
     try:
-        return flaw.alias[0]
-    except IndexError:
+        target_release = tracker.target_release
+    except ValueError:  # JIRA issue without Target Version
         return None
+    if not target_release:
+        return None
+    return version.parse(target_release[0].replace(".z", ".0"))
+
+
+def find_y_stream_trackers(graph: BugGraph) -> List[Bug]:
+    trackers = []
+    for tracker_type, bug_tracker in graph.tracker_bug_trackers.items():
+        found = [b for b in bug_tracker.cve_tracker_search(STATUSES, search_filter=None) if b.is_tracker_bug()]
+        if tracker_type == "bugzilla":
+            # searches only return some fields; the flaws a tracker blocks aren't among them
+            found = graph.get_trackers(tracker_type, [b.id for b in found])
+        else:
+            graph.add(tracker_type, found)
+        trackers.extend(found)
+    return trackers
+
+
+def find_flaw_trackers(graph: BugGraph, flaws: List[Bug]) -> Dict[int, List[Bug]]:
+    """ :return: flaw bug id -> its trackers in each bug tracker """
+    flaw_trackers: Dict[int, List[Bug]] = {f.id: [] for f in flaws}
+    if "bugzilla" in graph.tracker_bug_trackers:
+        trackers = graph.get_trackers("bugzilla", [i for f in flaws for i in f.depends_on])
+        trackers_by_id = {t.id: t for t in trackers}
+        for f in flaws:
+            flaw_trackers[f.id].extend(trackers_by_id[i] for i in f.depends_on if i in trackers_by_id)
+    if "jira" in graph.tracker_bug_trackers:
+        jira: JIRABugTracker = graph.tracker_bug_trackers["jira"]
+        for chunk_of_flaws in chunk(flaws, JIRA_LABEL_BATCH_SIZE):
+            labels = [f'"flaw:bz#{f.id}"' for f in chunk_of_flaws]
+            query = jira._query(include_labels=labels, with_target_release=False,
+                                custom_query=' and labels = "SecurityTracking"')
+            trackers = jira._search(query)
+            graph.add("jira", trackers)
+            for t in trackers:
+                for i in t.corresponding_flaw_bug_ids:
+                    if i in flaw_trackers:
+                        flaw_trackers[i].append(t)
+    return flaw_trackers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("target_release", help="y-stream target release, e.g. 4.5.0")
+    parser.add_argument("--tracker", dest="tracker_types", action="append", choices=["bugzilla", "jira"],
+                        help="bug tracker to look for CVE trackers in; can be repeated. Default: both. "
+                             "JIRA needs a JIRA_TOKEN env var")
+    parser.add_argument("--bug-cache", metavar="PATH",
+                        help="SQLite file in which to keep fetched bugs, so that later runs only fetch changed bugs")
+    args = parser.parse_args()
+    target = version.parse(args.target_release)
+
+    bug_cache = BugCache(os.path.expanduser(args.bug_cache)) if args.bug_cache else None
+    flaw_bug_tracker = BugzillaBugTracker(BUGZILLA_CONFIG, bug_cache=bug_cache)
+    tracker_bug_trackers = {}
+    for tracker_type in args.tracker_types or ["bugzilla", "jira"]:
+        if tracker_type == "bugzilla":
+            config = {**BUGZILLA_CONFIG, "target_release": [args.target_release]}
+            tracker_bug_trackers[tracker_type] = BugzillaBugTracker(config, bug_cache=bug_cache)
+        else:
+            config = {**JIRA_CONFIG, "target_release": [args.target_release]}
+            tracker_bug_trackers[tracker_type] = JIRABugTracker(config, bug_cache=bug_cache)
+    graph = BugGraph(flaw_bug_tracker, tracker_bug_trackers)
 
-
-def parse_version(v):
     try:
-        return version.parse(v)
-    except:
-        return v
-
-
-BZ_PAGE_SIZE = 1000
-query["limit"] = BZ_PAGE_SIZE
-y_stream_trackers = []
-partial = bz.query(query)
-while len(partial) == BZ_PAGE_SIZE:
-    print(len(partial))
-    y_stream_trackers += partial
-    query["offset"] += BZ_PAGE_SIZE
-    partial = bz.query(query)
-y_stream_trackers += partial
-
-for y_stream_tracker in y_stream_trackers:
-    component = y_stream_tracker.summary.split(":")[0].split(" ")[-1]
-    blocking_bugs = bz.getbugs(y_stream_tracker.blocks)
-    flaw_bugs = list(filter(lambda x: x.product == "Security Response", blocking_bugs))
-
-    tracker_cves = list(filter(lambda x: x is not None, (_get_flaw_cve(flaw) for flaw in flaw_bugs)))
-    if len(tracker_cves) == 0:
-        continue
-    tracker_flaws = list(filter(lambda x: _get_flaw_cve(x) in tracker_cves, flaw_bugs))
-    flaw_tracker_ids = set([t for f in tracker_flaws for t in f.depends_on])
-    trackers = bz.getbugs(flaw_tracker_ids)
-
-    def filter_tracker(tracker):
-        tracker_tr = tracker.target_release[0].replace(".z", ".0")
-        if all([
-            tracker.product == PRODUCT_NAME,
-            component + ":" in tracker.summary,
-            version.parse(tracker_tr) <= version.parse(TARGET_RELEASE),
-            version.parse(tracker_tr) > version.parse("4.0.0"),
-        ]):
-            return True
-        return False
-
-    sorted_trackers = sorted(trackers, key=lambda x: version.parse(x.target_release[0]), reverse=True)
-    filtered_trackers = filter(filter_tracker, sorted_trackers)
-
-    print("{} {}".format(" ".join(tracker_cves), component))
-    for tracker in filtered_trackers:
-        print("\t{} {} {} {}".format(tracker.id, tracker.target_release[0], tracker.status, tracker.resolution))
+        y_stream_trackers = find_y_stream_trackers(graph)
+        flaws = graph.get_flaws({i for t in y_stream_trackers for i in t.corresponding_flaw_bug_ids})
+        flaws = [f for f in flaws if f.alias]
+        flaw_trackers = find_flaw_trackers(graph, flaws)
+    finally:
+        if bug_cache:
+            bug_cache.close()
+    flaws_by_id = {f.id: f for f in flaws}
+
+    for y_stream_tracker in y_stream_trackers:
+        component = y_stream_tracker.whiteboard_component
+        tracker_flaws = [flaws_by_id[i] for i in y_stream_tracker.corresponding_flaw_bug_ids if i in flaws_by_id]
+        if not tracker_flaws:
+            continue
+
+        def is_earlier_tracker(tracker):
+            tracker_version = _target_version(tracker)
+            return tracker.is_ocp_bug() and tracker.whiteboard_component == component and tracker_version \
+                and version.parse("4.0.0") < tracker_version <= target
+
+        trackers = {t.id: t for f in tracker_flaws for t in flaw_trackers[f.id] if is_earlier_tracker(t)}
+        print("{} {}".format(" ".join(f.alias[0] for f in tracker_flaws), component))
+        for tracker in sorted(trackers.values(), key=_target_version, reverse=True):
+            print("\t{} {} {} {}".format(tracker.id, tracker.target_release[0], tracker.status,
+                                         tracker.resolution or ""))
+
+
+if __name__ == "__main__":
+    main()